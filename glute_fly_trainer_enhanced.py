@@ -6,11 +6,13 @@ Integrates data collection, posture rules, and ML training
 import cv2
 import mediapipe as mp
 import numpy as np
+import os
 import time
 import math
 from training.data_collector import DataCollector
 from src.core.exercise_analyzer import PostureRules
-from training.ml_trainer import MLTrainer
+from training.numpy_predictor import NumpyPosturePredictor
+from training.model_registry import get_model_registry
 from src.core.voice_feedback import VoiceSystem
 
 # MediaPipe pose landmarks
@@ -69,7 +71,7 @@ class EnhancedGluteFlyTrainer:
         # Initialize modules
         self.data_collector = DataCollector()
         self.posture_rules = PostureRules()
-        self.ml_trainer = MLTrainer()
+        self.ml_predictor = None  # TensorFlow-free, see training/numpy_predictor.py
         
         # Training mode flags
         self.data_collection_mode = False
@@ -105,9 +107,14 @@ class EnhancedGluteFlyTrainer:
         print(f"📊 Session completed: {stats['frame_count']} frames collected")
         
     def load_ml_model(self, model_path):
-        """Load trained ML model"""
+        """Load a trained model directory, or a registry model name (hot-swapped on publish)"""
         try:
-            self.ml_trainer.load_model(model_path)
+            if os.path.exists(model_path):
+                self.ml_predictor = NumpyPosturePredictor.load(model_path)
+            else:
+                registry = get_model_registry()
+                registry.get(model_path)  # fail now if it was never published
+                self.ml_predictor = registry.session(model_path)
             self.ml_prediction_mode = True
             print("🤖 ML model loaded successfully")
             return True
@@ -200,7 +207,7 @@ class EnhancedGluteFlyTrainer:
             
         # Get prediction
         try:
-            predicted_label, confidence = self.ml_trainer.predict_posture(landmarks)
+            predicted_label, confidence = self.ml_predictor.predict_posture(landmarks)
             return predicted_label, confidence
         except Exception as e:
             print(f"❌ ML prediction error: {e}")
@@ -402,7 +409,7 @@ class EnhancedGluteFlyTrainer:
                     else:
                         self.start_data_collection(side)
                 elif key == ord('m'):
-                    model_path = input("Enter model path: ")
+                    model_path = input("Enter model path or registry name (e.g. glute_fly): ")
                     self.load_ml_model(model_path)
                 
                 cv2.imshow("Enhanced Glute Fly AI Trainer", frame)
@@ -7,23 +7,30 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel, EmailStr
 from sqlalchemy.orm import Session
 
+from src.backend.auth.hashing import HashingBusyError, hashing_executor
 from src.backend.auth.security import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     create_access_token,
-    decode_access_token,
-    get_password_hash,
-    verify_password,
+    get_current_user as get_user_from_token,
 )
+from src.backend.auth.user_cache import UserSnapshot
 from src.backend.database.db import get_db
 from src.backend.database.models import User
 
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
+from src.backend.auth.google_verifier import GoogleTokenVerifier
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 
+# Shared verifier: Google's signing certs are cached across logins
+google_verifier = GoogleTokenVerifier(GOOGLE_CLIENT_ID)
+
+
+def get_google_verifier() -> GoogleTokenVerifier:
+    """Dependency so tests can swap in a verifier with a local key set"""
+    return google_verifier
+
 
 # Schemas
 class UserCreate(BaseModel):
@@ -68,6 +75,15 @@ class AdminUserResponse(BaseModel):
         from_attributes = True
 
 
+def hashing_busy_exception() -> HTTPException:
+    """503 returned when the bcrypt queue is saturated (e.g. a login burst)"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in requests right now, please retry shortly",
+        headers={"Retry-After": "2"},
+    )
+
+
 # Routes
 @router.post("/register", response_model=Token)
 def register(user_in: UserCreate, db: Session = Depends(get_db)):
@@ -79,7 +95,10 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
         )
 
     # Create new user
-    hashed_password = get_password_hash(user_in.password)
+    try:
+        hashed_password = hashing_executor.hash_password(user_in.password)
+    except HashingBusyError:
+        raise hashing_busy_exception()
     new_user = User(
         email=user_in.email, name=user_in.name, hashed_password=hashed_password
     )
@@ -117,7 +136,14 @@ def login(user_in: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    if not verify_password(user_in.password, user.hashed_password):
+    try:
+        password_ok = hashing_executor.verify_password(
+            user_in.password, user.hashed_password
+        )
+    except HashingBusyError:
+        raise hashing_busy_exception()
+
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -143,9 +169,13 @@ def login(user_in: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/google", response_model=Token)
-def google_login(login_data: GoogleLogin, db: Session = Depends(get_db)):
+def google_login(
+    login_data: GoogleLogin,
+    db: Session = Depends(get_db),
+    verifier: GoogleTokenVerifier = Depends(get_google_verifier),
+):
     """Verify Google ID token and login/register user"""
-    if not GOOGLE_CLIENT_ID:
+    if not verifier.client_id:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Google Client ID not configured on server",
@@ -153,9 +183,7 @@ def google_login(login_data: GoogleLogin, db: Session = Depends(get_db)):
 
     try:
         # Verify the ID token
-        idinfo = id_token.verify_oauth2_token(
-            login_data.credential, google_requests.Request(), GOOGLE_CLIENT_ID
-        )
+        idinfo = verifier.verify(login_data.credential)
 
         # ID token is valid. Get user's Google ID and email.
         google_id = idinfo["sub"]
@@ -237,42 +265,20 @@ security = HTTPBearer()
 def get_current_user(
     token: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    payload = decode_access_token(token.credentials)
-    if payload is None:
-        raise credentials_exception
-
-    user_id: str = payload.get("sub")
-    if user_id is None:
-        raise credentials_exception
-
-    try:
-        user_id_int = int(user_id)
-    except ValueError:
-        raise credentials_exception
-
-    user = db.query(User).filter(User.id == user_id_int).first()
-    if user is None:
-        raise credentials_exception
-
-    return user
+) -> UserSnapshot:
+    """Resolve the bearer token to a (cached) user snapshot"""
+    return get_user_from_token(token.credentials, db)
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+def get_me(current_user: UserSnapshot = Depends(get_current_user)):
     """Get current user data including role"""
     return current_user
 
 
 @router.get("/admin/users", response_model=List[AdminUserResponse])
 def get_all_users(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user), db: Session = Depends(get_db)
 ):
     """Admin only: Get list of all registered users"""
     if current_user.role != "admin":
@@ -283,3 +289,15 @@ def get_all_users(
 
     users = db.query(User).all()
     return users
+
+
+@router.get("/admin/hashing-stats")
+def get_hashing_stats(current_user: UserSnapshot = Depends(get_current_user)):
+    """Admin only: bcrypt executor queue depth and throughput counters"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to access this resource",
+        )
+
+    return hashing_executor.get_stats()
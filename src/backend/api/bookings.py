@@ -2,26 +2,40 @@
 Booking API Routes
 """
 
-from datetime import datetime, timedelta
-from typing import List
+from datetime import date, datetime, timedelta
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from src.backend.database.db import get_db
-from src.backend.database.models import Booking, User
+from src.backend.database.models import Booking
+from src.backend.auth.user_cache import UserSnapshot
 from src.backend.auth.security import get_current_user as get_user_from_token
 
 router = APIRouter(prefix="/api/bookings", tags=["bookings"])
 security = HTTPBearer()
 
+# Consultation slots offered each week (mirrors the schedule page)
+WEEKLY_SLOTS = {
+    "Monday": ["09:00 AM", "11:00 AM", "04:00 PM", "05:00 PM"],
+    "Tuesday": ["09:00 AM", "10:00 AM", "11:00 AM", "05:00 PM"],
+    "Wednesday": ["09:00 AM", "10:00 AM", "11:00 AM", "04:00 PM", "05:00 PM"],
+    "Thursday": ["11:00 AM", "04:00 PM", "05:00 PM"],
+    "Friday": ["09:00 AM", "10:00 AM", "11:00 AM"],
+    "Saturday": ["10:00 AM", "11:00 AM", "12:00 PM"],
+    "Sunday": [],
+}
+MAX_AVAILABILITY_DAYS = 31
+
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> UserSnapshot:
     """Dependency to get current authenticated user"""
     return get_user_from_token(credentials.credentials, db)
 
@@ -48,38 +62,41 @@ class BookingResponse(BaseModel):
         from_attributes = True
 
 
+class SlotAvailability(BaseModel):
+    time: str
+    status: str  # "available", "booked" (by someone else) or "mine"
+
+
+class DayAvailability(BaseModel):
+    date: str  # ISO format: "2025-12-20"
+    day: str
+    slots: List[SlotAvailability]
+
+
+def parse_booking_date(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid date format. Use ISO format (YYYY-MM-DD)"
+        )
+
+
 @router.post("/", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
 def create_booking(
     booking_data: BookingCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new consultation booking"""
     
     # Parse booking date
-    try:
-        booking_datetime = datetime.fromisoformat(booking_data.booking_date)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid date format. Use ISO format (YYYY-MM-DD)"
-        )
+    booking_datetime = parse_booking_date(booking_data.booking_date)
     
-    # Check if slot is already booked
-    existing = db.query(Booking).filter(
-        Booking.day == booking_data.day,
-        Booking.time == booking_data.time,
-        Booking.booking_date == booking_datetime,
-        Booking.status == "confirmed"
-    ).first()
-    
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="This time slot is already booked"
-        )
-    
-    # Create booking
+    # Create booking; the partial unique index on confirmed (booking_date, time)
+    # makes the insert itself the availability check, so concurrent requests
+    # for the same slot can't both succeed
     new_booking = Booking(
         user_id=current_user.id,
         name=booking_data.name,
@@ -90,7 +107,14 @@ def create_booking(
     )
     
     db.add(new_booking)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This time slot is already booked"
+        )
     db.refresh(new_booking)
     
     return BookingResponse(
@@ -107,7 +131,7 @@ def create_booking(
 
 @router.get("/my", response_model=List[BookingResponse])
 def get_my_bookings(
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get current user's bookings"""
@@ -130,13 +154,71 @@ def get_my_bookings(
     ]
 
 
+@router.get("/availability", response_model=List[DayAvailability])
+def get_availability(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Free/booked status of every slot in a date window (defaults to next 7 days)"""
+    first_day = parse_booking_date(start_date).date() if start_date else date.today()
+    last_day = (
+        parse_booking_date(end_date).date() if end_date else first_day + timedelta(days=6)
+    )
+    if last_day < first_day:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must not be before start_date"
+        )
+    if (last_day - first_day).days + 1 > MAX_AVAILABILITY_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range too large (max {MAX_AVAILABILITY_DAYS} days)"
+        )
+
+    # One range scan over the confirmed-slot index for the whole window
+    window_start = datetime.combine(first_day, datetime.min.time())
+    window_end = datetime.combine(last_day + timedelta(days=1), datetime.min.time())
+    taken = db.query(Booking.booking_date, Booking.time, Booking.user_id).filter(
+        Booking.status == "confirmed",
+        Booking.booking_date >= window_start,
+        Booking.booking_date < window_end,
+    ).all()
+    owner_by_slot = {(b.booking_date.date(), b.time): b.user_id for b in taken}
+
+    days = []
+    for offset in range((last_day - first_day).days + 1):
+        current = first_day + timedelta(days=offset)
+        day_name = current.strftime("%A")
+        slots = []
+        for slot_time in WEEKLY_SLOTS.get(day_name, []):
+            owner = owner_by_slot.get((current, slot_time))
+            if owner is None:
+                slot_status = "available"
+            elif owner == current_user.id:
+                slot_status = "mine"
+            else:
+                slot_status = "booked"
+            slots.append(SlotAvailability(time=slot_time, status=slot_status))
+        days.append(DayAvailability(date=current.isoformat(), day=day_name, slots=slots))
+    return days
+
+
 @router.get("/", response_model=List[BookingResponse])
 def get_all_bookings(
-    current_user: User = Depends(get_current_user),
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    current_user: UserSnapshot = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all bookings (admin view vs public status)"""
-    bookings = db.query(Booking).order_by(
+    """Get all bookings (admin view vs public status), optionally within a date window"""
+    query = db.query(Booking)
+    if start_date:
+        query = query.filter(Booking.booking_date >= parse_booking_date(start_date))
+    if end_date:
+        query = query.filter(Booking.booking_date <= parse_booking_date(end_date))
+    bookings = query.order_by(
         Booking.booking_date.desc()
     ).all()
     
@@ -160,7 +242,7 @@ def get_all_bookings(
 @router.delete("/{booking_id}")
 def cancel_booking(
     booking_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Cancel a booking (only if >24 hours before appointment)"""
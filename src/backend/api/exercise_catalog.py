@@ -0,0 +1,203 @@
+"""
+Exercise Catalog
+Loads the versioned exercise data file, validates it once and precomputes
+everything the catalog endpoints serve: an ID index, category/difficulty
+buckets and ready-to-send JSON bodies with strong ETags.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+DEFAULT_CATALOG_PATH = Path(__file__).parent.parent / "data" / "exercises.json"
+EXERCISE_CATALOG_PATH = Path(os.getenv("EXERCISE_CATALOG_PATH", str(DEFAULT_CATALOG_PATH)))
+CATALOG_RELOAD_INTERVAL = float(os.getenv("CATALOG_RELOAD_INTERVAL", "5"))  # seconds
+SUPPORTED_CATALOG_VERSIONS = (1,)
+
+
+class CameraPosition(BaseModel):
+    distance: str  # e.g., "2 meters away"
+    angle: str  # e.g., "Side view", "Front view", "45° angle"
+    height: str  # e.g., "Waist level", "Knee level", "Shoulder level"
+    tips: List[str] = []  # Specific tips for camera setup
+
+
+class WeightProgression(BaseModel):
+    starting_weight_lbs: float  # Starting weight recommendation
+    progression_range: str  # e.g., "5-10 lbs", "10-20 lbs"
+    progression_notes: Optional[str] = None  # Tips for progression
+
+
+class EquipmentItem(BaseModel):
+    name: str  # e.g., "5 lbs Ankle Weights"
+    required: bool = True  # Required or optional
+    description: Optional[str] = None  # Additional details
+    image: Optional[str] = None  # Equipment image URL
+    link: Optional[str] = None  # Link to buy/purchase equipment
+
+
+class ExerciseResponse(BaseModel):
+    id: str
+    name: str
+    exercise_type: str  # "rehab", "basic", "advanced", "lifting"
+    category: str  # "upper" or "lower" (body part classification)
+    difficulty: str
+    duration: int  # minutes
+    sets: int
+    reps: int
+    thumbnail: Optional[str] = None
+    description: Optional[str] = None
+    target_muscles: List[str] = []  # Target muscles for this exercise
+    youtube_link: Optional[str] = None  # YouTube tutorial video link
+    camera_position: Optional[CameraPosition] = None  # Camera setup instructions
+    weight_progression: Optional[WeightProgression] = (
+        None  # Weight progression guidance
+    )
+    equipment: List[EquipmentItem] = []  # Required equipment for this exercise
+
+
+class CachedBody:
+    """Pre-serialized JSON response body with its strong ETag"""
+
+    __slots__ = ("body", "etag")
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """If-None-Match check (weak comparison, as RFC 9110 requires for GET)"""
+        if not if_none_match:
+            return False
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate == "*":
+                return True
+            if candidate.startswith("W/"):
+                candidate = candidate[2:]
+            if candidate == self.etag:
+                return True
+        return False
+
+
+class ExerciseCatalog:
+    """Immutable, precomputed view of the exercise list"""
+
+    def __init__(self, exercises: Iterable[dict], version: int = 1):
+        self.version = version
+        self.models: List[ExerciseResponse] = [ExerciseResponse.model_validate(e) for e in exercises]
+        self.by_id: Dict[str, ExerciseResponse] = {m.id: m for m in self.models}
+
+        payloads = [m.model_dump(mode="json") for m in self.models]
+        self._item_bodies: Dict[str, CachedBody] = {
+            m.id: CachedBody(payload) for m, payload in zip(self.models, payloads)
+        }
+
+        # Every (category, difficulty) filter combination, None meaning "any"
+        buckets: Dict[Tuple[Optional[str], Optional[str]], list] = {}
+        for m, payload in zip(self.models, payloads):
+            for key in (
+                (None, None),
+                (m.category, None),
+                (None, m.difficulty),
+                (m.category, m.difficulty),
+            ):
+                buckets.setdefault(key, []).append(payload)
+        self._list_bodies: Dict[Tuple[Optional[str], Optional[str]], CachedBody] = {
+            key: CachedBody(items) for key, items in buckets.items()
+        }
+        self._empty_body = CachedBody([])
+
+    def list_body(self, category: Optional[str] = None, difficulty: Optional[str] = None) -> CachedBody:
+        return self._list_bodies.get((category or None, difficulty or None), self._empty_body)
+
+    def item_body(self, exercise_id: str) -> Optional[CachedBody]:
+        return self._item_bodies.get(exercise_id)
+
+    def get(self, exercise_id: str) -> Optional[ExerciseResponse]:
+        return self.by_id.get(exercise_id)
+
+    def exercise_type(self, exercise_id: str, default: str = "basic") -> str:
+        exercise = self.by_id.get(exercise_id)
+        return exercise.exercise_type if exercise else default
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+
+def load_catalog_file(path: Path) -> ExerciseCatalog:
+    """Read and validate a catalog data file ({"version": N, "exercises": [...]})"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    version = data.get("version")
+    if version not in SUPPORTED_CATALOG_VERSIONS:
+        raise ValueError(f"Unsupported exercise catalog version {version!r} in {path}")
+
+    exercises = data.get("exercises", [])
+    ids = [e.get("id") for e in exercises]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"Duplicate exercise ids in {path}")
+
+    return ExerciseCatalog(exercises, version=version)
+
+
+class CatalogLoader:
+    """
+    Loads the catalog on first use and reloads it when the data file
+    changes (checked at most every CATALOG_RELOAD_INTERVAL seconds), so
+    content edits go live without a deploy. A broken edit keeps serving
+    the last good catalog.
+    """
+
+    def __init__(self, path: Path = EXERCISE_CATALOG_PATH, reload_interval: float = CATALOG_RELOAD_INTERVAL):
+        self.path = Path(path)
+        self.reload_interval = reload_interval
+        self._catalog: Optional[ExerciseCatalog] = None
+        self._mtime: Optional[float] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> ExerciseCatalog:
+        catalog = self._catalog
+        if catalog is not None and time.monotonic() < self._next_check:
+            return catalog
+
+        with self._lock:
+            now = time.monotonic()
+            if self._catalog is not None and now < self._next_check:
+                return self._catalog
+            self._next_check = now + self.reload_interval
+
+            try:
+                mtime = os.stat(self.path).st_mtime
+                if self._catalog is not None and mtime == self._mtime:
+                    return self._catalog
+                self._catalog = load_catalog_file(self.path)
+                self._mtime = mtime
+                logger.info(
+                    f"Loaded exercise catalog v{self._catalog.version} "
+                    f"({len(self._catalog)} exercises) from {self.path}"
+                )
+            except Exception as e:
+                if self._catalog is None:
+                    raise
+                logger.error(f"Keeping previous exercise catalog, reload failed: {e}")
+            return self._catalog
+
+
+catalog_loader = CatalogLoader()
+
+
+def get_exercise_catalog() -> ExerciseCatalog:
+    return catalog_loader.get()
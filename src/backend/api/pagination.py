@@ -0,0 +1,69 @@
+"""
+Keyset (cursor) pagination helpers
+Pages are ordered newest-first on (date, id); the cursor encodes the last
+row's key so the next page is a single indexed range scan, not an OFFSET.
+"""
+
+import base64
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+
+MAX_PAGE_SIZE = 100
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+HAS_MORE_HEADER = "X-Has-More"
+
+
+def encode_cursor(row_date: datetime, row_id: int) -> str:
+    raw = f"{row_date.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        date_part, id_part = raw.rsplit("|", 1)
+        return datetime.fromisoformat(date_part), int(id_part)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def paginate_desc(query, date_column, id_column, limit: int, cursor: Optional[str] = None,
+                  row_key=None) -> Tuple[List[Any], Optional[str]]:
+    """
+    Apply newest-first keyset pagination to a query.
+
+    row_key extracts the model instance from a result row (for joined
+    queries that return tuples). Returns (rows, next_cursor); next_cursor
+    is None on the last page.
+    """
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        query = query.filter(
+            or_(
+                date_column < cursor_date,
+                and_(date_column == cursor_date, id_column < cursor_id),
+            )
+        )
+
+    # One extra row tells us whether another page exists, without a COUNT
+    rows = query.order_by(date_column.desc(), id_column.desc()).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more and rows:
+        last = row_key(rows[-1]) if row_key else rows[-1]
+        next_cursor = encode_cursor(last.date, last.id)
+    return rows, next_cursor
+
+
+def set_page_headers(response: Response, next_cursor: Optional[str]) -> None:
+    """Expose paging state in headers so list bodies stay backward compatible"""
+    response.headers[HAS_MORE_HEADER] = "true" if next_cursor else "false"
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -3,64 +3,39 @@ REST API Routes
 Handles exercises, workouts, stats, and user data
 """
 
-from datetime import date, datetime, timedelta
+import logging
+from datetime import date, datetime, timedelta, timezone
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from pydantic import BaseModel, Field
 from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from src.backend.api.exercise_catalog import (
+    CachedBody,
+    CameraPosition,
+    EquipmentItem,
+    ExerciseResponse,
+    WeightProgression,
+    get_exercise_catalog,
+)
+from src.backend.api.pagination import MAX_PAGE_SIZE, paginate_desc, set_page_headers
+from src.backend.core.achievement_engine import achievement_engine
 from src.backend.database.db import get_db
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+MAX_SYNC_BATCH = 500  # workouts per offline sync request
 
 # Pydantic models for API requests/responses
 from src.backend.api.auth import get_current_user
+from src.backend.auth.user_cache import UserSnapshot
 from src.backend.database.models import User
 
 
-class CameraPosition(BaseModel):
-    distance: str  # e.g., "2 meters away"
-    angle: str  # e.g., "Side view", "Front view", "45° angle"
-    height: str  # e.g., "Waist level", "Knee level", "Shoulder level"
-    tips: List[str] = []  # Specific tips for camera setup
-
-
-class WeightProgression(BaseModel):
-    starting_weight_lbs: float  # Starting weight recommendation
-    progression_range: str  # e.g., "5-10 lbs", "10-20 lbs"
-    progression_notes: Optional[str] = None  # Tips for progression
-
-
-class EquipmentItem(BaseModel):
-    name: str  # e.g., "5 lbs Ankle Weights"
-    required: bool = True  # Required or optional
-    description: Optional[str] = None  # Additional details
-    image: Optional[str] = None  # Equipment image URL
-    link: Optional[str] = None  # Link to buy/purchase equipment
-
-
-class ExerciseResponse(BaseModel):
-    id: str
-    name: str
-    exercise_type: str  # "rehab", "basic", "advanced", "lifting"
-    category: str  # "upper" or "lower" (body part classification)
-    difficulty: str
-    duration: int  # minutes
-    sets: int
-    reps: int
-    thumbnail: Optional[str] = None
-    description: Optional[str] = None
-    target_muscles: List[str] = []  # Target muscles for this exercise
-    youtube_link: Optional[str] = None  # YouTube tutorial video link
-    camera_position: Optional[CameraPosition] = None  # Camera setup instructions
-    weight_progression: Optional[WeightProgression] = (
-        None  # Weight progression guidance
-    )
-    equipment: List[EquipmentItem] = []  # Required equipment for this exercise
-
-
 class TodayStatsResponse(BaseModel):
     reps_today: int
     streak: int
@@ -75,6 +50,28 @@ class WorkoutCreate(BaseModel):
     weight_lbs: Optional[float] = None  # Weight used in lbs
     sets_completed: int = 2  # Number of sets (2-3)
     reps_per_set: int = 15  # Reps per set (15-20)
+    utc_offset_minutes: Optional[int] = Field(None, ge=-14 * 60, le=14 * 60)  # Local time minus UTC, e.g. 330 for IST
+
+
+class WorkoutSyncItem(WorkoutCreate):
+    client_id: str = Field(..., min_length=1, max_length=64)  # Client-generated idempotency key
+    date: Optional[datetime] = None  # When the workout happened (defaults to now)
+
+
+class WorkoutBatchCreate(BaseModel):
+    workouts: List[WorkoutSyncItem] = Field(..., max_length=MAX_SYNC_BATCH)
+
+
+class SyncedWorkout(BaseModel):
+    client_id: str
+    workout_id: int
+
+
+class WorkoutBatchResponse(BaseModel):
+    success: bool
+    created: List[SyncedWorkout]
+    duplicates: List[SyncedWorkout]  # Already synced earlier (or repeated in the batch)
+    unlocked_achievements: List[str] = []
 
 
 class WorkoutResponse(BaseModel):
@@ -168,1470 +165,81 @@ class UpdateProfileRequest(BaseModel):
     preferences: Optional[UserPreferences] = None
 
 
-# Mock data for now (will replace with database)
-EXERCISES = [
-    {
-        "id": "wall-squat",
-        "name": "Wall Squat",
-        "exercise_type": "basic",
-        "category": "lower",
-        "difficulty": "beginner",
-        "duration": 15,
-        "sets": 5,
-        "reps": 5,
-        "thumbnail": "/images/exercises/wall-squat.jpg",
-        "description": "Exercise starts at 12th minute in video.",
-        "target_muscles": [
-            "Hip External Rotators",
-            "Posterior Pelvis",
-            "Quadriceps",
-            "Glutes",
-            "Hip Flexors",
-        ],
-        "youtube_link": "https://youtu.be/6-VSoQnIEnA?si=ZVbenydW41nl8OFF&t=720",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "Bodyweight",
-            "progression_notes": "Bodyweight only exercise. Focus on breathing technique (5 deep breaths per set), position control, and pelvic biomechanics. Progress by increasing squat depth gradually as hip mobility improves. Practice twice daily for 2-4 weeks. Key is understanding sacral counternutation and posterior pelvic expansion for correct deep squat.",
-        },
-        "equipment": [
-            {
-                "name": "Wall",
-                "required": True,
-                "description": "Stand one foot away from wall for support and reference",
-                "image": None,
-                "link": None,
-            }
-        ],
-        "camera_position": {
-            "distance": "2-3 meters away",
-            "angle": "Side view (90°)",
-            "height": "Waist to hip level",
-            "tips": [
-                "Place camera on your side to see full body profile and squat depth",
-                "Ensure both feet, knees, and hip position are visible in frame",
-                "Camera should capture posterior pelvic expansion and hip external rotation",
-                "Keep back arch and chest lift clearly visible",
-                "Watch for proper toe angle (45 degrees) and weight distribution on contact points",
-            ],
-        },
-    },
-    {
-        "id": "plank",
-        "name": "Plank",
-        "exercise_type": "basic",
-        "category": "lower",
-        "difficulty": "beginner",
-        "duration": 5,
-        "sets": 3,
-        "reps": 1,
-        "thumbnail": "/images/exercises/plank.jpg",
-        "description": "Exercise starts in video.",
-        "target_muscles": [
-            "Rectus Abdominis",
-            "Transverse Abdominis",
-            "Obliques",
-            "Erector Spinae",
-            "Core Stabilizers",
-        ],
-        "youtube_link": "https://youtu.be/xijbLirwKtc?si=P0iazX0cJwvvbmcQ",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "Bodyweight",
-            "progression_notes": "Bodyweight only exercise. Focus on proper core engagement - actively squeeze abs and tighten butt. Keep feet slightly back so shoulders align with elbows. When plank becomes difficult, drop to knees and continue holding. Progress by increasing hold duration gradually. Regular practice improves pelvis control, posture, and core strength.",
-        },
-        "equipment": [
-            {
-                "name": "Exercise Mat",
-                "required": False,
-                "description": "Optional - use mat for comfort on hard surfaces",
-                "image": None,
-                "link": "https://example.com/buy/exercise-mat",
-            }
-        ],
-        "camera_position": {
-            "distance": "1.5-2 meters away",
-            "angle": "Side view (90°)",
-            "height": "Ground level or slightly elevated",
-            "tips": [
-                "Place camera on your side to see body alignment",
-                "Camera should be at ground level or slightly above",
-                "Ensure full body from head to feet is visible",
-                "Check that your body forms a straight line in frame",
-                "Watch for proper core engagement and butt squeeze",
-            ],
-        },
-    },
-    {
-        "id": "glute-fly",
-        "name": "Glute Fly",
-        "exercise_type": "rehab",
-        "category": "lower",
-        "difficulty": "intermediate",
-        "duration": 15,
-        "sets": 3,
-        "reps": 10,
-        "thumbnail": "/images/exercises/glute-fly.jpg",
-        "description": "Glute fly exercise for hip mobility and glute activation. Start with bodyweight or light resistance band, then progress to ankle weights. Focus on glute medius activation in the dimple/half-moon area.",
-        "target_muscles": ["Glute Medius", "Glute Minimus", "Hip Abductors"],
-        "youtube_link": "https://youtu.be/ogXvRPqlj8s?si=j6vintQy_kABVj5W",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "0-6 lbs",
-            "progression_notes": "Start with bodyweight, hold 30 seconds. Add 5-6 lbs weight when correct muscle firing is achieved. Keep movement short and compact. Focus on glute medius dimple activation.",
-        },
-        "equipment": [
-            {
-                "name": "2-inch Pad or Towel",
-                "required": True,
-                "description": "Place under knee for support",
-                "image": None,
-                "link": "https://example.com/buy/yoga-block",
-            },
-            {
-                "name": "5-6 lbs Ankle Weight or Dumbbell",
-                "required": False,
-                "description": "Optional - start with bodyweight, add weight when form is correct",
-                "image": None,
-                "link": "https://example.com/buy/ankle-weights",
-            },
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°)",
-            "height": "Hip level",
-            "tips": [
-                "Place camera on your side to see leg movement",
-                "Ensure hips and legs are fully visible",
-                "Camera should capture full range of leg motion",
-                "Keep camera stable for consistent tracking",
-            ],
-        },
-    },
-    {
-        "id": "knee-drop",
-        "name": "Knee Drop",
-        "exercise_type": "rehab",
-        "category": "lower",
-        "difficulty": "intermediate",
-        "duration": 15,
-        "sets": 3,
-        "reps": 15,
-        "thumbnail": "/images/exercises/knee-drop.jpg",
-        "description": "Knee drop exercise for glute minimus and medius activation. Performed in sideline position with controlled up-down knee movement. Focus on slow, controlled motion with emphasis on down phase.",
-        "target_muscles": ["Glute Minimus", "Glute Medius", "Hip Abductors"],
-        "youtube_link": "https://youtu.be/ogXvRPqlj8s?si=j6vintQy_kABVj5W",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "0-8 lbs",
-            "progression_notes": "Start without weight, use 2-inch pad/towel under knee. Progress to 5-8 lbs ankle weight or dumbbell when form is perfect. Focus on down phase for minimus activation. No hip or compensation movement.",
-        },
-        "equipment": [
-            {
-                "name": "2-inch Pad or Towel",
-                "required": True,
-                "description": "Place under knee for medial rotation support",
-                "image": None,
-                "link": "https://example.com/buy/yoga-block",
-            },
-            {
-                "name": "5-8 lbs Ankle Weight or Dumbbell",
-                "required": False,
-                "description": "Optional - add when form is perfect",
-                "image": None,
-                "link": "https://example.com/buy/ankle-weights",
-            },
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°)",
-            "height": "Hip to knee level",
-            "tips": [
-                "Place camera on your side to see knee movement",
-                "Ensure heel alignment with butt center is visible",
-                "Camera should capture knee up-down range",
-                "Keep knees stacked and visible in frame",
-            ],
-        },
-    },
-    {
-        "id": "hamstring-medial-bridge",
-        "name": "Hamstring Medial Bridge",
-        "exercise_type": "rehab",
-        "category": "lower",
-        "difficulty": "intermediate",
-        "duration": 12,
-        "sets": 3,
-        "reps": 15,
-        "thumbnail": "/images/exercises/hamstring-medial-bridge.jpg",
-        "description": "Hamstring medial bridge for medial hamstring (semimembranosus) activation. Lie on back, lift hips with glute squeeze. Focus on inner hamstring tension, not high lift. Avoid back pressure.",
-        "target_muscles": ["Medial Hamstring", "Semimembranosus", "Glutes"],
-        "youtube_link": "https://youtu.be/ogXvRPqlj8s?si=j6vintQy_kABVj5W",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "0-10 lbs",
-            "progression_notes": "Start with bodyweight, focus on medial hamstring feel. Don't lift too high, just enough for inner hamstring tension. Progress to single leg (advanced) after mastering both legs.",
-        },
-        "equipment": [
-            {
-                "name": "Bench",
-                "required": True,
-                "description": "Use a bench for hamstring medial bridge",
-                "image": None,
-                "link": "https://example.com/buy/bench",
-            }
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°)",
-            "height": "Hip to knee level",
-            "tips": [
-                "Place camera on your side to see hip lift",
-                "Ensure full body from head to feet is visible",
-                "Camera should capture hip bridge range",
-                "Keep ankles at 90-degree angle visible",
-            ],
-        },
-    },
-    {
-        "id": "ball-squeeze",
-        "name": "Ball Squeeze",
-        "exercise_type": "rehab",
-        "category": "lower",
-        "difficulty": "beginner",
-        "duration": 10,
-        "sets": 3,
-        "reps": 20,
-        "thumbnail": "/images/exercises/ball-squeeze.jpg",
-        "description": "Ball squeeze exercise for adductor chain activation. Butterfly position with medicine ball or football between knees. Squeeze and relax, focus on groin/adductor activation. Keep back arch for better activation.",
-        "target_muscles": ["Adductors", "Hip Flexors", "Groin"],
-        "youtube_link": "https://youtu.be/ogXvRPqlj8s?si=j6vintQy_kABVj5W",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "N/A (ball size)",
-            "progression_notes": "Start with smaller ball, progress to larger medicine ball. Focus on adductor (groin) feel, not hip flexor pinch. If adductors don't fire, do other exercises first for 3-4 weeks.",
-        },
-        "equipment": [
-            {
-                "name": "Medicine Ball or Football",
-                "required": True,
-                "description": "Start with smaller ball, progress to larger size",
-                "image": None,
-                "link": "https://example.com/buy/medicine-ball",
-            }
-        ],
-        "camera_position": {
-            "distance": "1.5-2 meters away",
-            "angle": "Front view (0°) or 45° angle",
-            "height": "Hip to knee level",
-            "tips": [
-                "Place camera in front or slightly to side",
-                "Ensure ball and knee position are visible",
-                "Camera should capture squeeze motion",
-                "Keep butterfly position clearly in frame",
-            ],
-        },
-    },
-    {
-        "id": "quad-stretch",
-        "name": "Quad Stretch / Safe Extension",
-        "exercise_type": "rehab",
-        "category": "lower",
-        "difficulty": "beginner",
-        "duration": 10,
-        "sets": 3,
-        "reps": 15,
-        "thumbnail": "/images/exercises/quad-stretch.jpg",
-        "description": "Quad stretch and safe extension for knee rehab. Lie on back, one heel at butt line, other leg extended. Gentle quad stretch with toe up. Start with light weight (2.5-5 kg), work within available range.",
-        "target_muscles": ["Quadriceps", "Hip Flexors"],
-        "youtube_link": "https://youtu.be/ogXvRPqlj8s?si=j6vintQy_kABVj5W",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "0-11 lbs (5 kg)",
-            "progression_notes": "Start with bodyweight, gentle stretch. Add 2.5-5 kg (5.5-11 lbs) ankle weight when comfortable. Healthy side can use more weight. Work within available range, don't force. Range improves gradually.",
-        },
-        "equipment": [
-            {
-                "name": "2.5-5 kg (5.5-11 lbs) Ankle Weight",
-                "required": True,
-                "description": "Ankle weight for quad stretch and safe extension",
-                "image": None,
-                "link": "https://example.com/buy/ankle-weights",
-            }
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°)",
-            "height": "Hip to knee level",
-            "tips": [
-                "Place camera on your side to see leg extension",
-                "Ensure heel-to-butt alignment is visible",
-                "Camera should capture quad stretch range",
-                "Keep toe position and knee angle visible",
-            ],
-        },
-    },
-    {
-        "id": "depression-row",
-        "name": "Depression Row",
-        "exercise_type": "rehab",
-        "category": "upper",
-        "difficulty": "intermediate",
-        "duration": 12,
-        "sets": 3,
-        "reps": 12,
-        "thumbnail": "/images/exercises/depression-row.jpg",
-        "description": "Depression row for winged scapula, labrum tears, and shoulder instability. Focus on scapula depression with shoulder slightly forward, chest lifted, and elbow at 45-degree angle. Key is depression movement, not rowing motion. Avoid rolling shoulder back - keep it forward with chest high for proper scapula flat position.",
-        "target_muscles": [
-            "Teres Major",
-            "Teres Minor",
-            "Infraspinatus",
-            "Scapula Stabilizers",
-            "Lower Trapezius",
-        ],
-        "youtube_link": "https://youtu.be/45uGOybW-Ys?si=bTAo23bUEw6Jvj8e",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "0-15 lbs",
-            "progression_notes": "Start with light resistance band or cable. Focus on proper depression technique - shoulder forward, chest lifted, elbow at 45-degree angle. Progress slowly - depression angle improves about 1/4 inch per month with correct form. Master depression before adding advanced exercises.",
-        },
-        "equipment": [
-            {
-                "name": "Exercise Bands",
-                "required": True,
-                "description": "Resistance band or cable for depression row. Start with light resistance, focus on form over weight.",
-                "image": None,
-                "link": "https://example.com/buy/exercise-bands",
-            },
-            {
-                "name": "Cable Machine",
-                "required": False,
-                "description": "Alternative to bands - use cable machine if available",
-                "image": None,
-                "link": "https://example.com/buy/cable-machine",
-            },
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°) or 45° angle",
-            "height": "Shoulder to chest level",
-            "tips": [
-                "Place camera on your side to see scapula movement",
-                "Ensure full upper body and shoulder blade are visible",
-                "Camera should capture scapula depression range",
-                "Keep chest lift and shoulder position clearly in frame",
-                "Watch for winged scapula correction during depression",
-            ],
-        },
-    },
-    {
-        "id": "rear-delt-raise",
-        "name": "Rear Delt Raise",
-        "exercise_type": "basic",
-        "category": "upper",
-        "difficulty": "intermediate",
-        "duration": 10,
-        "sets": 3,
-        "reps": 12,
-        "thumbnail": "/images/exercises/rear-delt-raise.jpg",
-        "description": "Rear delt raise over bench for rear deltoid and scapular stabilizer strengthening. Performed lying on bench with chest supported. Focus on controlled movement with slow eccentric phase. Helps fix winged scapula and improve shoulder stability. Emphasize scapular retraction and depression.",
-        "target_muscles": [
-            "Rear Deltoids",
-            "Rhomboids",
-            "Infraspinatus",
-            "Scapular Stabilizers",
-            "Middle Trapezius",
-        ],
-        "youtube_link": "https://youtu.be/C-YRTquDjbg?si=wlSdPkuC81_3QnMU",
-        "weight_progression": {
-            "starting_weight_lbs": 5.0,
-            "progression_range": "5-10 lbs",
-            "progression_notes": "Start with light weight (5-8 lbs). Focus on form and muscle feel over weight. Progress weight only when form is perfect and scapular control is complete. Slow eccentric (lowering) phase is important to maintain tension in scapula muscles.",
-        },
-        "equipment": [
-            {
-                "name": "Bench",
-                "required": True,
-                "description": "Bench for chest support - lie on side or support torso on bench",
-                "image": None,
-                "link": "https://example.com/buy/bench",
-            },
-            {
-                "name": "5-10 lbs Dumbbells",
-                "required": True,
-                "description": "Light dumbbells per arm - rear delts are small muscles, start light",
-                "image": None,
-                "link": "https://example.com/buy/dumbbells",
-            },
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°) or 45° angle",
-            "height": "Shoulder to chest level",
-            "tips": [
-                "Place camera on your side to see rear delt movement",
-                "Ensure full upper body and shoulder blade are visible",
-                "Camera should capture arm raise range (shoulder height parallel)",
-                "Keep scapular retraction and rear delt squeeze clearly in frame",
-                "Watch for controlled lowering phase and no trunk rotation",
-            ],
-        },
-    },
-    {
-        "id": "pant-pull",
-        "name": "Pant Pull",
-        "exercise_type": "basic",
-        "category": "upper",
-        "difficulty": "beginner",
-        "duration": 8,
-        "sets": 3,
-        "reps": 15,
-        "thumbnail": "/images/exercises/pant-pull.jpg",
-        "description": "Pant pull exercise for scapular strengthening and fixing winged scapula. Standing or slight bend forward stance with arms pulled back like pulling pants waistband. Focus on scapular retraction - squeeze shoulder blades together without shrugging up. Controlled movement to activate scapular stabilizers (rhomboids, rear delts, lower traps). Daily practice recommended to retrain scapular muscles and build strong movement pattern.",
-        "target_muscles": [
-            "Rhomboids",
-            "Rear Deltoids",
-            "Lower Trapezius",
-            "Scapular Stabilizers",
-            "Middle Trapezius",
-        ],
-        "youtube_link": "https://youtu.be/T70OdD3ckcI?si=gTgATcsIuuhWOzT_",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "Bodyweight",
-            "progression_notes": "Start with bodyweight. Focus on proper scapular retraction and controlled movement. Can progress to using resistance bands or light weights once form is perfect. Daily practice is beneficial for scapular stability improvement.",
-        },
-        "equipment": [
-            {
-                "name": "None (Bodyweight)",
-                "required": False,
-                "description": "Can be done with bodyweight only",
-                "image": None,
-                "link": None,
-            },
-            {
-                "name": "Exercise Bands",
-                "required": False,
-                "description": "Optional - add resistance bands for progression once form is perfect",
-                "image": None,
-                "link": "https://example.com/buy/exercise-bands",
-            },
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°) or 45° angle",
-            "height": "Shoulder to chest level",
-            "tips": [
-                "Place camera on your side to see scapular movement",
-                "Ensure full upper body and shoulder blades are visible",
-                "Camera should capture scapular retraction range",
-                "Keep arms and shoulder blade position clearly in frame",
-                "Watch for controlled movement without shoulder shrugging",
-            ],
-        },
-    },
-    {
-        "id": "pad-cuff",
-        "name": "Pad Cuff",
-        "exercise_type": "basic",
-        "category": "upper",
-        "difficulty": "beginner",
-        "duration": 10,
-        "sets": 3,
-        "reps": 15,
-        "thumbnail": "/images/exercises/pad-cuff.jpg",
-        "description": "Pad cuff exercise for shoulder rehab focusing on infraspinatus region. Elbow at hip center line, arm at 90-degree angle. Short range controlled movement with light pressure (5% push down). Goal is to feel tension in infraspinatus region, not front/side shoulder or rear delt. Start with light weight (1-3 kg / 2-6 lbs). Slow and controlled reps, avoid over-stressing shoulder. Focus on mind-muscle connection to infraspinatus region. Perform 2x per week for recovery, avoid high frequency if technique not perfect.",
-        "target_muscles": [
-            "Infraspinatus",
-            "Teres Minor",
-            "Rotator Cuff",
-            "Posterior Deltoids",
-        ],
-        "youtube_link": "https://youtu.be/FLGcoOxTaR4?si=FQBMRtrCKpFHWsac",
-        "weight_progression": {
-            "starting_weight_lbs": 2.0,
-            "progression_range": "2-6 lbs",
-            "progression_notes": "Start with very light weight (1-3 kg / 2-6 lbs). Too much weight can irritate shoulder. Focus on proper form and infraspinatus activation over weight. Progress weight only when technique is perfect and you can consistently feel tension in infraspinatus region. Avoid compensation from other muscles.",
-        },
-        "equipment": [
-            {
-                "name": "Pad or Towel",
-                "required": True,
-                "description": "2-inch pad or towel for support during exercise",
-                "image": None,
-                "link": "https://example.com/buy/pad-towel",
-            },
-            {
-                "name": "Light Dumbbell",
-                "required": True,
-                "description": "Very light dumbbell (1-3 kg / 2-6 lbs) - start low to avoid shoulder irritation",
-                "image": None,
-                "link": "https://example.com/buy/dumbbells",
-            },
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°) or 45° angle",
-            "height": "Shoulder to chest level",
-            "tips": [
-                "Place camera on your side to see shoulder and arm position",
-                "Ensure elbow position at hip center line is clearly visible",
-                "Camera should capture 90-degree arm angle and short range movement",
-                "Keep infraspinatus region and shoulder blade position in frame",
-                "Watch for controlled movement without compensation",
-            ],
-        },
-    },
-    {
-        "id": "weighted-pull-ups",
-        "name": "Weighted Pull-ups",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 10,
-        "sets": 1,
-        "reps": 12,
-        "thumbnail": "/images/exercises/pull-ups.jpg",
-        "description": "Exercise starts in video. NOTE: Requires gym equipment (assisted pull-up machine for warm-up, pull-up bar with weight attachment for working set). Cannot be performed at home without proper setup.",
-        "target_muscles": [
-            "Latissimus Dorsi",
-            "Rhomboids",
-            "Middle Trapezius",
-            "Rear Deltoids",
-            "Biceps",
-            "Brachialis",
-        ],
-        "youtube_link": "https://youtu.be/s8irV9uIxgI?si=W5rk10Gpfk9eexqS",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "Bodyweight to 10-20 lbs",
-            "progression_notes": "Start with assisted pull-ups (20 lbs assist) to build form. Once you can do 11-12 reps with bodyweight, add 5 lbs weight. Focus on correct form: stay back, drive arms to bottom of chest, no shrug. All-out set to failure. If you hit 7-9 reps, use rest-pause (15-30 second rest, then more reps).",
-        },
-        "equipment": [
-            {
-                "name": "Assisted Pull-up Machine",
-                "required": True,
-                "description": "Gym machine with ankle strap for assisted pull-ups (warm-up: 20 lbs assist). Required for form building.",
-                "image": None,
-                "link": "https://example.com/buy/assisted-pull-up-machine",
-            },
-            {
-                "name": "Pull-up Bar with Weight Attachment",
-                "required": True,
-                "description": "Gym pull-up bar with weight belt attachment for weighted pull-ups (working set: 5-20 lbs added weight)",
-                "image": None,
-                "link": "https://example.com/buy/pull-up-bar",
-            },
-            {
-                "name": "Weight Belt",
-                "required": True,
-                "description": "Weight belt for adding weight to pull-ups (5-20 lbs progression)",
-                "image": None,
-                "link": "https://example.com/buy/weight-belt",
-            },
-        ],
-        "camera_position": {
-            "distance": "2-3 meters away",
-            "angle": "Side view (90°) or front view",
-            "height": "Chest to head level",
-            "tips": [
-                "Place camera to capture full body from side or front",
-                "Ensure pull-up bar and full range of motion is visible",
-                "Camera should show body position and arm drive to chest",
-                "Watch for proper form: stay back, no shrug, controlled movement",
-            ],
-        },
-    },
-    {
-        "id": "close-grip-pull-down",
-        "name": "Close Grip Pull Down",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 5,
-        "sets": 1,
-        "reps": 12,
-        "thumbnail": "/images/exercises/pull-down.jpg",
-        "description": "Exercise starts in video. NOTE: This exercise requires gym equipment (pulldown machine). Cannot be performed at home.",
-        "target_muscles": [
-            "Latissimus Dorsi",
-            "Rhomboids",
-            "Middle Trapezius",
-            "Biceps",
-            "Brachialis",
-        ],
-        "youtube_link": "https://youtu.be/s8irV9uIxgI?si=W5rk10Gpfk9eexqS",
-        "weight_progression": {
-            "starting_weight_lbs": 100.0,
-            "progression_range": "100-120 lbs",
-            "progression_notes": "Warm up with 20 lbs less than working weight (100 lbs warm-up, 120 lbs working set). Working set: all-out to failure. Goal is 11-12 reps before increasing weight. Take small pause at bottom for muscle connection and control. After working set, perform drop set for additional volume.",
-        },
-        "equipment": [
-            {
-                "name": "Pulldown Machine (Cable System)",
-                "required": True,
-                "description": "Gym pulldown machine with cable system. Warm-up: 100 lbs, Working set: 120 lbs. Required - cannot be done at home.",
-                "image": None,
-                "link": "https://example.com/buy/pulldown-machine",
-            },
-            {
-                "name": "Close Grip Handle",
-                "required": True,
-                "description": "Close grip attachment for pulldown machine",
-                "image": None,
-                "link": "https://example.com/buy/close-grip-handle",
-            },
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°)",
-            "height": "Chest to head level",
-            "tips": [
-                "Place camera on your side to see full range of motion",
-                "Ensure cable machine and handle position are visible",
-                "Camera should capture controlled pull-down with pause at bottom",
-                "Watch for proper lat engagement and muscle connection",
-            ],
-        },
-    },
-    {
-        "id": "wide-grip-row",
-        "name": "Wide Grip Row",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 5,
-        "sets": 1,
-        "reps": 9,
-        "thumbnail": "/images/exercises/row.jpg",
-        "description": "Exercise starts in video. NOTE: This exercise requires gym equipment (wide grip row machine). Cannot be performed at home.",
-        "target_muscles": [
-            "Upper Latissimus Dorsi",
-            "Rhomboids",
-            "Middle Trapezius",
-            "Rear Deltoids",
-        ],
-        "youtube_link": "https://youtu.be/s8irV9uIxgI?si=W5rk10Gpfk9eexqS",
-        "weight_progression": {
-            "starting_weight_lbs": 90.0,
-            "progression_range": "90-110 lbs",
-            "progression_notes": "Warm up with 20 lbs less than working weight (90 lbs warm-up, 110 lbs working set). Working set: all-out to failure. Goal is 9 reps. This exercise targets upper section of lats. Fatigue from previous exercises may affect performance, which is normal.",
-        },
-        "equipment": [
-            {
-                "name": "Wide Grip Row Machine",
-                "required": True,
-                "description": "Gym row machine with wide grip handle. Warm-up: 90 lbs, Working set: 110 lbs. Required - cannot be done at home.",
-                "image": None,
-                "link": "https://example.com/buy/row-machine",
-            },
-            {
-                "name": "Wide Grip Handle",
-                "required": True,
-                "description": "Wide grip handle attachment for row machine",
-                "image": None,
-                "link": "https://example.com/buy/wide-grip-handle",
-            },
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°)",
-            "height": "Chest level",
-            "tips": [
-                "Place camera on your side to see rowing motion",
-                "Ensure cable machine and handle position are visible",
-                "Camera should capture upper lat engagement",
-                "Watch for controlled rowing motion and proper form",
-            ],
-        },
-    },
-    {
-        "id": "single-arm-row",
-        "name": "Single Arm Row (Cable Machine)",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 5,
-        "sets": 1,
-        "reps": 9,
-        "thumbnail": "/images/exercises/row.jpg",
-        "description": "Exercise starts in video. NOTE: This exercise requires gym equipment (cable machine). Preferred over dumbbell rows for less hip pressure. Cannot be performed at home.",
-        "target_muscles": [
-            "Latissimus Dorsi",
-            "Rhomboids",
-            "Middle Trapezius",
-            "Rear Deltoids",
-            "Biceps",
-        ],
-        "youtube_link": "https://youtu.be/s8irV9uIxgI?si=W5rk10Gpfk9eexqS",
-        "weight_progression": {
-            "starting_weight_lbs": 80.0,
-            "progression_range": "80-100 lbs",
-            "progression_notes": "Preferred over dumbbell rows for less hip pressure. Warm up first, then working set at 100 units (10). All-out set to failure. Single arm allows for better muscle connection and focus. No rest-pause needed if already fatigued from previous exercises.",
-        },
-        "equipment": [
-            {
-                "name": "Cable Machine",
-                "required": True,
-                "description": "Gym cable machine with single handle attachment. Working set: 100 units (10). Required - cannot be done at home.",
-                "image": None,
-                "link": "https://example.com/buy/cable-machine",
-            },
-            {
-                "name": "Single Handle",
-                "required": True,
-                "description": "Single handle attachment for cable machine rowing",
-                "image": None,
-                "link": "https://example.com/buy/single-handle",
-            },
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°)",
-            "height": "Chest level",
-            "tips": [
-                "Place camera on your side to see single arm rowing motion",
-                "Ensure cable machine and handle position are visible",
-                "Camera should capture full range of motion and muscle engagement",
-                "Watch for proper form and controlled movement",
-            ],
-        },
-    },
-    {
-        "id": "weighted-dips",
-        "name": "Dips Off The Bench (Weighted)",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 5,
-        "sets": 1,
-        "reps": 15,
-        "thumbnail": "/images/exercises/dips.jpg",
-        "description": "Exercise starts in video. NOTE: Can be performed at home with bench and dumbbell.",
-        "target_muscles": [
-            "Triceps Brachii",
-            "Anterior Deltoids",
-            "Pectoralis Major (Lower)",
-            "Triceps Horseshoe",
-        ],
-        "youtube_link": "https://youtu.be/s8irV9uIxgI?si=W5rk10Gpfk9eexqS",
-        "weight_progression": {
-            "starting_weight_lbs": 70.0,
-            "progression_range": "70-80 lbs",
-            "progression_notes": "Best exercise for tricep development and horseshoe shape. Keep reps in 12-15 failure range. Warm up first, then working set with 80 lb dumbbell. Once you hit 15 reps, increase weight next week. After weighted set, perform bodyweight burnout for additional volume.",
-        },
-        "equipment": [
-            {
-                "name": "Bench",
-                "required": True,
-                "description": "Flat bench for dips off the bench. Can use home bench or gym bench.",
-                "image": None,
-                "link": "https://example.com/buy/bench",
-            },
-            {
-                "name": "Dumbbell",
-                "required": True,
-                "description": "Weighted dumbbell (70-80 lbs) placed on lap during dips",
-                "image": None,
-                "link": "https://example.com/buy/dumbbells",
-            },
-        ],
-        "camera_position": {
-            "distance": "2-3 meters away",
-            "angle": "Side view (90°)",
-            "height": "Chest to head level",
-            "tips": [
-                "Place camera on your side to see full dip motion",
-                "Ensure bench and full range of motion are visible",
-                "Camera should capture tricep engagement and contraction",
-                "Watch for proper form and controlled movement",
-            ],
-        },
-    },
-    {
-        "id": "incline-skull-crushers",
-        "name": "Incline Skull Crushers (Dumbbells)",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 5,
-        "sets": 1,
-        "reps": 12,
-        "thumbnail": "/images/exercises/skull-crushers.jpg",
-        "description": "Exercise starts in video. NOTE: Can be performed at home with adjustable incline bench and dumbbells.",
-        "target_muscles": [
-            "Triceps Brachii",
-            "Triceps Long Head",
-            "Triceps Lateral Head",
-            "Triceps Medial Head",
-        ],
-        "youtube_link": "https://youtu.be/s8irV9uIxgI?si=W5rk10Gpfk9eexqS",
-        "weight_progression": {
-            "starting_weight_lbs": 30.0,
-            "progression_range": "30-35 lbs",
-            "progression_notes": "Incline version reduces elbow torque compared to flat skull crushers. Warm up first, then working set with 35 lb dumbbells. Goal is 7-12 reps. If you hit 12 reps, increase weight next week. All-out set to failure. No drop set if already fatigued.",
-        },
-        "equipment": [
-            {
-                "name": "Adjustable Incline Bench",
-                "required": True,
-                "description": "Incline bench (30-45 degrees) for skull crushers. Can use adjustable home bench or gym bench.",
-                "image": None,
-                "link": "https://example.com/buy/incline-bench",
-            },
-            {
-                "name": "Dumbbells",
-                "required": True,
-                "description": "Dumbbells (30-35 lbs each) for incline skull crushers",
-                "image": None,
-                "link": "https://example.com/buy/dumbbells",
-            },
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°) or front view",
-            "height": "Chest to head level",
-            "tips": [
-                "Place camera on your side to see full tricep extension",
-                "Ensure incline bench and dumbbell position are visible",
-                "Camera should capture tricep engagement and controlled movement",
-                "Watch for proper elbow position and reduced torque",
-            ],
-        },
-    },
-    {
-        "id": "incline-bench-press",
-        "name": "Incline Bench Press",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 10,
-        "sets": 1,
-        "reps": 12,
-        "thumbnail": "/images/exercises/bench-press.jpg",
-        "description": "Exercise starts in video. NOTE: Requires gym equipment (incline bench press machine or barbell with incline bench). Cannot be performed at home.",
-        "target_muscles": [
-            "Pectoralis Major (Upper)",
-            "Anterior Deltoids",
-            "Triceps Brachii",
-        ],
-        "youtube_link": "https://youtu.be/s8irV9uIxgI?si=W5rk10Gpfk9eexqS",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "Varies by strength level",
-            "progression_notes": "Warm up with 10-15 lbs less than working weight (8 reps). Working set: all-out to failure. Goal is 10-12 reps. Once you hit 12 reps, increase weight next week. Use rest-pause after failure for 2-3 extra reps. Grip: Pinky on bench notch, hands slightly inside elbows (like dumbbell press position). Avoid wider grip to reduce shoulder pressure.",
-        },
-        "equipment": [
-            {
-                "name": "Incline Bench Press Machine",
-                "required": True,
-                "description": "Gym incline bench press machine (30-45 degree angle) or barbell with incline bench",
-                "image": None,
-                "link": "https://example.com/buy/incline-bench-press",
-            }
-        ],
-        "camera_position": {
-            "distance": "2-3 meters away",
-            "angle": "Side view (90°)",
-            "height": "Chest to head level",
-            "tips": [
-                "Place camera on your side to see full bench press motion",
-                "Ensure bench angle and full range of motion are visible",
-                "Camera should capture proper grip position and bar path",
-                "Watch for controlled movement and proper form",
-            ],
-        },
-    },
-    {
-        "id": "flat-dumbbell-bench-press",
-        "name": "Flat Dumbbell Bench Press",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 8,
-        "sets": 1,
-        "reps": 8,
-        "thumbnail": "/images/exercises/bench-press.jpg",
-        "description": "Exercise starts in video. NOTE: Requires gym equipment (flat bench and heavy dumbbells). Cannot be performed at home without proper setup.",
-        "target_muscles": ["Pectoralis Major", "Anterior Deltoids", "Triceps Brachii"],
-        "youtube_link": "https://youtu.be/s8irV9uIxgI?si=W5rk10Gpfk9eexqS",
-        "weight_progression": {
-            "starting_weight_lbs": 70.0,
-            "progression_range": "70-80 lbs",
-            "progression_notes": "Working set with 80 lbs dumbbells. Goal is 8 reps. Once you hit target reps, increase weight next week. Take 3-4 minute rest before working set. After working set, perform quick drop set (e.g., 80 lbs to 60 lbs). No rest-pause with dumbbells (too risky).",
-        },
-        "equipment": [
-            {
-                "name": "Flat Bench",
-                "required": True,
-                "description": "Gym flat bench for dumbbell press",
-                "image": None,
-                "link": "https://example.com/buy/bench",
-            },
-            {
-                "name": "Heavy Dumbbells",
-                "required": True,
-                "description": "Heavy dumbbells (70-80 lbs each) for bench press",
-                "image": None,
-                "link": "https://example.com/buy/dumbbells",
-            },
-        ],
-        "camera_position": {
-            "distance": "2-3 meters away",
-            "angle": "Side view (90°)",
-            "height": "Chest level",
-            "tips": [
-                "Place camera on your side to see full dumbbell press motion",
-                "Ensure bench and full range of motion are visible",
-                "Camera should capture controlled movement and proper form",
-                "Watch for proper dumbbell path and chest engagement",
-            ],
-        },
-    },
-    {
-        "id": "cable-crossovers",
-        "name": "Cable Crossovers/Flys",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 5,
-        "sets": 1,
-        "reps": 12,
-        "thumbnail": "/images/exercises/cable-fly.jpg",
-        "description": "Exercise starts in video. NOTE: Requires gym equipment (cable machine). Cannot be performed at home.",
-        "target_muscles": ["Pectoralis Major (Inner)", "Anterior Deltoids"],
-        "youtube_link": "https://youtu.be/s8irV9uIxgI?si=W5rk10Gpfk9eexqS",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "Varies by strength level",
-            "progression_notes": "Warm up first, then all-out set to failure. Goal is 12 solid reps. Don't go too far back - only go back as far as you can without shrugging and while maintaining inner chest connection. After failure, perform partials for total fatigue (these don't count in main rep count).",
-        },
-        "equipment": [
-            {
-                "name": "Cable Machine",
-                "required": True,
-                "description": "Gym cable machine with cable crossover setup",
-                "image": None,
-                "link": "https://example.com/buy/cable-machine",
-            }
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Front view or side view (90°)",
-            "height": "Chest level",
-            "tips": [
-                "Place camera in front or side to see cable fly motion",
-                "Ensure cable machine and full range of motion are visible",
-                "Camera should capture inner chest engagement",
-                "Watch for proper form - don't go too far back, maintain chest connection",
-            ],
-        },
-    },
-    {
-        "id": "hammer-curls",
-        "name": "Hammer Curls",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 5,
-        "sets": 1,
-        "reps": 8,
-        "thumbnail": "/images/exercises/bicep-curl.jpg",
-        "description": "Exercise starts in video. NOTE: Requires gym equipment (dumbbells). Safer alternative to regular curls for elbow pressure.",
-        "target_muscles": [
-            "Biceps Brachii",
-            "Brachialis",
-            "Brachioradialis",
-            "Forearm Extensors",
-        ],
-        "youtube_link": "https://youtu.be/s8irV9uIxgI?si=W5rk10Gpfk9eexqS",
-        "weight_progression": {
-            "starting_weight_lbs": 30.0,
-            "progression_range": "30-35 lbs",
-            "progression_notes": "Warm up with 30 lbs (12 reps target). Working set with 35 lbs (7-8 reps target). If too much elbow pressure, drop weight and do lighter high reps (15-20) for burnout. Hammer curls put more pressure on wrist extensors.",
-        },
-        "equipment": [
-            {
-                "name": "Dumbbells",
-                "required": True,
-                "description": "Dumbbells (30-35 lbs each) for hammer curls",
-                "image": None,
-                "link": "https://example.com/buy/dumbbells",
-            }
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Front view or side view (90°)",
-            "height": "Chest to shoulder level",
-            "tips": [
-                "Place camera in front or side to see hammer curl motion",
-                "Ensure full range of motion and arm position are visible",
-                "Camera should capture bicep and forearm engagement",
-                "Watch for proper form and controlled movement",
-            ],
-        },
-    },
-    {
-        "id": "barbell-curls",
-        "name": "Barbell Curls",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 5,
-        "sets": 1,
-        "reps": 12,
-        "thumbnail": "/images/exercises/bicep-curl.jpg",
-        "description": "Exercise starts in video. NOTE: Requires gym equipment (barbell). Cannot be performed at home.",
-        "target_muscles": ["Biceps Brachii", "Brachialis", "Forearm Flexors"],
-        "youtube_link": "https://youtu.be/s8irV9uIxgI?si=W5rk10Gpfk9eexqS",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "Varies by strength level",
-            "progression_notes": "Quick 2-rep warm-up, then 1.5 minute rest before working set. When you fail, use swing to get weight up, then focus on eccentric (negative) portion for 4 extra reps. This technique helps maximize volume after failure.",
-        },
-        "equipment": [
-            {
-                "name": "Barbell",
-                "required": True,
-                "description": "Gym barbell with appropriate weight plates",
-                "image": None,
-                "link": "https://example.com/buy/barbell",
-            }
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Front view or side view (90°)",
-            "height": "Chest to shoulder level",
-            "tips": [
-                "Place camera in front or side to see barbell curl motion",
-                "Ensure full range of motion and bar path are visible",
-                "Camera should capture bicep engagement and form",
-                "Watch for controlled movement and proper technique",
-            ],
-        },
-    },
-    {
-        "id": "cable-crunch",
-        "name": "Cable Crunch/Ab Roll",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 5,
-        "sets": 1,
-        "reps": 15,
-        "thumbnail": "/images/exercises/crunch.jpg",
-        "description": "Exercise starts in video. NOTE: Requires gym equipment (cable system). Cannot be performed at home.",
-        "target_muscles": ["Rectus Abdominis", "Obliques", "Transverse Abdominis"],
-        "youtube_link": "https://youtu.be/s8irV9uIxgI?si=W5rk10Gpfk9eexqS",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "Bodyweight to weighted",
-            "progression_notes": "Performed on knees using cable system. Focus on squeezing butt and tucking under. If you feel pressure in low back, you're not ready for this position. Should only feel abs, not low back. Usually paired with side raises for obliques.",
-        },
-        "equipment": [
-            {
-                "name": "Cable System",
-                "required": True,
-                "description": "Gym cable machine with cable crunch attachment",
-                "image": None,
-                "link": "https://example.com/buy/cable-machine",
-            }
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°)",
-            "height": "Waist to chest level",
-            "tips": [
-                "Place camera on your side to see cable crunch motion",
-                "Ensure cable system and full range of motion are visible",
-                "Camera should capture core engagement and form",
-                "Watch for proper butt squeeze and tuck position",
-            ],
-        },
-    },
-    {
-        "id": "incline-dumbbell-shoulder-press",
-        "name": "Incline Dumbbell Shoulder Press",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 8,
-        "sets": 1,
-        "reps": 7,
-        "thumbnail": "/images/exercises/shoulder-press.jpg",
-        "description": "Exercise starts in video. NOTE: Requires gym equipment (incline bench and dumbbells). Cannot be performed at home.",
-        "target_muscles": [
-            "Anterior Deltoids",
-            "Lateral Deltoids",
-            "Triceps Brachii",
-            "Upper Pectoralis",
-        ],
-        "youtube_link": "https://youtu.be/OuctHJhvR5A?si=z2eMMG7O2dLozgFq",
-        "weight_progression": {
-            "starting_weight_lbs": 40.0,
-            "progression_range": "40-65 lbs",
-            "progression_notes": "Warm up with 40s. Working set with 65s. Goal is 7-8 reps. Cycle is 4-8 weeks. Try to stretch up and touch for full range. No rest-pause with dumbbells (risky). After working set, perform quick drop set.",
-        },
-        "equipment": [
-            {
-                "name": "Incline Bench",
-                "required": True,
-                "description": "Gym incline bench (slight incline, not totally upright)",
-                "image": None,
-                "link": "https://example.com/buy/incline-bench",
-            },
-            {
-                "name": "Dumbbells",
-                "required": True,
-                "description": "Heavy dumbbells (40-65 lbs each) for shoulder press",
-                "image": None,
-                "link": "https://example.com/buy/dumbbells",
-            },
-        ],
-        "camera_position": {
-            "distance": "2-3 meters away",
-            "angle": "Front view or side view (90°)",
-            "height": "Chest to head level",
-            "tips": [
-                "Place camera in front or side to see full shoulder press motion",
-                "Ensure bench angle and full range of motion are visible",
-                "Camera should capture proper form and controlled movement",
-                "Watch for full range - stretch up and touch",
-            ],
-        },
-    },
-    {
-        "id": "lateral-raises-advanced",
-        "name": "Lateral Raises (Dumbbells)",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 5,
-        "sets": 1,
-        "reps": 15,
-        "thumbnail": "/images/exercises/lateral-raise.jpg",
-        "description": "Exercise starts in video. NOTE: Requires gym equipment (dumbbells). Cannot be performed at home.",
-        "target_muscles": ["Lateral Deltoids", "Anterior Deltoids"],
-        "youtube_link": "https://youtu.be/OuctHJhvR5A?si=z2eMMG7O2dLozgFq",
-        "weight_progression": {
-            "starting_weight_lbs": 15.0,
-            "progression_range": "15-20 lbs",
-            "progression_notes": "Warm up with 15s. Working set with 20s. Only increase weight when you can hit around 15 reps. Heavy weight (like 25s for 5-6 reps) can hurt shoulders. Slight lean forward. After working set, perform drop set if needed.",
-        },
-        "equipment": [
-            {
-                "name": "Dumbbells",
-                "required": True,
-                "description": "Dumbbells (15-20 lbs each) for lateral raises",
-                "image": None,
-                "link": "https://example.com/buy/dumbbells",
-            }
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Front view or side view (90°)",
-            "height": "Chest to shoulder level",
-            "tips": [
-                "Place camera in front or side to see lateral raise motion",
-                "Ensure full range of motion and arm position are visible",
-                "Camera should capture lateral deltoid engagement",
-                "Watch for proper form - slight lean forward",
-            ],
-        },
-    },
-    {
-        "id": "lateral-raises-weak-spot",
-        "name": "Lateral Raises - Weak Spot Focus",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 5,
-        "sets": 1,
-        "reps": 12,
-        "thumbnail": "/images/exercises/lateral-raise.jpg",
-        "description": "Exercise starts in video. NOTE: Requires gym equipment (cable machine or dumbbells). Targets under-developed shoulder area.",
-        "target_muscles": ["Lateral Deltoids", "Rear Deltoids", "Upper Shoulder"],
-        "youtube_link": "https://youtu.be/OuctHJhvR5A?si=z2eMMG7O2dLozgFq",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "Varies by strength level",
-            "progression_notes": "Targets area between lateral head and rear delt. Slight lean and lateral flex. Keep shoulder down. Only go to top of shoulder. Finisher: use cable system for rest-pause at this specific angle to crush weak area.",
-        },
-        "equipment": [
-            {
-                "name": "Cable Machine",
-                "required": True,
-                "description": "Gym cable machine or dumbbells for weak spot lateral raises",
-                "image": None,
-                "link": "https://example.com/buy/cable-machine",
-            }
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°) or front view",
-            "height": "Shoulder level",
-            "tips": [
-                "Place camera to see lateral raise from side or front",
-                "Ensure weak spot area (between lateral and rear delt) is visible",
-                "Camera should capture slight lean and lateral flex position",
-                "Watch for proper shoulder position - keep down",
-            ],
-        },
-    },
-    {
-        "id": "dips-parallel-bars",
-        "name": "Dips (Parallel Bars)",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 5,
-        "sets": 1,
-        "reps": 12,
-        "thumbnail": "/images/exercises/dips.jpg",
-        "description": "Exercise starts in video. NOTE: Requires gym equipment (parallel bars or dip machine). For triceps stimulus.",
-        "target_muscles": [
-            "Triceps Brachii",
-            "Anterior Deltoids",
-            "Pectoralis Major (Lower)",
-        ],
-        "youtube_link": "https://youtu.be/OuctHJhvR5A?si=z2eMMG7O2dLozgFq",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "Bodyweight to 10 lbs",
-            "progression_notes": "Bodyweight dips for now (weighted dips hard on shoulders). Technique: knees forward, shoulders down (like pants pull position) to avoid pinching. Nice pause at bottom. Once you hit 12 reps, add 10 lbs weight next week.",
-        },
-        "equipment": [
-            {
-                "name": "Parallel Bars",
-                "required": True,
-                "description": "Gym parallel bars or dip machine",
-                "image": None,
-                "link": "https://example.com/buy/parallel-bars",
-            }
-        ],
-        "camera_position": {
-            "distance": "2-3 meters away",
-            "angle": "Side view (90°)",
-            "height": "Chest to head level",
-            "tips": [
-                "Place camera on your side to see full dip motion",
-                "Ensure parallel bars and full range of motion are visible",
-                "Camera should capture tricep engagement and proper form",
-                "Watch for shoulders down position and pause at bottom",
-            ],
-        },
-    },
-    {
-        "id": "traps-shrugs",
-        "name": "Traps/Shrugs",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 5,
-        "sets": 2,
-        "reps": 12,
-        "thumbnail": "/images/exercises/shrug.jpg",
-        "description": "Exercise starts in video. NOTE: Requires gym equipment (dumbbells or weight). Focus on weak side.",
-        "target_muscles": ["Upper Trapezius", "Levator Scapulae"],
-        "youtube_link": "https://youtu.be/OuctHJhvR5A?si=z2eMMG7O2dLozgFq",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "Varies by strength level",
-            "progression_notes": "Focus on weak side (usually left). Slight lean, come up with elbows, squeeze at top. Do 2-3 sets. Previously avoided due to right side neck pull (left side was weak).",
-        },
-        "equipment": [
-            {
-                "name": "Dumbbells",
-                "required": True,
-                "description": "Dumbbells or weight for traps/shrugs",
-                "image": None,
-                "link": "https://example.com/buy/dumbbells",
-            }
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°) or front view",
-            "height": "Shoulder to head level",
-            "tips": [
-                "Place camera to see shrug motion from side or front",
-                "Ensure full range of motion and trap engagement are visible",
-                "Camera should capture proper form - elbows up, squeeze at top",
-                "Watch for weak side focus",
-            ],
-        },
-    },
-    {
-        "id": "forearm-extension-fix",
-        "name": "Forearm Extension Fix",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 5,
-        "sets": 1,
-        "reps": 15,
-        "thumbnail": "/images/exercises/forearm.jpg",
-        "description": "Exercise starts in video. NOTE: Requires gym equipment (dumbbells). Targets weak forearm extensors.",
-        "target_muscles": ["Forearm Extensors", "Wrist Extensors"],
-        "youtube_link": "https://youtu.be/OuctHJhvR5A?si=z2eMMG7O2dLozgFq",
-        "weight_progression": {
-            "starting_weight_lbs": 0.0,
-            "progression_range": "Light weight to start",
-            "progression_notes": "Right side usually very weak. Right hand always in 'whittling' or 'dishes' position, so extensors weak. Start light - heavy weight can cause wrist pinch. Goal is to build strength to 15 reps.",
-        },
-        "equipment": [
-            {
-                "name": "Dumbbells",
-                "required": True,
-                "description": "Light dumbbells for forearm extension exercises",
-                "image": None,
-                "link": "https://example.com/buy/dumbbells",
-            }
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°)",
-            "height": "Forearm to elbow level",
-            "tips": [
-                "Place camera on your side to see forearm extension motion",
-                "Ensure wrist and forearm position are visible",
-                "Camera should capture extension movement",
-                "Watch for proper form and avoid wrist pinch",
-            ],
-        },
-    },
-    {
-        "id": "forearm-flexion-fix",
-        "name": "Forearm Flexion/Grip Fix",
-        "exercise_type": "advanced",
-        "category": "upper",
-        "difficulty": "advanced",
-        "duration": 5,
-        "sets": 1,
-        "reps": 20,
-        "thumbnail": "/images/exercises/forearm.jpg",
-        "description": "Exercise starts in video. NOTE: Requires gym equipment (dumbbells). Targets weak grip/left arm.",
-        "target_muscles": ["Forearm Flexors", "Grip Muscles", "Wrist Flexors"],
-        "youtube_link": "https://youtu.be/OuctHJhvR5A?si=z2eMMG7O2dLozgFq",
-        "weight_progression": {
-            "starting_weight_lbs": 4.0,
-            "progression_range": "4-20 lbs",
-            "progression_notes": "Designed for left arm (weak in gripping position). Dominant right arm used more for suitcase/coffee cup. Warm up with 4 lbs, then heavy grip with 20s. Crush and continue until muscle is completely fatigued and fried. Left arm still feels very weak in this position.",
-        },
-        "equipment": [
-            {
-                "name": "Dumbbells",
-                "required": True,
-                "description": "Dumbbells (4-20 lbs) for forearm flexion/grip exercises",
-                "image": None,
-                "link": "https://example.com/buy/dumbbells",
-            }
-        ],
-        "camera_position": {
-            "distance": "2-2.5 meters away",
-            "angle": "Side view (90°)",
-            "height": "Forearm to elbow level",
-            "tips": [
-                "Place camera on your side to see forearm flexion/grip motion",
-                "Ensure wrist and grip position are visible",
-                "Camera should capture flexion movement and grip strength",
-                "Watch for proper form and left arm focus",
-            ],
-        },
-    },
-    {
-        "id": "box-squat",
-        "name": "Box Squat",
-        "exercise_type": "lifting",
-        "category": "lower",
-        "difficulty": "intermediate",
-        "duration": 10,
-        "sets": 2,
-        "reps": 12,
-        "thumbnail": "/images/exercises/box-squat.jpg",
-        "description": "Exercise starts in video. NOTE: Requires gym equipment (squat rack, barbell, weight plates, box/bench). Cannot be performed at home. Box squat for quad-focused bodybuilding style. Safer than regular squats - requires control at bottom, no bounce or stretch reflex. For bodybuilding: 90° depth, only 20% pressure on box, quads flexed at bottom. Keep knees pushed out, use glutes. Shoulder-width stance. First set: 10-12 reps connection set at 10-15 lbs less. Second set: failure set at working weight. Progress: when you hit 12 reps, increase weight by 10-15 lbs next week. Start with 65-75 lbs, progress to 85-95 lbs.",
-        "target_muscles": [
-            "Quadriceps",
-            "Glutes",
-            "Hamstrings",
-            "Erector Spinae",
-            "Core Stabilizers",
-        ],
-        "youtube_link": None,
-        "weight_progression": {
-            "starting_weight_lbs": 65.0,
-            "progression_range": "65-95+ lbs",
-            "progression_notes": "Start with 65 lbs for connection set (10-12 reps). Working set at 75 lbs (8-12 reps to failure). When you hit 12 reps, increase weight by 10-15 lbs next week. First set: 10-15 lbs less than working weight (connection/challenge set). Second set: failure set at working weight. Rest 2-3 minutes between sets. Focus on quad engagement at bottom - only 20% pressure on box. Keep quads flexed throughout. Progress by 10-15 lbs when hitting 12 reps consistently.",
-        },
-        "equipment": [
-            {
-                "name": "Box or Bench",
-                "required": True,
-                "description": "Gym box or bench set to 90° depth (hip top piece should be slightly below knee line for bodybuilding style)",
-                "image": None,
-                "link": "https://example.com/buy/box-bench",
-            },
-            {
-                "name": "Barbell",
-                "required": True,
-                "description": "Gym Olympic barbell for loaded squats",
-                "image": None,
-                "link": "https://example.com/buy/barbell",
-            },
-            {
-                "name": "Weight Plates",
-                "required": True,
-                "description": "Gym weight plates for progressive loading (start with 65-75 lbs total)",
-                "image": None,
-                "link": "https://example.com/buy/weight-plates",
-            },
-            {
-                "name": "Squat Rack",
-                "required": True,
-                "description": "Gym squat rack or power rack for safety and proper setup",
-                "image": None,
-                "link": "https://example.com/buy/squat-rack",
-            },
-        ],
-        "camera_position": {
-            "distance": "2-3 meters away",
-            "angle": "Side view (90°)",
-            "height": "Hip to knee level",
-            "tips": [
-                "Place camera on your side to see full squat motion and depth",
-                "Ensure box, full range of motion, and knee position are visible",
-                "Camera should capture 90° depth and quad engagement at bottom",
-                "Watch for proper knee position (pushed out, not caving in)",
-                "Check that only 20% pressure is on box, quads remain flexed",
-                "Ensure shoulder-width stance and proper bar position are visible",
-            ],
-        },
-    },
-]
+# The exercise catalog lives in src/backend/data/exercises.json and is loaded
+# lazily (see exercise_catalog.CatalogLoader); endpoints serve its
+# pre-validated, pre-serialized bodies.
+CATALOG_CACHE_CONTROL = "public, no-cache"  # always revalidate, usually a 304
+
+
+def get_exercise_type(exercise_id: str) -> str:
+    """Exercise type (rehab/basic/advanced/lifting) for achievement rules"""
+    return get_exercise_catalog().exercise_type(exercise_id)
+
+
+def cached_json_response(cached: CachedBody, if_none_match: Optional[str]) -> Response:
+    """Serve a pre-serialized body, or 304 if the client already has it"""
+    headers = {"ETag": cached.etag, "Cache-Control": CATALOG_CACHE_CONTROL}
+    if cached.matches(if_none_match):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+def _utc_offset_minutes(item: WorkoutSyncItem) -> Optional[int]:
+    """The client's UTC offset: given explicitly, or taken from an aware date"""
+    if item.utc_offset_minutes is not None or item.date is None or item.date.utcoffset() is None:
+        return item.utc_offset_minutes
+    return int(item.date.utcoffset().total_seconds() // 60)
+
+
+def _as_naive_utc(value: datetime) -> datetime:
+    """Stored timestamps are naive UTC (datetime.utcnow)"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def record_achievement_progress(db: Session, user_id: int, record) -> List[str]:
+    """
+    Run an achievement engine update after a committed write. Failures are
+    logged and rolled back so they never lose the workout/diet entry itself;
+    the counters are then marked stale so the next write rebuilds them
+    instead of trailing the history for good.
+    """
+    try:
+        unlocked = record()
+        db.commit()
+        return unlocked
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error updating achievements for user {user_id}: {e}")
+    try:
+        achievement_engine.invalidate(db, user_id)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Could not mark achievement counters stale for user {user_id}: {e}")
+    return []
 
 
 @router.get("/exercises", response_model=List[ExerciseResponse])
 async def get_exercises(
-    category: Optional[str] = None, difficulty: Optional[str] = None
+    category: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
 ):
     """Get list of all exercises with optional filters"""
-    exercises = EXERCISES.copy()
-
-    if category:
-        exercises = [e for e in exercises if e["category"] == category]
-
-    if difficulty:
-        exercises = [e for e in exercises if e["difficulty"] == difficulty]
-
-    return exercises
+    return cached_json_response(
+        get_exercise_catalog().list_body(category, difficulty), if_none_match
+    )
 
 
 @router.get("/exercises/{exercise_id}", response_model=ExerciseResponse)
-async def get_exercise(exercise_id: str):
+async def get_exercise(exercise_id: str, if_none_match: Optional[str] = Header(None)):
     """Get details of a specific exercise"""
-    exercise = next((e for e in EXERCISES if e["id"] == exercise_id), None)
-    if not exercise:
+    cached = get_exercise_catalog().item_body(exercise_id)
+    if cached is None:
         raise HTTPException(status_code=404, detail="Exercise not found")
-    return exercise
+    return cached_json_response(cached, if_none_match)
 
 
 @router.get("/cameras")
@@ -1645,7 +253,7 @@ async def get_cameras():
 
 @router.get("/stats/today", response_model=TodayStatsResponse)
 async def get_today_stats(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user), db: Session = Depends(get_db)
 ):
     """Get today's workout statistics"""
     from datetime import date, datetime, timedelta
@@ -1716,7 +324,7 @@ async def get_today_stats(
 
 @router.get("/stats/weekly")
 async def get_weekly_stats(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user), db: Session = Depends(get_db)
 ):
     """Get weekly workout statistics for last 7 days (Mon-Sun)"""
     from datetime import date, datetime, timedelta
@@ -1773,7 +381,7 @@ async def get_weekly_stats(
 @router.post("/workouts", response_model=dict)
 async def save_workout(
     workout: WorkoutCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Save a completed workout to database"""
@@ -1784,6 +392,7 @@ async def save_workout(
         user_id=current_user.id,
         exercise_id=workout.exercise_id,
         date=datetime.utcnow(),
+        utc_offset_minutes=workout.utc_offset_minutes,
         duration_seconds=workout.duration,
         reps_completed=workout.reps_completed,
         calories_burned=0,  # Not used, set to 0
@@ -1796,31 +405,139 @@ async def save_workout(
     db.commit()
     db.refresh(db_workout)
 
+    unlocked = record_achievement_progress(
+        db,
+        current_user.id,
+        lambda: achievement_engine.record_workout(
+            db, current_user.id, db_workout, get_exercise_type
+        ),
+    )
+
     return {
         "success": True,
         "workout_id": db_workout.id,
         "message": "Workout saved successfully",
+        "unlocked_achievements": unlocked,
     }
 
 
+@router.post("/workouts/batch", response_model=WorkoutBatchResponse)
+async def save_workouts_batch(
+    batch: WorkoutBatchCreate,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Save workouts recorded offline in one transaction
+
+    Each workout carries a client-generated `client_id`; replaying a batch
+    (e.g. after a dropped response) returns the already-stored ids under
+    `duplicates` instead of inserting them again.
+    """
+    from src.backend.database.models import Workout
+
+    # First occurrence wins when the same key repeats inside the batch
+    items = {}
+    for item in batch.workouts:
+        items.setdefault(item.client_id, item)
+
+    existing = dict(
+        db.query(Workout.client_id, Workout.id)
+        .filter(Workout.user_id == current_user.id, Workout.client_id.in_(list(items)))
+        .all()
+    )
+
+    now = datetime.utcnow()
+    new_workouts = [
+        Workout(
+            user_id=current_user.id,
+            client_id=item.client_id,
+            exercise_id=item.exercise_id,
+            date=min(_as_naive_utc(item.date), now) if item.date else now,
+            utc_offset_minutes=_utc_offset_minutes(item),
+            duration_seconds=item.duration,
+            reps_completed=item.reps_completed,
+            calories_burned=0,  # Not used, set to 0
+            weight_lbs=item.weight_lbs,
+            sets_completed=item.sets_completed,
+            reps_per_set=item.reps_per_set,
+        )
+        for client_id, item in items.items()
+        if client_id not in existing
+    ]
+
+    db.add_all(new_workouts)
+    try:
+        db.flush()
+        # Read ids before commit expires the rows (avoids a reload per row)
+        stored = {**existing, **{w.client_id: w.id for w in new_workouts}}
+        db.commit()
+    except IntegrityError:
+        # A concurrent sync stored some of these keys first; the batch is
+        # idempotent, so the client can simply resend it.
+        db.rollback()
+        raise HTTPException(
+            status_code=409, detail="Workouts were synced concurrently, please retry"
+        )
+
+    unlocked = []
+    if new_workouts:
+        # Derived stats are updated once for the whole batch; one query
+        # reloads the rows the commit expired
+        new_ids = [stored[client_id] for client_id in items if client_id not in existing]
+        unlocked = record_achievement_progress(
+            db,
+            current_user.id,
+            lambda: achievement_engine.record_workouts(
+                db,
+                current_user.id,
+                db.query(Workout).filter(Workout.id.in_(new_ids)).all(),
+                get_exercise_type,
+            ),
+        )
+
+    created, duplicates = [], []
+    reported = set()
+    for item in batch.workouts:
+        synced = SyncedWorkout(client_id=item.client_id, workout_id=stored[item.client_id])
+        if item.client_id in existing or item.client_id in reported:
+            duplicates.append(synced)
+        else:
+            created.append(synced)
+        reported.add(item.client_id)
+
+    return WorkoutBatchResponse(
+        success=True,
+        created=created,
+        duplicates=duplicates,
+        unlocked_achievements=unlocked,
+    )
+
+
 @router.get("/workouts/history", response_model=List[WorkoutResponse])
 async def get_workout_history(
-    limit: int = 10,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: UserSnapshot = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Get workout history - list of past workouts user completed"""
+    """Get workout history - list of past workouts user completed
+
+    Newest first. Pass the X-Next-Cursor response header back as `cursor`
+    to fetch the next page; X-Has-More is "false" on the last page.
+    """
     from src.backend.database.models import Exercise, Workout
 
     # Query workouts with exercise details
-    workouts = (
+    query = (
         db.query(Workout, Exercise)
         .join(Exercise, Workout.exercise_id == Exercise.id)
         .filter(Workout.user_id == current_user.id)
-        .order_by(Workout.date.desc())
-        .limit(limit)
-        .all()
     )
+    workouts, next_cursor = paginate_desc(
+        query, Workout.date, Workout.id, limit, cursor, row_key=lambda row: row[0]
+    )
+    set_page_headers(response, next_cursor)
 
     # Format response
     history = []
@@ -1844,7 +561,7 @@ async def get_workout_history(
 
 @router.get("/achievements")
 async def get_achievements(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user), db: Session = Depends(get_db)
 ):
     """Get user achievements with category filtering (rehab/basic/advanced/lifting)"""
     from src.backend.database.models import Achievement, UserAchievement
@@ -1917,7 +634,7 @@ async def get_achievements(
 @router.post("/diet/entries", response_model=DietEntryResponse)
 async def create_diet_entry(
     entry: DietEntryCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Add a new diet entry"""
@@ -1943,17 +660,33 @@ async def create_diet_entry(
     db.commit()
     db.refresh(db_entry)
 
+    record_achievement_progress(
+        db,
+        current_user.id,
+        lambda: achievement_engine.record_diet_entry(
+            db, current_user.id, get_exercise_type
+        ),
+    )
+    db.refresh(db_entry)
+
     return db_entry
 
 
 @router.get("/diet/entries", response_model=List[DietEntryResponse])
 async def get_diet_entries(
+    response: Response,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: UserSnapshot = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Get diet entries for a date range (defaults to today)"""
+    """Get diet entries for a date range (defaults to today)
+
+    Newest first, paged with the same X-Next-Cursor / X-Has-More headers
+    as /workouts/history.
+    """
     from src.backend.database.models import DietEntry
 
     query = db.query(DietEntry).filter(DietEntry.user_id == current_user.id)
@@ -1972,63 +705,141 @@ async def get_diet_entries(
         today_end = datetime.combine(date.today(), datetime.max.time())
         query = query.filter(DietEntry.date >= today_start, DietEntry.date <= today_end)
 
-    entries = query.order_by(DietEntry.date.desc()).all()
+    entries, next_cursor = paginate_desc(
+        query, DietEntry.date, DietEntry.id, limit, cursor
+    )
+    set_page_headers(response, next_cursor)
     return entries
 
 
+# Columns summed into total_<name> by the diet stats endpoints
+NUTRIENT_FIELDS = (
+    "protein",
+    "carbs",
+    "fats",
+    "calories",
+    "omega3",
+    "magnesium",
+    "vitamin_b1",
+    "vitamin_d3",
+    "zinc",
+)
+
+# Calculate protein goal (default: 1.8g per kg, assuming 70kg = 126g)
+# In future, this can be based on user profile (age, weight)
+PROTEIN_GOAL_G = 126.0  # 70kg * 1.8g/kg
+
+MAX_DIET_STATS_RANGE_DAYS = 366
+
+
+def _nutrient_total_columns():
+    """SUM(...) for every nutrient plus the entry count, as one select list"""
+    from src.backend.database.models import DietEntry
+
+    columns = [
+        func.coalesce(func.sum(getattr(DietEntry, field)), 0.0).label(f"total_{field}")
+        for field in NUTRIENT_FIELDS
+    ]
+    columns.append(func.count(DietEntry.id).label("entries_count"))
+    return columns
+
+
+def _diet_stats_row(target: date, row) -> dict:
+    stats = {"date": target}
+    for field in NUTRIENT_FIELDS:
+        stats[f"total_{field}"] = float(getattr(row, f"total_{field}", 0.0) or 0.0)
+    stats["entries_count"] = int(getattr(row, "entries_count", 0) or 0)
+    stats["protein_goal"] = PROTEIN_GOAL_G
+    return stats
+
+
+def _parse_diet_date(value: str) -> date:
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid date: {value}")
+
+
 @router.get("/diet/stats", response_model=DietStatsResponse)
 async def get_diet_stats(
     target_date: Optional[str] = None,
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Get daily nutrition statistics"""
     from src.backend.database.models import DietEntry
 
     if target_date:
-        target = datetime.fromisoformat(target_date.replace("Z", "+00:00")).date()
+        target = _parse_diet_date(target_date)
     else:
         target = date.today()
 
     start = datetime.combine(target, datetime.min.time())
     end = datetime.combine(target, datetime.max.time())
 
-    entries = (
-        db.query(DietEntry)
+    # All totals in a single aggregate query
+    totals = (
+        db.query(*_nutrient_total_columns())
         .filter(
             DietEntry.user_id == current_user.id,
             DietEntry.date >= start,
             DietEntry.date <= end,
         )
-        .all()
+        .one()
     )
 
-    # Calculate totals
-    stats = {
-        "date": target,
-        "total_protein": sum(e.protein for e in entries),
-        "total_carbs": sum(e.carbs for e in entries),
-        "total_fats": sum(e.fats for e in entries),
-        "total_calories": sum(e.calories for e in entries),
-        "total_omega3": sum(e.omega3 for e in entries),
-        "total_magnesium": sum(e.magnesium for e in entries),
-        "total_vitamin_b1": sum(e.vitamin_b1 for e in entries),
-        "total_vitamin_d3": sum(e.vitamin_d3 for e in entries),
-        "total_zinc": sum(e.zinc for e in entries),
-        "entries_count": len(entries),
-    }
+    return _diet_stats_row(target, totals)
+
+
+@router.get("/diet/stats/range", response_model=List[DietStatsResponse])
+async def get_diet_stats_range(
+    start_date: str,
+    end_date: str,
+    current_user: UserSnapshot = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Get per-day nutrition statistics for every day in [start_date, end_date]"""
+    from src.backend.database.models import DietEntry
+
+    first_day = _parse_diet_date(start_date)
+    last_day = _parse_diet_date(end_date)
+    if last_day < first_day:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    num_days = (last_day - first_day).days + 1
+    if num_days > MAX_DIET_STATS_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range too large (max {MAX_DIET_STATS_RANGE_DAYS} days)",
+        )
+
+    start = datetime.combine(first_day, datetime.min.time())
+    end = datetime.combine(last_day, datetime.max.time())
 
-    # Calculate protein goal (default: 1.8g per kg, assuming 70kg = 126g)
-    # In future, this can be based on user profile (age, weight)
-    stats["protein_goal"] = 126.0  # 70kg * 1.8g/kg
+    day = func.date(DietEntry.date).label("day")
+    rows = (
+        db.query(day, *_nutrient_total_columns())
+        .filter(
+            DietEntry.user_id == current_user.id,
+            DietEntry.date >= start,
+            DietEntry.date <= end,
+        )
+        .group_by(day)
+        .all()
+    )
+    by_day = {str(row.day): row for row in rows}
 
+    # Days without entries are reported as zero totals
+    stats = []
+    for offset in range(num_days):
+        current = first_day + timedelta(days=offset)
+        stats.append(_diet_stats_row(current, by_day.get(current.isoformat())))
     return stats
 
 
 @router.delete("/diet/entries/{entry_id}")
 async def delete_diet_entry(
     entry_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Delete a diet entry"""
@@ -2050,7 +861,7 @@ async def delete_diet_entry(
 
 @router.get("/user/profile", response_model=UserProfileResponse)
 async def get_user_profile(
-    current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
+    current_user: UserSnapshot = Depends(get_current_user), db: Session = Depends(get_db)
 ):
     """Get user profile with stats and preferences"""
     from datetime import datetime, timedelta
@@ -2137,11 +948,14 @@ async def get_user_profile(
 @router.put("/user/profile", response_model=UserProfileResponse)
 async def update_user_profile(
     updates: UpdateProfileRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: UserSnapshot = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Update user profile"""
-    user = current_user
+    # current_user is a cached snapshot; load the row to apply the update
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
 
     # Update fields if provided
     if updates.name is not None:
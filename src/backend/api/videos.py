@@ -0,0 +1,144 @@
+"""
+Video Analysis API Routes
+Upload a recorded workout and get back reps, angles and form issues.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from src.backend.api.auth import get_current_user
+from src.backend.auth.user_cache import UserSnapshot
+from src.backend.core.video_analysis import (
+    MAX_VIDEO_UPLOAD_MB,
+    discard_video_pool,
+    extract_chunk_landmarks,
+    get_video_pool,
+    merge_chunks,
+    plan_chunks,
+    probe_video,
+    score_landmarks,
+    summarize,
+)
+
+router = APIRouter(prefix="/videos", tags=["videos"])
+logger = logging.getLogger(__name__)
+
+UPLOAD_READ_SIZE = 1024 * 1024  # bytes per read while spooling the upload to disk
+
+
+async def spool_upload(upload: UploadFile, max_bytes: int) -> str:
+    """Copy the upload to a temp file piece by piece; returns its path"""
+    suffix = os.path.splitext(upload.filename or "")[1] or ".mp4"
+    fd, path = tempfile.mkstemp(prefix="video-", suffix=suffix)
+    written = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                block = await upload.read(UPLOAD_READ_SIZE)
+                if not block:
+                    break
+                written += len(block)
+                if written > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"Video is larger than {MAX_VIDEO_UPLOAD_MB} MB",
+                    )
+                out.write(block)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+def discard_upload(path: str) -> None:
+    """Delete a spooled upload; it may already be gone"""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def event_line(event: dict) -> bytes:
+    return (json.dumps(event, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+async def analysis_events(path: str, exercise: str):
+    """
+    NDJSON progress stream: one "progress" event per finished chunk, then
+    a single "result" (or "error") event. Deletes the spooled video at the end
+    (analyze_uploaded_video also does, in case the stream never runs to completion).
+    """
+    started = time.monotonic()
+    loop = asyncio.get_running_loop()
+    pool = get_video_pool()
+    try:
+        info = await loop.run_in_executor(pool, probe_video, path)
+        chunks = plan_chunks(info.frame_count, info.fps)
+        if not chunks:
+            yield event_line({"type": "error", "message": "Video has no frames"})
+            return
+        yield event_line({
+            "type": "started",
+            "frame_count": info.frame_count,
+            "fps": info.fps,
+            "chunks_total": len(chunks),
+        })
+
+        pending = [
+            loop.run_in_executor(pool, extract_chunk_landmarks, path, chunk) for chunk in chunks
+        ]
+        extracted = []
+        for done in asyncio.as_completed(pending):
+            extracted.append(await done)
+            yield event_line({
+                "type": "progress",
+                "chunks_done": len(extracted),
+                "chunks_total": len(chunks),
+            })
+
+        landmarks = merge_chunks(extracted, info.frame_count)
+        scored = await loop.run_in_executor(
+            pool, score_landmarks, exercise, landmarks, info.fps, info.width, info.height
+        )
+        yield event_line({"type": "result", **summarize(exercise, info, scored, started)})
+    except BrokenProcessPool as e:
+        discard_video_pool(pool)
+        logger.error(f"Video analysis worker crashed for {exercise}: {e}")
+        yield event_line({"type": "error", "message": "Video analysis worker crashed, please retry"})
+    except Exception as e:
+        logger.error(f"Video analysis failed for {exercise}: {e}")
+        yield event_line({"type": "error", "message": str(e)})
+    finally:
+        discard_upload(path)
+
+
+@router.post("/analyze")
+async def analyze_uploaded_video(
+    exercise: str = Query(..., description="Exercise performed in the video (squat, glute-fly, etc)"),
+    video: UploadFile = File(...),
+    current_user: UserSnapshot = Depends(get_current_user),
+):
+    """Analyze an uploaded workout video
+
+    The upload is spooled to disk and processed in parallel time chunks.
+    The response is newline-delimited JSON: "started", then "progress"
+    after each chunk, then a final "result" with the rep timeline, per-frame
+    angles and form-violation spans.
+    """
+    path = await spool_upload(video, MAX_VIDEO_UPLOAD_MB * 1024 * 1024)
+    logger.info(f"Analyzing uploaded {exercise} video for user {current_user.id}")
+    # The generator's finally only runs once streaming starts
+    return StreamingResponse(
+        analysis_events(path, exercise),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(discard_upload, path),
+    )
@@ -9,10 +9,11 @@ import json
 import logging
 from typing import Optional
 
-import cv2
 import numpy as np
 from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
 
+from src.backend.core.session_recorder import RECORDING_ENABLED, SessionRecorder, start_session_recording
+
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
@@ -20,144 +21,14 @@ logger = logging.getLogger(__name__)
 # Trainers are now lazy-loaded in get_trainer()
 
 
-# Rehab exercise wrappers (basic processing for now, full trainers coming soon)
-
-
-class KneeDropTrainer:
-    """Wrapper for Knee Drop exercise - uses basic processing for now"""
-
-    def __init__(self):
-        self.reps = 0
-        self.current_feedback = "Knee Drop - Position yourself in sideline position"
-        print("[KneeDropTrainer] Using basic processing (full trainer coming soon)")
-
-    def process_frame(self, results, w: int, h: int, side: str = "left"):
-        if not results.pose_landmarks:
-            return {
-                "reps": self.reps,
-                "feedback": "No pose detected - step into frame",
-                "angles": {},
-                "progress": 0.0,
-            }
-        return {
-            "reps": self.reps,
-            "feedback": "Knee Drop exercise - Focus on slow, controlled down phase",
-            "angles": {},
-            "progress": 0.0,
-        }
-
-
-class HamstringMedialBridgeTrainer:
-    """Wrapper for Hamstring Medial Bridge exercise - uses basic processing for now"""
-
-    def __init__(self):
-        self.reps = 0
-        self.current_feedback = "Hamstring Medial Bridge - Lie on back, lift hips"
-        print(
-            "[HamstringMedialBridgeTrainer] Using basic processing (full trainer coming soon)"
-        )
-
-    def process_frame(self, results, w: int, h: int, side: str = "left"):
-        if not results.pose_landmarks:
-            return {
-                "reps": self.reps,
-                "feedback": "No pose detected - step into frame",
-                "angles": {},
-                "progress": 0.0,
-            }
-        return {
-            "reps": self.reps,
-            "feedback": "Hamstring Medial Bridge - Focus on inner hamstring tension",
-            "angles": {},
-            "progress": 0.0,
-        }
-
-
-class BallSqueezeTrainer:
-    """Wrapper for Ball Squeeze exercise - uses basic processing for now"""
-
-    def __init__(self):
-        self.reps = 0
-        self.current_feedback = (
-            "Ball Squeeze - Butterfly position with ball between knees"
-        )
-        print("[BallSqueezeTrainer] Using basic processing (full trainer coming soon)")
-
-    def process_frame(self, results, w: int, h: int, side: str = "left"):
-        if not results.pose_landmarks:
-            return {
-                "reps": self.reps,
-                "feedback": "No pose detected - step into frame",
-                "angles": {},
-                "progress": 0.0,
-            }
-        return {
-            "reps": self.reps,
-            "feedback": "Ball Squeeze - Focus on adductor (groin) activation",
-            "angles": {},
-            "progress": 0.0,
-        }
-
-
-class QuadStretchTrainer:
-    """Wrapper for Quad Stretch exercise - uses basic processing for now"""
-
-    def __init__(self):
-        self.reps = 0
-        self.current_feedback = "Quad Stretch - Lie on back, extend leg gently"
-        print("[QuadStretchTrainer] Using basic processing (full trainer coming soon)")
-
-    def process_frame(self, results, w: int, h: int, side: str = "left"):
-        if not results.pose_landmarks:
-            return {
-                "reps": self.reps,
-                "feedback": "No pose detected - step into frame",
-                "angles": {},
-                "progress": 0.0,
-            }
-        return {
-            "reps": self.reps,
-            "feedback": "Quad Stretch - Work within available range, don't force",
-            "angles": {},
-            "progress": 0.0,
-        }
-
-
-class DepressionRowTrainer:
-    """Wrapper for Depression Row exercise - uses basic processing for now"""
-
-    def __init__(self):
-        self.reps = 0
-        self.current_feedback = (
-            "Depression Row - Shoulder forward, chest lifted, elbow at 45°"
-        )
-        print(
-            "[DepressionRowTrainer] Using basic processing (full trainer coming soon)"
-        )
-
-    def process_frame(self, results, w: int, h: int, side: str = "left"):
-        if not results.pose_landmarks:
-            return {
-                "reps": self.reps,
-                "feedback": "No pose detected - step into frame",
-                "angles": {},
-                "progress": 0.0,
-            }
-        return {
-            "reps": self.reps,
-            "feedback": "Depression Row - Focus on scapula depression, not rowing. Keep shoulder forward, chest high.",
-            "angles": {},
-            "progress": 0.0,
-        }
-
-
 class WorkoutStreamManager:
     """Manages workout video streaming via WebSocket"""
 
-    def __init__(self, exercise: str):
+    def __init__(self, exercise: str, recorder: Optional[SessionRecorder] = None):
         self.exercise = exercise
         self.active = False
         self.trainer = None
+        self.recorder = recorder  # opt-in session capture (?record=true)
 
     def get_trainer(self):
         """Initialize the appropriate trainer based on exercise type"""
@@ -190,6 +61,54 @@ class WorkoutStreamManager:
         ):
             from src.backend.exercises.squat_trainer import SquatTrainer
             return SquatTrainer()
+        # Rehab exercises before the generic keyword matches below:
+        # "depressionrow" contains both "press" and "row"
+        elif "kneedrop" in exercise_lower or (
+            "knee" in exercise_lower and "drop" in exercise_lower
+        ):
+            try:
+                from src.backend.exercises.knee_drop_trainer import KneeDropTrainer
+                return KneeDropTrainer()
+            except Exception as e:
+                logger.error(f"Error initializing KneeDropTrainer: {e}")
+                raise ValueError(f"Knee Drop trainer not available: {e}")
+        elif "hamstring" in exercise_lower and (
+            "medial" in exercise_lower or "bridge" in exercise_lower
+        ):
+            try:
+                from src.backend.exercises.hamstring_medial_bridge_trainer import HamstringMedialBridgeTrainer
+                return HamstringMedialBridgeTrainer()
+            except Exception as e:
+                logger.error(f"Error initializing HamstringMedialBridgeTrainer: {e}")
+                raise ValueError(f"Hamstring Medial Bridge trainer not available: {e}")
+        elif "ballsqueeze" in exercise_lower or (
+            "ball" in exercise_lower and "squeeze" in exercise_lower
+        ):
+            try:
+                from src.backend.exercises.ball_squeeze_trainer import BallSqueezeTrainer
+                return BallSqueezeTrainer()
+            except Exception as e:
+                logger.error(f"Error initializing BallSqueezeTrainer: {e}")
+                raise ValueError(f"Ball Squeeze trainer not available: {e}")
+        elif "quadstretch" in exercise_lower or (
+            "quad" in exercise_lower
+            and ("stretch" in exercise_lower or "extension" in exercise_lower)
+        ):
+            try:
+                from src.backend.exercises.quad_stretch_trainer import QuadStretchTrainer
+                return QuadStretchTrainer()
+            except Exception as e:
+                logger.error(f"Error initializing QuadStretchTrainer: {e}")
+                raise ValueError(f"Quad Stretch trainer not available: {e}")
+        elif "depressionrow" in exercise_lower or (
+            "depression" in exercise_lower and "row" in exercise_lower
+        ):
+            try:
+                from src.backend.exercises.depression_row_trainer import DepressionRowTrainer
+                return DepressionRowTrainer()
+            except Exception as e:
+                logger.error(f"Error initializing DepressionRowTrainer: {e}")
+                raise ValueError(f"Depression Row trainer not available: {e}")
         elif "pushup" in exercise_lower or "push" in exercise_lower:
             from src.backend.exercises.pushup_trainer import PushupTrainer
             return PushupTrainer()
@@ -246,52 +165,6 @@ class WorkoutStreamManager:
             except Exception as e:
                 logger.error(f"Error initializing GluteFlyTrainer: {e}")
                 raise ValueError(f"Glute Fly trainer not available: {e}")
-        elif "kneedrop" in exercise_lower or (
-            "knee" in exercise_lower and "drop" in exercise_lower
-        ):
-            # Knee Drop trainer
-            try:
-                return KneeDropTrainer()
-            except Exception as e:
-                logger.error(f"Error initializing KneeDropTrainer: {e}")
-                raise ValueError(f"Knee Drop trainer not available: {e}")
-        elif "hamstring" in exercise_lower and (
-            "medial" in exercise_lower or "bridge" in exercise_lower
-        ):
-            # Hamstring Medial Bridge trainer
-            try:
-                return HamstringMedialBridgeTrainer()
-            except Exception as e:
-                logger.error(f"Error initializing HamstringMedialBridgeTrainer: {e}")
-                raise ValueError(f"Hamstring Medial Bridge trainer not available: {e}")
-        elif "ballsqueeze" in exercise_lower or (
-            "ball" in exercise_lower and "squeeze" in exercise_lower
-        ):
-            # Ball Squeeze trainer
-            try:
-                return BallSqueezeTrainer()
-            except Exception as e:
-                logger.error(f"Error initializing BallSqueezeTrainer: {e}")
-                raise ValueError(f"Ball Squeeze trainer not available: {e}")
-        elif "quadstretch" in exercise_lower or (
-            "quad" in exercise_lower
-            and ("stretch" in exercise_lower or "extension" in exercise_lower)
-        ):
-            # Quad Stretch trainer
-            try:
-                return QuadStretchTrainer()
-            except Exception as e:
-                logger.error(f"Error initializing QuadStretchTrainer: {e}")
-                raise ValueError(f"Quad Stretch trainer not available: {e}")
-        elif "depressionrow" in exercise_lower or (
-            "depression" in exercise_lower and "row" in exercise_lower
-        ):
-            # Depression Row trainer
-            try:
-                return DepressionRowTrainer()
-            except Exception as e:
-                logger.error(f"Error initializing DepressionRowTrainer: {e}")
-                raise ValueError(f"Depression Row trainer not available: {e}")
         elif "weightedpullup" in exercise_lower or (
             "weighted" in exercise_lower and "pull" in exercise_lower
         ):
@@ -410,6 +283,8 @@ class WorkoutStreamManager:
 
     async def process_client_frames(self, websocket: WebSocket):
         """Process frames sent from client via WebSocket"""
+        import cv2
+
         self.active = True
         
         try:
@@ -480,6 +355,9 @@ class WorkoutStreamManager:
                             "angles": {},
                         }
 
+                    if self.recorder is not None:
+                        self.recorder.add_frame(results.pose_landmarks, feedback, (w, h))
+
                     # Encode frame back to JPEG to send to client
                     _, buffer = cv2.imencode(
                         ".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 80]
@@ -508,6 +386,8 @@ class WorkoutStreamManager:
 
     async def stream_frames(self, websocket: WebSocket, camera_device: str = "auto"):
         """Stream video frames with pose detection"""
+        import cv2
+
         self.active = True
         self.trainer = self.get_trainer()
 
@@ -572,6 +452,9 @@ class WorkoutStreamManager:
                             "angles": {},
                         }
 
+                    if self.recorder is not None:
+                        self.recorder.add_frame(results.pose_landmarks, feedback, (w, h))
+
                     # Encode frame to JPEG
                     _, buffer = cv2.imencode(
                         ".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 80]
@@ -610,6 +493,7 @@ async def workout_websocket(
     websocket: WebSocket,
     exercise: str = Query(..., description="Exercise type (squat, glute-fly, etc)"),
     camera: str = Query("auto", description="Camera device (auto, 0, 1, etc)"),
+    record: bool = Query(False, description="Save landmarks and trainer output for this session"),
 ):
     """
     WebSocket endpoint for real-time workout streaming
@@ -617,6 +501,8 @@ async def workout_websocket(
     Query Parameters:
     - exercise: Type of exercise to perform
     - camera: Camera device ID ("auto" for auto-detect external, or "0", "1", etc)
+    - record: Opt in to recording the session (see core/session_recorder.py);
+      ignored unless the server sets SESSION_RECORDING_ENABLED=true
 
     Message Types:
     - frame: Video frame with pose detection
@@ -627,7 +513,16 @@ async def workout_websocket(
     await websocket.accept()
     logger.info(f"WebSocket connected for exercise: {exercise}, camera: {camera}")
 
-    manager = WorkoutStreamManager(exercise)
+    recorder = None
+    if record and not RECORDING_ENABLED:
+        logger.warning("Session recording requested but SESSION_RECORDING_ENABLED is off")
+    elif record:
+        try:
+            recorder = start_session_recording(exercise, camera=camera)
+        except Exception as e:
+            logger.error(f"Could not start session recording: {e}")
+
+    manager = WorkoutStreamManager(exercise, recorder=recorder)
 
     try:
         # Send initial connection message
@@ -657,6 +552,9 @@ async def workout_websocket(
             pass
     finally:
         manager.active = False
+        if recorder is not None:
+            # Waits for the writer thread; keep it off the event loop
+            await asyncio.to_thread(recorder.close)
         try:
             await websocket.close()
         except:
@@ -0,0 +1,139 @@
+"""
+Google ID Token Verification
+Caches Google's OAuth2 signing certificates (honoring their Cache-Control
+max-age) and fetches them over a pooled HTTP session, so verifying a Google
+login is normally just a local signature check.
+"""
+
+import base64
+import json
+import re
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+GOOGLE_OAUTH2_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+DEFAULT_CERTS_MAX_AGE = 3600  # seconds, used when Google sends no max-age
+MIN_FORCED_REFRESH_INTERVAL = 30  # seconds between refreshes for unknown key ids
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def parse_max_age(headers: Mapping[str, str]) -> Optional[int]:
+    """Return the remaining freshness lifetime from Cache-Control/Age headers"""
+    cache_control = headers.get("Cache-Control") or headers.get("cache-control") or ""
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return 0
+    match = _MAX_AGE_RE.search(cache_control)
+    if not match:
+        return None
+    max_age = int(match.group(1))
+    try:
+        age = int(headers.get("Age") or headers.get("age") or 0)
+    except ValueError:
+        age = 0
+    return max(0, max_age - age)
+
+
+def get_unverified_kid(token: str) -> Optional[str]:
+    """Read the key id from a JWT header without verifying anything"""
+    try:
+        header_segment = token.split(".", 1)[0]
+        padded = header_segment + "=" * (-len(header_segment) % 4)
+        header = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        return None
+    return header.get("kid") if isinstance(header, dict) else None
+
+
+class StaticCertSource:
+    """Fixed key id -> PEM certificate set (tests and offline development)"""
+
+    def __init__(self, certs: Mapping[str, str]):
+        self.certs = dict(certs)
+
+    def get_certs(self, force_refresh: bool = False) -> Dict[str, str]:
+        return self.certs
+
+
+class GoogleCertCache:
+    """Fetches Google's signing certs once per max-age over a pooled session"""
+
+    def __init__(self, certs_url: str = GOOGLE_OAUTH2_CERTS_URL, session=None, timeout: float = 10.0):
+        self.certs_url = certs_url
+        self.timeout = timeout
+        self._session = session
+        self._certs: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._last_fetch = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+            self._session = session
+        return self._session
+
+    def get_certs(self, force_refresh: bool = False) -> Dict[str, str]:
+        """Return cached certs, refetching when expired (or forced for key rotation)"""
+        now = time.monotonic()
+        if not force_refresh and self._certs and now < self._expires_at:
+            return self._certs
+
+        with self._lock:
+            now = time.monotonic()
+            if force_refresh:
+                # Don't let a flood of tokens with bogus key ids hammer Google
+                if now - self._last_fetch < MIN_FORCED_REFRESH_INTERVAL and self._certs:
+                    return self._certs
+            elif self._certs and now < self._expires_at:
+                return self._certs
+            self._refresh(now)
+            return self._certs
+
+    def _refresh(self, now: float) -> None:
+        response = self.session.get(self.certs_url, timeout=self.timeout)
+        if response.status_code != 200:
+            raise ValueError(
+                f"Could not fetch certificates at {self.certs_url} (HTTP {response.status_code})"
+            )
+        max_age = parse_max_age(response.headers)
+        self._certs = response.json()
+        self._last_fetch = now
+        self._expires_at = now + (DEFAULT_CERTS_MAX_AGE if max_age is None else max_age)
+
+
+class GoogleTokenVerifier:
+    """Verifies Google ID tokens against a (cached or injected) cert source"""
+
+    def __init__(self, client_id: Optional[str], cert_source=None, clock_skew_in_seconds: int = 10):
+        self.client_id = client_id
+        self.cert_source = cert_source if cert_source is not None else GoogleCertCache()
+        self.clock_skew_in_seconds = clock_skew_in_seconds
+
+    def verify(self, token: str) -> Mapping[str, Any]:
+        """Return the token claims; raises ValueError if the token is invalid"""
+        from google.auth import jwt as google_jwt
+
+        certs = self.cert_source.get_certs()
+        kid = get_unverified_kid(token)
+        if kid is not None and kid not in certs:
+            # Google rotated its keys since our last fetch
+            certs = self.cert_source.get_certs(force_refresh=True)
+
+        idinfo = google_jwt.decode(
+            token,
+            certs=certs,
+            audience=self.client_id,
+            clock_skew_in_seconds=self.clock_skew_in_seconds,
+        )
+        if idinfo.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer: {idinfo.get('iss')}")
+        return idinfo
@@ -0,0 +1,92 @@
+"""
+Password Hashing Executor
+Runs bcrypt hashing/verification on a small dedicated thread pool. The auth
+handlers are sync (FastAPI runs them in its threadpool, off the event loop)
+and block on the pool's future, so a login burst is capped at max_workers
+bcrypt calls instead of taking every threadpool slot and CPU core from the
+live workout WebSockets.
+"""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from src.backend.auth.security import get_password_hash, verify_password
+
+# Configuration
+HASHING_MAX_WORKERS = int(os.getenv("HASHING_MAX_WORKERS", "2"))
+HASHING_MAX_QUEUE = int(os.getenv("HASHING_MAX_QUEUE", "32"))
+
+
+class HashingBusyError(Exception):
+    """Raised when the hashing queue is full and the request should be retried"""
+
+
+class HashingExecutor:
+    """Bounded executor for bcrypt work with queue-depth metrics"""
+
+    def __init__(self, max_workers: int = HASHING_MAX_WORKERS, max_queue: int = HASHING_MAX_QUEUE):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="bcrypt"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0  # submitted but not yet finished (running + queued)
+        self._running = 0
+        self._peak_pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def submit(self, fn, *args) -> Future:
+        """Queue fn(*args) on the pool, rejecting when the queue is full"""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise HashingBusyError("Too many concurrent authentication requests")
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+        try:
+            return self._executor.submit(self._call, fn, args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+    def _call(self, fn, args):
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            # Counted before the future resolves, so callers see final stats
+            with self._lock:
+                self._running -= 1
+                self._pending -= 1
+                self._completed += 1
+
+    def hash_password(self, password: str) -> str:
+        """Blocks the calling (threadpool) thread until the pool has hashed it"""
+        return self.submit(get_password_hash, password).result()
+
+    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return self.submit(verify_password, plain_password, hashed_password).result()
+
+    def get_stats(self) -> dict:
+        """Snapshot of queue depth and throughput counters"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": max(0, self._pending - self._running),
+                "peak_pending": self._peak_pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+hashing_executor = HashingExecutor()
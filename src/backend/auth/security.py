@@ -56,16 +56,25 @@ def decode_access_token(token: str) -> Optional[dict]:
 
 
 def get_current_user(token: str, db):
-    """Get current user from JWT token (dependency for routes)"""
+    """Get current user from JWT token (dependency for routes)
+
+    Returns a cached UserSnapshot; the users table is only queried on a
+    cache miss.
+    """
     from fastapi import HTTPException, status
+    from src.backend.auth.user_cache import UserSnapshot, user_cache
     from src.backend.database.models import User
-    
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    cached = user_cache.get(token)
+    if cached is not None:
+        return cached
+
     payload = decode_access_token(token)
     if payload is None:
         raise credentials_exception
@@ -83,4 +92,6 @@ def get_current_user(token: str, db):
     if user is None:
         raise credentials_exception
 
-    return user
+    snapshot = UserSnapshot.from_user(user)
+    user_cache.put(token, snapshot, token_exp=payload.get("exp"))
+    return snapshot
@@ -0,0 +1,122 @@
+"""
+Authenticated User Cache
+Keeps a bounded, short-lived map of access token -> user snapshot so that
+authenticated endpoints don't have to SELECT the user on every request.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import event
+
+from src.backend.database.models import User
+
+# Configuration
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "2048"))
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Read-only copy of the User columns endpoints read from current_user"""
+
+    id: int
+    name: Optional[str]
+    email: Optional[str]
+    role: str
+    google_id: Optional[str]
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            name=user.name,
+            email=user.email,
+            role=user.role or "user",
+            google_id=user.google_id,
+            created_at=user.created_at,
+        )
+
+
+class UserCache:
+    """Thread-safe LRU cache of decoded token -> UserSnapshot with a TTL"""
+
+    def __init__(self, ttl_seconds: float = USER_CACHE_TTL_SECONDS, max_size: int = USER_CACHE_MAX_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[UserSnapshot, float]]" = OrderedDict()
+        self._tokens_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[UserSnapshot]:
+        """Return the cached snapshot for a token, or None if missing/expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            snapshot, expires_at = entry
+            if expires_at <= now:
+                self._remove(token)
+                return None
+            self._entries.move_to_end(token)
+            return snapshot
+
+    def put(self, token: str, snapshot: UserSnapshot, token_exp: Optional[float] = None) -> None:
+        """Cache a snapshot; never outlives the token's own `exp` claim"""
+        expires_at = time.monotonic() + self.ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, time.monotonic() + (token_exp - time.time()))
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (snapshot, expires_at)
+            self._tokens_by_user.setdefault(snapshot.id, set()).add(token)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached token belonging to a user (role/profile change)"""
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, token: str) -> None:
+        # Caller must hold the lock
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        user_tokens = self._tokens_by_user.get(entry[0].id)
+        if user_tokens is not None:
+            user_tokens.discard(token)
+            if not user_tokens:
+                del self._tokens_by_user[entry[0].id]
+
+
+user_cache = UserCache()
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_on_user_update(mapper, connection, target):
+    """Any ORM update to a user (role, name, email, ...) evicts its tokens"""
+    user_cache.invalidate_user(target.id)
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_on_user_delete(mapper, connection, target):
+    user_cache.invalidate_user(target.id)
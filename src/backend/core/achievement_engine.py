@@ -0,0 +1,285 @@
+"""
+Achievement Rules Engine
+Unlocks achievements incrementally: every saved workout updates a handful of
+running per-user counters, and only rules whose threshold was crossed by
+that update are checked. Cost per workout doesn't grow with the catalog.
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, NamedTuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.backend.database.models import Achievement, DietEntry, UserAchievement, UserCounter, Workout
+
+INITIALIZED_COUNTER = "initialized"
+EARLY_BIRD_HOUR = 8  # workouts starting before this hour (client local time, UTC if unknown)
+POWER_HOUR_SECONDS = 3600
+
+
+class ThresholdRule(NamedTuple):
+    """Unlock `achievement_id` once `counter` reaches `threshold`"""
+
+    achievement_id: str
+    counter: str
+    threshold: float
+
+
+# Rules for the achievements seeded by scripts/chor/seed_achievements.py.
+# Achievements that need data we don't record yet (form accuracy, record
+# times, macro balance...) have no rule and stay locked.
+DEFAULT_RULES = [
+    # Rehab
+    ThresholdRule("rehab-first-workout", "workouts:rehab", 1),
+    ThresholdRule("rehab-10-reps", "reps:rehab", 10),
+    ThresholdRule("rehab-3-months", "span_days:rehab", 90),
+    # Basic
+    ThresholdRule("basic-first-workout", "workouts:basic", 1),
+    ThresholdRule("basic-50-reps", "reps:basic", 50),
+    ThresholdRule("basic-100-reps", "reps:basic", 100),
+    ThresholdRule("basic-7-day-streak", "streak", 7),
+    ThresholdRule("basic-14-day-streak", "streak", 14),
+    ThresholdRule("basic-30-day-streak", "streak", 30),
+    ThresholdRule("basic-early-bird", "early_workouts", 1),
+    ThresholdRule("basic-week-warrior", "week_workouts", 5),
+    # Advanced
+    ThresholdRule("advanced-first-workout", "workouts:advanced", 1),
+    ThresholdRule("advanced-200-reps", "reps:advanced", 200),
+    ThresholdRule("advanced-500-reps", "reps:advanced", 500),
+    # Lifting
+    ThresholdRule("lifting-first-workout", "workouts:lifting", 1),
+    ThresholdRule("lifting-1000-reps", "reps:lifting", 1000),
+    ThresholdRule("lifting-consistency-king", "days_active", 60),
+    ThresholdRule("lifting-power-hour", "max_reps_in_hour", 100),
+    ThresholdRule("lifting-iron-will", "workouts:lifting", 100),
+    # Weight milestones
+    ThresholdRule("weight-5lbs", "max_weight", 5),
+    ThresholdRule("weight-10lbs", "max_weight", 10),
+    ThresholdRule("weight-15lbs", "max_weight", 15),
+    ThresholdRule("weight-20lbs", "max_weight", 20),
+    ThresholdRule("weight-25lbs", "max_weight", 25),
+    ThresholdRule("weight-30lbs", "max_weight", 30),
+    ThresholdRule("weight-progression-master", "weight_progression", 20),
+    # Diet
+    ThresholdRule("diet-first-entry", "diet_entries", 1),
+    ThresholdRule("diet-meal-logger", "diet_entries", 10),
+]
+
+
+def _iso_week_key(day: datetime) -> int:
+    year, week, _ = day.isocalendar()
+    return year * 100 + week
+
+
+def apply_workout(counters: Dict[str, float], workout, exercise_type: str) -> None:
+    """Fold one workout into the running counters (in place)"""
+    reps = workout.reps_completed or 0
+    when = workout.date or datetime.utcnow()
+    day = when.toordinal()
+
+    counters["workouts"] = counters.get("workouts", 0) + 1
+    counters["reps"] = counters.get("reps", 0) + reps
+    counters[f"workouts:{exercise_type}"] = counters.get(f"workouts:{exercise_type}", 0) + 1
+    counters[f"reps:{exercise_type}"] = counters.get(f"reps:{exercise_type}", 0) + reps
+
+    # Streak / active days (a second workout on the same day changes nothing)
+    last_day = counters.get("last_day")
+    if last_day != day:
+        counters["days_active"] = counters.get("days_active", 0) + 1
+        if last_day == day - 1:
+            counters["streak"] = counters.get("streak", 0) + 1
+        else:
+            counters["streak"] = 1
+        counters["last_day"] = day
+
+    first_type_day = counters.setdefault(f"first_day:{exercise_type}", day)
+    counters[f"span_days:{exercise_type}"] = max(
+        counters.get(f"span_days:{exercise_type}", 0), day - first_type_day
+    )
+
+    week_key = _iso_week_key(when)
+    if counters.get("week_key") != week_key:
+        counters["week_key"] = week_key
+        counters["week_workouts"] = 0
+    counters["week_workouts"] = counters.get("week_workouts", 0) + 1
+
+    # Workout.date is UTC; the client's offset gives the hour the user saw
+    local = when + timedelta(minutes=workout.utc_offset_minutes or 0)
+    if local.hour < EARLY_BIRD_HOUR:
+        counters["early_workouts"] = counters.get("early_workouts", 0) + 1
+
+    if (workout.duration_seconds or 0) <= POWER_HOUR_SECONDS:
+        counters["max_reps_in_hour"] = max(counters.get("max_reps_in_hour", 0), reps)
+
+    weight = workout.weight_lbs or 0.0
+    if weight <= 0:
+        counters["did_bodyweight"] = 1
+    counters["max_weight"] = max(counters.get("max_weight", 0), weight)
+    if counters.get("did_bodyweight"):
+        counters["weight_progression"] = counters["max_weight"]
+
+
+class AchievementEngine:
+    """Evaluates ThresholdRules against per-user counters stored in user_counters"""
+
+    def __init__(self, rules: Iterable[ThresholdRule] = DEFAULT_RULES):
+        # counter name -> (sorted thresholds, achievement ids in the same order)
+        grouped = defaultdict(list)
+        for rule in rules:
+            grouped[rule.counter].append((rule.threshold, rule.achievement_id))
+        self._index = {}
+        for counter, entries in grouped.items():
+            entries.sort()
+            self._index[counter] = (
+                [threshold for threshold, _ in entries],
+                [achievement_id for _, achievement_id in entries],
+            )
+
+    def crossed(self, counter: str, old: float, new: float) -> List[str]:
+        """Achievement ids whose threshold lies in (old, new]"""
+        if new <= old or counter not in self._index:
+            return []
+        thresholds, ids = self._index[counter]
+        return ids[bisect_right(thresholds, old):bisect_right(thresholds, new)]
+
+    def record_workout(self, db: Session, user_id: int, workout: Workout,
+                       exercise_type_for: Callable[[str], str]) -> List[str]:
+        """
+        Update counters for a newly saved workout and unlock any achievements
+        it earns. Returns the newly unlocked ids; the caller commits. The
+        workout itself must already be committed (see _bootstrap).
+        """
+        counters, rows = self._load_counters(db, user_id)
+        if not counters.get(INITIALIZED_COUNTER):
+            # First run for this user: replay history once to seed counters
+            return self._bootstrap(db, user_id, counters, rows, exercise_type_for)
+
+        before = dict(counters)
+        apply_workout(counters, workout, exercise_type_for(workout.exercise_id))
+        return self._store_changes(db, user_id, before, counters, rows)
+
+    def record_workouts(self, db: Session, user_id: int, workouts: List[Workout],
+                        exercise_type_for: Callable[[str], str]) -> List[str]:
+        """
+        Batch form of record_workout (offline sync): counters are loaded and
+        stored once for the whole batch. Workouts dated before the newest one
+        already counted would corrupt the streak counters, so that case
+        replays the user's history instead.
+        """
+        counters, rows = self._load_counters(db, user_id)
+        workouts = sorted(workouts, key=lambda w: (w.date or datetime.utcnow(), w.id or 0))
+        if not workouts:
+            return []
+        oldest_day = (workouts[0].date or datetime.utcnow()).toordinal()
+        if (not counters.get(INITIALIZED_COUNTER)
+                or oldest_day < counters.get("last_day", oldest_day)):
+            return self._bootstrap(db, user_id, counters, rows, exercise_type_for)
+
+        before = dict(counters)
+        for workout in workouts:
+            apply_workout(counters, workout, exercise_type_for(workout.exercise_id))
+        return self._store_changes(db, user_id, before, counters, rows)
+
+    def record_diet_entry(self, db: Session, user_id: int,
+                          exercise_type_for: Callable[[str], str]) -> List[str]:
+        """Count a newly saved diet entry (see record_workout)"""
+        counters, rows = self._load_counters(db, user_id)
+        if not counters.get(INITIALIZED_COUNTER):
+            return self._bootstrap(db, user_id, counters, rows, exercise_type_for)
+
+        before = dict(counters)
+        counters["diet_entries"] = counters.get("diet_entries", 0) + 1
+        return self._store_changes(db, user_id, before, counters, rows)
+
+    def invalidate(self, db: Session, user_id: int) -> None:
+        """Mark a user's counters stale; the next record_* call rebuilds them from history"""
+        db.query(UserCounter).filter(
+            UserCounter.user_id == user_id, UserCounter.name == INITIALIZED_COUNTER
+        ).update({UserCounter.value: 0}, synchronize_session=False)
+
+    def _load_counters(self, db: Session, user_id: int):
+        rows = {
+            row.name: row
+            for row in db.query(UserCounter).filter(UserCounter.user_id == user_id).all()
+        }
+        return {name: row.value for name, row in rows.items()}, rows
+
+    def _bootstrap(self, db, user_id, counters, rows, exercise_type_for, retry=True) -> List[str]:
+        """
+        Rebuild the user's counters from their whole history. Two requests
+        can bootstrap the same user at once; the second one's counter rows
+        then collide with the first's, so it rolls back (only its own counter
+        changes are pending) and rebuilds over the stored rows. That picks up
+        its write whether or not the other request's history already had it.
+        """
+        before = dict(counters)
+        counters.clear()
+        workouts = (
+            db.query(Workout)
+            .filter(Workout.user_id == user_id)
+            .order_by(Workout.date.asc(), Workout.id.asc())
+            .all()
+        )
+        for workout in workouts:
+            apply_workout(counters, workout, exercise_type_for(workout.exercise_id))
+        counters["diet_entries"] = (
+            db.query(DietEntry).filter(DietEntry.user_id == user_id).count()
+        )
+        counters[INITIALIZED_COUNTER] = 1
+        unlocked = self._store_changes(db, user_id, before, counters, rows)
+        try:
+            db.flush()
+        except IntegrityError:
+            if not retry:
+                raise
+            db.rollback()
+            counters, rows = self._load_counters(db, user_id)
+            return self._bootstrap(db, user_id, counters, rows, exercise_type_for, retry=False)
+        return unlocked
+
+    def _store_changes(self, db, user_id, before, after, rows) -> List[str]:
+        candidates = []
+        for name, value in after.items():
+            old = before.get(name, 0)
+            if value == old and name in rows:
+                continue
+            row = rows.get(name)
+            if row is None:
+                db.add(UserCounter(user_id=user_id, name=name, value=value))
+            else:
+                row.value = value
+            candidates.extend(self.crossed(name, old, value))
+
+        if not candidates:
+            return []
+        return self._unlock(db, user_id, candidates)
+
+    def _unlock(self, db: Session, user_id: int, candidates: List[str]) -> List[str]:
+        # Only the crossed rules are looked up, never the whole catalog
+        known = {
+            achievement_id
+            for (achievement_id,) in db.query(Achievement.id)
+            .filter(Achievement.id.in_(candidates))
+            .all()
+        }
+        already = {
+            achievement_id
+            for (achievement_id,) in db.query(UserAchievement.achievement_id)
+            .filter(
+                UserAchievement.user_id == user_id,
+                UserAchievement.achievement_id.in_(candidates),
+            )
+            .all()
+        }
+        unlocked = []
+        for achievement_id in dict.fromkeys(candidates):
+            if achievement_id in known and achievement_id not in already:
+                db.add(UserAchievement(user_id=user_id, achievement_id=achievement_id))
+                unlocked.append(achievement_id)
+        return unlocked
+
+
+achievement_engine = AchievementEngine()
@@ -41,6 +41,15 @@ class PostureRules:
         angle = math.degrees(math.acos(cos_angle))
         
         return angle
+
+    def calculate_angles(self, points1, points2, points3):
+        """calculate_angle for (N, 2) arrays of points; NaN where a point is missing"""
+        v1 = points1 - points2
+        v2 = points3 - points2
+        v1 = v1 / (np.linalg.norm(v1, axis=1, keepdims=True) + 1e-8)
+        v2 = v2 / (np.linalg.norm(v2, axis=1, keepdims=True) + 1e-8)
+        cos_angle = np.clip(np.einsum('ij,ij->i', v1, v2), -1.0, 1.0)
+        return np.degrees(np.arccos(cos_angle))
         
     def check_heels_position(self, heels_left, heels_right, hips_left, hips_right, frame_width):
         """
@@ -219,6 +228,105 @@ class PostureRules:
         
         return results
         
+    def evaluate_posture_batch(self, landmarks, side, baseline_data, frame_width, frame_height):
+        """
+        evaluate_posture for N frames at once.
+
+        landmarks is an (N, 33, 2) array in the same units as the per-frame
+        dict, NaN where a landmark is missing. Returns the same keys as
+        evaluate_posture, but each rule maps to a (passed, status) pair of
+        (N,) arrays (bool, str) and 'overall_label' to an (N,) str array.
+        """
+        landmarks = np.asarray(landmarks, dtype=float)[:, :, :2]
+        missing = np.isnan(landmarks).any(axis=2)  # (N, 33)
+        results = {}
+
+        def rule(ok, missing_rows, missing_status, good_status, bad_status):
+            passed = ok & ~missing_rows
+            status = np.where(missing_rows, missing_status, np.where(ok, good_status, bad_status))
+            return passed, status
+
+        knee_idx, ankle_idx, foot_idx, shoulder_idx = (25, 27, 31, 11) if side == 'left' else (26, 28, 32, 12)
+        hip_idx = 23 if side == 'left' else 24
+        knee, ankle, foot = landmarks[:, knee_idx], landmarks[:, ankle_idx], landmarks[:, foot_idx]
+
+        # Heels at the edge of the hips
+        left_distance = np.linalg.norm(landmarks[:, 29] - landmarks[:, 23], axis=1) / frame_width
+        right_distance = np.linalg.norm(landmarks[:, 30] - landmarks[:, 24], axis=1) / frame_width
+        results['heels_position'] = rule(
+            (left_distance <= self.HEELS_HIP_DISTANCE_THRESHOLD) & (right_distance <= self.HEELS_HIP_DISTANCE_THRESHOLD),
+            missing[:, [29, 30, 23, 24]].any(axis=1), "missing_landmarks", "good", "too_far_from_hips",
+        )
+
+        foot_missing = missing[:, [knee_idx, ankle_idx, foot_idx]].any(axis=1)
+        foot_angle = self.calculate_angles(knee, ankle, foot)
+        results['achilles_touch'] = rule(
+            (self.ACHILLES_TOUCH_ANGLE_MIN <= foot_angle) & (foot_angle <= self.ACHILLES_TOUCH_ANGLE_MAX),
+            foot_missing, "missing_landmarks", "touching", "not_touching",
+        )
+
+        # Same landmarks as evaluate_posture: the left hip is the vertex for both sides
+        back_angle = self.calculate_angles(landmarks[:, shoulder_idx], landmarks[:, 23], knee)
+        results['back_arch'] = rule(
+            (self.BACK_ARCH_ANGLE_MIN <= back_angle) & (back_angle <= self.BACK_ARCH_ANGLE_MAX),
+            missing[:, [shoulder_idx, 23, knee_idx]].any(axis=1), "missing_landmarks", "good_arch", "no_arch",
+        )
+
+        baseline_hip = baseline_data.get('hip_position')
+        if baseline_hip:
+            hip = landmarks[:, hip_idx]
+            hip_missing = missing[:, hip_idx]
+            results['hip_stability'] = rule(
+                np.abs(hip[:, 0] - baseline_hip[0]) / frame_width <= self.HIP_STABILITY_THRESHOLD,
+                hip_missing, "missing_baseline", "stable", "unstable",
+            )
+            if side == 'left':
+                moved, bad_status = hip[:, 1] - baseline_hip[1], "turning_down"
+            else:
+                moved, bad_status = hip[:, 0] - baseline_hip[0], "rolling_back"
+            results['hip_rotation'] = rule(
+                ~(moved > self.HIP_ROTATION_THRESHOLD * frame_width),
+                hip_missing, "missing_baseline", "stable", bad_status,
+            )
+
+        results['dorsiflexion'] = rule(
+            (80 <= foot_angle) & (foot_angle <= 120),
+            foot_missing, "missing_landmarks", "dorsiflexed", "not_dorsiflexed",
+        )
+
+        baseline_knee_y = baseline_data.get('knee_y')
+        target_knee_y = baseline_data.get('target_knee_y')
+        if baseline_knee_y and target_knee_y:
+            knee_y = knee[:, 1]
+            lift_distance = baseline_knee_y - knee_y
+            target_distance = baseline_knee_y - target_knee_y
+            too_low = lift_distance < target_distance * 0.5
+            too_high = lift_distance > target_distance * 1.5
+            # The per-frame check treats a knee_y of exactly 0 as missing too
+            range_missing = missing[:, knee_idx] | (knee_y == 0)
+            passed = ~too_low & ~too_high & ~range_missing
+            status = np.select(
+                [range_missing, too_low, too_high],
+                ["missing_baseline", "too_low", "too_high"],
+                default="correct_range",
+            )
+            results['range_status'] = (passed, status)
+
+        results['overall_label'] = self._determine_overall_labels(results)
+        return results
+
+    def _determine_overall_labels(self, results):
+        """_determine_overall_label over (N,) result arrays"""
+        names = [name for name in results if name != 'overall_label']
+        failed = np.stack([~results[name][0] for name in names], axis=1)
+        failed_count = failed.sum(axis=1)
+        first_failed = np.array([f"{name}_issue" for name in names])[failed.argmax(axis=1)]
+        return np.where(
+            failed_count == 0,
+            "correct_posture",
+            np.where(failed_count == 1, first_failed, "multiple_issues"),
+        )
+        
     def _determine_overall_label(self, results):
         """Determine overall posture label based on individual checks"""
         failed_checks = []
@@ -0,0 +1,296 @@
+"""
+Declarative Form Rules
+Form checks written as data instead of per-trainer `if` chains, compiled
+into one vectorized evaluation over all rules of an exercise.
+
+A rule measures one metric on the pose and says which range is allowed:
+
+    FormRule("knees_over_toes", "Keep knees over toes",
+             metric="distance", points=("LEFT_KNEE", "LEFT_ANKLE"), axis="x",
+             scale="width", max=0.25)
+
+Metrics (pixel geometry, like the trainers' get_xy):
+- angle(a, b, c): angle at b in degrees
+- vertical_angle(a, b): angle at b between b->a and straight down
+- distance(a, b): euclidean, or |difference| along `axis`
+- offset(a, b): signed a - b along `axis`
+- position(a): coordinate along `axis`
+- ratio(a, b, c, d): distance(a, b) / distance(c, d)
+- input(key): a value the trainer computes itself, passed to update()
+
+Points are landmark names ("LEFT_HIP"), side-relative names resolved when
+compiling ("HIP" -> LEFT_HIP/RIGHT_HIP) or midpoints ("MID_HIP").
+
+Per rule, optionally: `scale` divides by frame width/height,
+`relative_to_baseline` compares |value - baseline| instead of the value,
+`smoothing` is an EMA factor, `persist_frames` is how many (leaky-counted)
+violating frames it takes before the message fires, and `cooldown` seconds
+between messages, shared by all rules of the same `cooldown_group`.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from src.backend.core.session_recorder import LANDMARK_FIELDS, NUM_LANDMARKS, landmarks_to_array
+
+LANDMARK_NAMES = [
+    "NOSE", "LEFT_EYE_INNER", "LEFT_EYE", "LEFT_EYE_OUTER", "RIGHT_EYE_INNER", "RIGHT_EYE",
+    "RIGHT_EYE_OUTER", "LEFT_EAR", "RIGHT_EAR", "MOUTH_LEFT", "MOUTH_RIGHT", "LEFT_SHOULDER",
+    "RIGHT_SHOULDER", "LEFT_ELBOW", "RIGHT_ELBOW", "LEFT_WRIST", "RIGHT_WRIST", "LEFT_PINKY",
+    "RIGHT_PINKY", "LEFT_INDEX", "RIGHT_INDEX", "LEFT_THUMB", "RIGHT_THUMB", "LEFT_HIP",
+    "RIGHT_HIP", "LEFT_KNEE", "RIGHT_KNEE", "LEFT_ANKLE", "RIGHT_ANKLE", "LEFT_HEEL",
+    "RIGHT_HEEL", "LEFT_FOOT_INDEX", "RIGHT_FOOT_INDEX",
+]
+LANDMARK_INDEX = {name: i for i, name in enumerate(LANDMARK_NAMES)}
+ORIGIN = NUM_LANDMARKS  # extra all-zero row, used by "position"
+
+METRICS = ("angle", "vertical_angle", "distance", "offset", "position", "ratio", "input")
+_POINT_COUNT = {"angle": 3, "vertical_angle": 2, "distance": 2, "offset": 2, "position": 1, "ratio": 4, "input": 1}
+_AXES = {None: (1.0, 1.0), "x": (1.0, 0.0), "y": (0.0, 1.0)}
+
+
+@dataclass(frozen=True)
+class FormRule:
+    name: str
+    message: str
+    metric: str
+    points: Tuple[str, ...]
+    min: Optional[float] = None
+    max: Optional[float] = None
+    axis: Optional[str] = None
+    scale: Optional[str] = None  # "width" | "height"
+    relative_to_baseline: bool = False
+    smoothing: Optional[float] = None  # EMA factor for the new value, 0..1
+    persist_frames: int = 0
+    cooldown: float = 0.0
+    cooldown_group: Optional[str] = None  # defaults to the rule's own name
+
+    @classmethod
+    def from_dict(cls, spec: Mapping) -> "FormRule":
+        spec = dict(spec)
+        spec["points"] = tuple(spec["points"])
+        return cls(**spec)
+
+
+def resolve_point(name: str, side: str) -> Tuple[int, int]:
+    """Landmark name -> pair of indices whose midpoint is the point"""
+    if name in LANDMARK_INDEX:
+        i = LANDMARK_INDEX[name]
+        return i, i
+    if name.startswith("MID_"):
+        base = name[4:]
+        return LANDMARK_INDEX[f"LEFT_{base}"], LANDMARK_INDEX[f"RIGHT_{base}"]
+    prefix = "LEFT_" if side == "left" else "RIGHT_"
+    if prefix + name in LANDMARK_INDEX:
+        i = LANDMARK_INDEX[prefix + name]
+        return i, i
+    raise ValueError(f"Unknown landmark {name!r}")
+
+
+class CompiledRules:
+    """
+    A rule set turned into index/threshold arrays. evaluate() computes every
+    rule's metric for N frames at once; FormChecker adds the per-session
+    smoothing, persistence and cooldown state for live use.
+    """
+
+    def __init__(self, rules: Iterable[FormRule], side: str = "left"):
+        self.rules = list(rules)
+        self.side = side
+        n = len(self.rules)
+        self.names = [r.name for r in self.rules]
+        self.messages = [r.message for r in self.rules]
+        self.pairs = np.zeros((n, 4, 2), dtype=np.intp)
+        self.kinds = np.zeros(n, dtype=np.intp)
+        self.axis = np.ones((n, 2))
+        self.scale_axis = np.full(n, -1, dtype=np.intp)  # -1 none, 0 width, 1 height
+        self.lo = np.full(n, -np.inf)
+        self.hi = np.full(n, np.inf)
+        self.relative = np.zeros(n, dtype=bool)
+        self.alpha = np.ones(n)
+        self.persist = np.zeros(n, dtype=np.int64)
+        self.input_keys: Dict[int, str] = {}
+
+        groups: Dict[str, int] = {}
+        self.group = np.zeros(n, dtype=np.intp)
+        group_cooldowns: List[float] = []
+        for i, rule in enumerate(self.rules):
+            if rule.metric not in METRICS:
+                raise ValueError(f"Rule {rule.name!r}: unknown metric {rule.metric!r}")
+            if len(rule.points) != _POINT_COUNT[rule.metric]:
+                raise ValueError(f"Rule {rule.name!r}: {rule.metric} takes {_POINT_COUNT[rule.metric]} point(s)")
+            if rule.axis not in _AXES or (rule.metric in ("offset", "position") and rule.axis is None):
+                raise ValueError(f"Rule {rule.name!r}: invalid axis {rule.axis!r}")
+            self.kinds[i] = METRICS.index(rule.metric)
+            if rule.metric == "input":
+                self.input_keys[i] = rule.points[0]
+            else:
+                points = [resolve_point(p, side) for p in rule.points]
+                if rule.metric == "position":
+                    points.append((ORIGIN, ORIGIN))
+                self.pairs[i, :len(points)] = points
+            self.axis[i] = _AXES[rule.axis]
+            self.scale_axis[i] = {None: -1, "width": 0, "height": 1}[rule.scale]
+            if rule.min is not None:
+                self.lo[i] = rule.min
+            if rule.max is not None:
+                self.hi[i] = rule.max
+            self.relative[i] = rule.relative_to_baseline
+            self.alpha[i] = 1.0 if rule.smoothing is None else rule.smoothing
+            self.persist[i] = rule.persist_frames
+            group = rule.cooldown_group or rule.name
+            if group not in groups:
+                groups[group] = len(groups)
+                group_cooldowns.append(rule.cooldown)
+            self.group[i] = groups[group]
+        self.group_cooldown = np.array(group_cooldowns)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def evaluate(self, landmarks, width: float, height: float,
+                 inputs: Optional[Mapping[str, Optional[float]]] = None) -> np.ndarray:
+        """
+        (N, 33, 2+) normalized landmarks -> (N, rules) metric values, scaled
+        but not yet smoothed or compared with baselines. NaN where a point or
+        input is missing.
+        """
+        landmarks = np.asarray(landmarks, dtype=float)
+        n = len(landmarks)
+        frame = np.zeros((n, NUM_LANDMARKS + 1, 2))
+        frame[:, :NUM_LANDMARKS] = landmarks[:, :, :2] * (width, height)
+
+        # (N, rules, 4, 2): every rule's points in one gather
+        points = (frame[:, self.pairs[..., 0]] + frame[:, self.pairs[..., 1]]) * 0.5
+        p0, p1, p2, p3 = points[:, :, 0], points[:, :, 1], points[:, :, 2], points[:, :, 3]
+
+        d01 = (p0 - p1) * self.axis
+        distance = np.sqrt((d01 ** 2).sum(axis=-1))
+        offset = d01.sum(axis=-1)
+        down = np.zeros_like(p0)
+        down[..., 1] = 1.0
+        angle = self._angle(p0 - p1, np.where((self.kinds == 1)[None, :, None], down, p2 - p1))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = distance / np.sqrt(((p2 - p3) ** 2).sum(axis=-1))
+
+        values = np.choose(self.kinds, [angle, angle, distance, offset, offset, ratio, np.full_like(angle, np.nan)])
+        for i, key in self.input_keys.items():
+            value = (inputs or {}).get(key)
+            values[:, i] = np.nan if value is None else value
+
+        sizes = np.array([width, height, 1.0])  # scale_axis -1 picks the 1.0
+        return values / sizes[self.scale_axis]
+
+    @staticmethod
+    def _angle(v1, v2):
+        v1 = v1 / (np.linalg.norm(v1, axis=-1, keepdims=True) + 1e-8)
+        v2 = v2 / (np.linalg.norm(v2, axis=-1, keepdims=True) + 1e-8)
+        return np.degrees(np.arccos(np.clip((v1 * v2).sum(axis=-1), -1.0, 1.0)))
+
+    def violations(self, values, baseline=None) -> np.ndarray:
+        """
+        (N, rules) values -> (N, rules) bool, before persistence/cooldown.
+        Rules relative to a baseline never fire while their baseline is NaN.
+        """
+        values = np.asarray(values, dtype=float)
+        if baseline is None:
+            baseline = np.full(len(self), np.nan)
+        values = np.where(self.relative, np.abs(values - baseline), values)
+        with np.errstate(invalid="ignore"):
+            return (values < self.lo) | (values > self.hi)
+
+
+class FormChecker:
+    """
+    Live, per-session state on top of CompiledRules: one update() per frame
+    evaluates every rule in a single vectorized pass and returns the
+    messages that fire this frame, in rule order.
+    """
+
+    def __init__(self, rules: Iterable[FormRule], side: str = "left"):
+        self.compiled = CompiledRules(rules, side)
+        n = len(self.compiled)
+        self.baseline = np.full(n, np.nan)
+        self.values = np.full(n, np.nan)  # smoothed metric values
+        self.counters = np.zeros(n, dtype=np.int64)
+        self.last_emit = np.full(len(self.compiled.group_cooldown), -np.inf)
+        self._frame = np.zeros((1, NUM_LANDMARKS, LANDMARK_FIELDS))
+        self._baseline_sum = np.zeros(n)
+        self._baseline_frames = np.zeros(n)
+
+    def reset(self) -> None:
+        """Forget smoothing and violation counters (baselines are kept)"""
+        self.values[:] = np.nan
+        self.counters[:] = 0
+        self.last_emit[:] = -np.inf
+
+    def set_baseline(self, baselines: Mapping[str, Optional[float]]) -> None:
+        """Baseline values by rule name; None or 0 disables the rule (as the trainers did)"""
+        for name, value in baselines.items():
+            self.baseline[self.compiled.names.index(name)] = value if value else np.nan
+
+    def with_side(self, side: str) -> "FormChecker":
+        """Same rules recompiled for the other side; baselines carry over, state doesn't"""
+        checker = FormChecker(self.compiled.rules, side)
+        checker.baseline[:] = self.baseline
+        return checker
+
+    def add_baseline_frame(self, results, width: float, height: float) -> None:
+        """Accumulate one calibration frame for the baseline-relative rules"""
+        raw = self.compiled.evaluate(self._landmarks(results), width, height)[0]
+        valid = ~np.isnan(raw)
+        self._baseline_sum[valid] += raw[valid]
+        self._baseline_frames[valid] += 1
+
+    def finish_baseline(self) -> None:
+        """Baselines = mean of the calibration frames"""
+        with np.errstate(invalid="ignore"):
+            mean = self._baseline_sum / self._baseline_frames
+        self.baseline = np.where(self.compiled.relative & (self._baseline_frames > 0), mean, self.baseline)
+        self._baseline_sum[:] = 0
+        self._baseline_frames[:] = 0
+
+    def _landmarks(self, results) -> np.ndarray:
+        if isinstance(results, np.ndarray):
+            return results[None]
+        landmarks_to_array(results.pose_landmarks, out=self._frame[0])
+        return self._frame
+
+    def value(self, name: str) -> Optional[float]:
+        value = self.values[self.compiled.names.index(name)]
+        return None if np.isnan(value) else float(value)
+
+    def update(self, results, width: float, height: float, now: Optional[float] = None,
+               inputs: Optional[Mapping[str, Optional[float]]] = None) -> List[str]:
+        """
+        Evaluate one frame. `results` is a MediaPipe Pose result (or a
+        (33, 2+) landmark array); `now` defaults to time.time().
+        """
+        raw = self.compiled.evaluate(self._landmarks(results), width, height, inputs)[0]
+
+        # EMA smoothing; restarts from the raw value after a missing one.
+        # Missing values and rules without a baseline never count as violated.
+        alpha = self.compiled.alpha
+        self.values = np.where(np.isnan(self.values), raw, self.values * (1 - alpha) + raw * alpha)
+        violated = self.compiled.violations(self.values[None], self.baseline)[0]
+
+        # Leaky persistence counter: +1 while violated, -1 otherwise
+        self.counters = np.where(violated, self.counters + 1, np.maximum(self.counters - 1, 0))
+        firing = violated & (self.counters > self.compiled.persist)
+
+        now = time.time() if now is None else now
+        cooldown = self.compiled.group_cooldown
+        ready = (cooldown <= 0) | (now - self.last_emit > cooldown)
+        firing &= ready[self.compiled.group]
+        if not firing.any():
+            return []
+        self.last_emit[np.unique(self.compiled.group[firing])] = now
+
+        messages = []
+        for i in np.flatnonzero(firing):
+            if self.compiled.messages[i] not in messages:
+                messages.append(self.compiled.messages[i])
+        return messages
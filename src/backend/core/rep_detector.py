@@ -0,0 +1,210 @@
+"""
+Streaming Rep Detector
+Counts reps from the primary angle (or any 1-D movement signal) with
+online peak/valley detection instead of two fixed thresholds.
+
+A turning point is confirmed once the signal has moved `prominence` away
+from it, so jitter smaller than that never flips the phase, and a rep
+counts whatever its depth - shallow reps included - as long as it is
+deeper than the prominence. A rep is:
+
+    start extreme -> turning extreme -> back `completion` of the way
+
+e.g. for a squat on the knee angle (start="peak"): standing, bottom,
+standing again. start="valley" is the mirror image (glute fly knee lift:
+down, up, down).
+
+Samples go into a fixed-size ring buffer (moving-average smoothing and a
+recent-history window for charts); every update is O(1) and allocates
+nothing. Each completed rep reports its range of motion and tempo.
+"""
+
+import math
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_BUFFER_SIZE = 90  # ~3 s at 30 fps
+
+
+class Rep(NamedTuple):
+    number: int
+    start_time: float
+    turn_time: float
+    end_time: float
+    start_value: float
+    turn_value: float
+    range_of_motion: float
+
+    @property
+    def duration(self) -> float:
+        return self.end_time - self.start_time
+
+    @property
+    def eccentric_seconds(self) -> float:
+        """Start to turning point (the lowering phase of a squat)"""
+        return self.turn_time - self.start_time
+
+    @property
+    def concentric_seconds(self) -> float:
+        """Turning point back to the end of the rep"""
+        return self.end_time - self.turn_time
+
+
+class RingBuffer:
+    """Last `size` (time, value) samples in preallocated arrays"""
+
+    def __init__(self, size: int = DEFAULT_BUFFER_SIZE):
+        if size < 1:
+            raise ValueError("Ring buffer size must be at least 1")
+        self.size = size
+        self.times = np.zeros(size)
+        self.values = np.zeros(size)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return min(self.count, self.size)
+
+    def push(self, t: float, value: float) -> None:
+        i = self.count % self.size
+        self.times[i] = t
+        self.values[i] = value
+        self.count += 1
+
+    def ago(self, n: int) -> float:
+        """Value pushed n samples before the latest one (0 = latest)"""
+        return self.values[(self.count - 1 - n) % self.size]
+
+    def clear(self) -> None:
+        self.count = 0
+
+    def window(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(times, values) copies of the buffered samples, oldest first"""
+        n = len(self)
+        start = self.count - n
+        order = np.arange(start, self.count) % self.size
+        return self.times[order], self.values[order]
+
+
+class RepDetector:
+    def __init__(self, prominence: float, start: str = "peak", completion: float = 0.8,
+                 smoothing: int = 3, min_rep_seconds: float = 0.4,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        prominence: how far (in signal units) the signal must move back from
+            an extreme before it counts as a turning point
+        start: "peak" if a rep starts at the signal's high point, else "valley"
+        completion: fraction of the way back to the start extreme that
+            completes the rep
+        smoothing: samples in the moving average applied before detection
+        min_rep_seconds: faster "reps" are treated as noise
+        """
+        if start not in ("peak", "valley"):
+            raise ValueError(f"start must be 'peak' or 'valley', not {start!r}")
+        if prominence <= 0:
+            raise ValueError("prominence must be positive")
+        if not 1 <= smoothing <= buffer_size:
+            raise ValueError("smoothing must be between 1 and buffer_size samples")
+        self.prominence = float(prominence)
+        self.start = start
+        self.completion = completion
+        self.smoothing = smoothing
+        self.min_rep_seconds = min_rep_seconds
+        # Internally every rep starts at a peak; "valley" reps are mirrored
+        self._sign = 1.0 if start == "peak" else -1.0
+        self.buffer = RingBuffer(buffer_size)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the signal and the counts (new set)"""
+        self.buffer.clear()
+        self.reps = 0
+        self.partial_reps = 0  # turned around but never came back far enough
+        self.last_rep: Optional[Rep] = None
+        self.total_rep_seconds = 0.0
+        self.value: Optional[float] = None  # latest smoothed value
+        self._sum = 0.0
+        self._trend = 0  # 0 unknown, -1 falling, +1 rising (mirrored signal)
+        self._ext = self._ext_t = 0.0  # running extreme of the current trend
+        self._hi = self._hi_t = self._lo = self._lo_t = 0.0  # while trend is unknown
+        self._start: Optional[Tuple[float, float]] = None  # (t, s) rep start peak
+        self._turn: Optional[Tuple[float, float]] = None  # (t, s) confirmed valley
+
+    @property
+    def mean_rep_seconds(self) -> Optional[float]:
+        return self.total_rep_seconds / self.reps if self.reps else None
+
+    @property
+    def phase(self) -> str:
+        """"start" (at/near the start extreme), "out" (moving away) or "back" (returning)"""
+        if self._turn is not None:
+            return "back"
+        if self._start is not None and self._trend < 0:
+            return "out"
+        return "start"
+
+    def window(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Recent raw (times, values), oldest first"""
+        return self.buffer.window()
+
+    def update(self, value: Optional[float], t: float) -> Optional[Rep]:
+        """Feed one sample; returns the Rep it completed, if any. None/NaN samples are skipped."""
+        if value is None or not math.isfinite(value):
+            return None
+
+        buffer = self.buffer
+        self._sum += value
+        if buffer.count >= self.smoothing:
+            self._sum -= buffer.ago(self.smoothing - 1)
+        buffer.push(t, value)
+        n = min(buffer.count, self.smoothing)
+        self.value = self._sum / n
+        s = self._sign * self.value
+        prominence = self.prominence
+
+        if self._trend == 0:
+            if buffer.count == 1 or s > self._hi:
+                self._hi, self._hi_t = s, t
+            if buffer.count == 1 or s < self._lo:
+                self._lo, self._lo_t = s, t
+            if s <= self._hi - prominence:
+                # Everything since the high point stayed above s, so s is the low since then
+                self._start = (self._hi_t, self._hi)
+                self._trend, self._ext, self._ext_t = -1, s, t
+            elif s >= self._lo + prominence:
+                # Began at the turning extreme: wait for a start peak
+                self._trend, self._ext, self._ext_t = 1, s, t
+            return None
+
+        if self._trend < 0:
+            if s < self._ext:
+                self._ext, self._ext_t = s, t
+                return None
+            if s < self._ext + prominence:
+                return None
+            if self._start is not None:
+                self._turn = (self._ext_t, self._ext)
+            self._trend, self._ext, self._ext_t = 1, s, t
+
+        # Rising back towards the start extreme
+        if s >= self._ext:
+            self._ext, self._ext_t = s, t
+        if self._turn is not None:
+            (start_t, start_s), (turn_t, turn_s) = self._start, self._turn
+            if s >= turn_s + self.completion * (start_s - turn_s):
+                self._start = self._turn = None
+                if t - start_t < self.min_rep_seconds:
+                    return None
+                self.reps += 1
+                self.total_rep_seconds += t - start_t
+                self.last_rep = Rep(self.reps, start_t, turn_t, t, self._sign * start_s,
+                                    self._sign * turn_s, start_s - turn_s)
+                return self.last_rep
+        if s <= self._ext - prominence:
+            # Turned around again: the high point is the next rep's start
+            if self._turn is not None:
+                self.partial_reps += 1
+                self._turn = None
+            self._start = (self._ext_t, self._ext)
+            self._trend, self._ext, self._ext_t = -1, s, t
+        return None
@@ -0,0 +1,235 @@
+"""
+Offline Re-scoring
+Replays recorded sessions (see session_recorder.py) through the current
+trainer code and reports how rep counts changed - e.g. after retuning
+SquatTrainer.rep_prominence.
+
+Run:
+    python -m src.backend.core.rescoring data/recordings --set rep_prominence=25 --report diff.csv
+
+Sessions are scored in parallel in a process pool; each worker streams its
+recording chunk by chunk from a memory map instead of loading it whole.
+"""
+
+import argparse
+import csv
+import importlib
+import json
+import logging
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.backend.core.session_recorder import (
+    LANDMARK_FIELDS,
+    NUM_LANDMARKS,
+    RECORDING_SUFFIX,
+    iter_chunks,
+    read_metadata,
+)
+
+logger = logging.getLogger(__name__)
+
+REPORT_FIELDS = [
+    "recording",
+    "exercise",
+    "frames",
+    "recorded_reps",
+    "rescored_reps",
+    "rep_diff",
+    "error",
+]
+
+
+class _ReplayLandmark:
+    """Read-only stand-in for a MediaPipe NormalizedLandmark"""
+
+    __slots__ = ("_frame", "_idx")
+
+    def __init__(self, frame: np.ndarray, idx: int):
+        self._frame = frame
+        self._idx = idx
+
+    @property
+    def x(self) -> float:
+        return float(self._frame[self._idx, 0])
+
+    @property
+    def y(self) -> float:
+        return float(self._frame[self._idx, 1])
+
+    @property
+    def z(self) -> float:
+        return float(self._frame[self._idx, 2])
+
+    @property
+    def visibility(self) -> float:
+        return float(self._frame[self._idx, 3])
+
+
+class _ReplayPoseLandmarks:
+    __slots__ = ("landmark",)
+
+    def __init__(self, frame: np.ndarray):
+        self.landmark = [_ReplayLandmark(frame, i) for i in range(NUM_LANDMARKS)]
+
+
+class ReplayResults:
+    """
+    Mimics the `results` object of mediapipe's Pose.process() on recorded
+    landmarks. One instance is reused for every frame: load() copies the
+    next row into a fixed buffer that the landmark views read from.
+    """
+
+    def __init__(self):
+        self._frame = np.zeros((NUM_LANDMARKS, LANDMARK_FIELDS), dtype=np.float32)
+        self._pose = _ReplayPoseLandmarks(self._frame)
+        self.pose_landmarks = None
+
+    def load(self, landmarks: np.ndarray) -> "ReplayResults":
+        if np.isnan(landmarks[0, 0]):
+            self.pose_landmarks = None
+        else:
+            np.copyto(self._frame, landmarks)
+            self.pose_landmarks = self._pose
+        return self
+
+
+def create_trainer(exercise: str, trainer_spec: Optional[str] = None,
+                   overrides: Optional[Dict[str, Any]] = None):
+    """
+    Build a trainer: the one the live WebSocket would use for `exercise`,
+    or an explicit "package.module:ClassName". `overrides` are set as
+    attributes afterwards (the thresholds being retuned).
+    """
+    if trainer_spec:
+        module_name, _, class_name = trainer_spec.partition(":")
+        trainer = getattr(importlib.import_module(module_name), class_name)()
+    else:
+        from src.backend.api.websocket import WorkoutStreamManager
+
+        trainer = WorkoutStreamManager(exercise).get_trainer()
+
+    for name, value in (overrides or {}).items():
+        if not hasattr(trainer, name):
+            raise AttributeError(f"{type(trainer).__name__} has no attribute {name!r}")
+        setattr(trainer, name, value)
+    return trainer
+
+
+def _reps(output) -> int:
+    try:
+        return int(output.get("reps", 0) or 0)
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+def rescore_session(path: str, exercise: Optional[str] = None, trainer_spec: Optional[str] = None,
+                    overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Replay one recording and compare final rep counts (runs in a worker)"""
+    row = {"recording": str(path), "exercise": exercise, "frames": 0,
+           "recorded_reps": 0, "rescored_reps": 0, "rep_diff": 0, "error": ""}
+    try:
+        exercise = exercise or read_metadata(Path(path)).get("exercise")
+        row["exercise"] = exercise
+        trainer = create_trainer(exercise, trainer_spec, overrides)
+        results = ReplayResults()
+
+        recorded = rescored = frames = 0
+        for chunk in iter_chunks(Path(path)):
+            for i in range(len(chunk.timestamps)):
+                frames += 1
+                recorded = max(recorded, _reps(chunk.outputs[i]))
+                # Same contract as the live loop: no pose, no trainer call
+                if results.load(chunk.landmarks[i]).pose_landmarks is None:
+                    continue
+                w, h = (int(v) for v in chunk.frame_sizes[i])
+                # Recorded time, so feedback cooldowns don't depend on replay speed
+                output = trainer.process_frame(results, w, h, now=float(chunk.timestamps[i]))
+                rescored = max(rescored, _reps(output))
+
+        row.update(frames=frames, recorded_reps=recorded, rescored_reps=rescored,
+                   rep_diff=rescored - recorded)
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def find_recordings(paths: Iterable[str]) -> List[str]:
+    found = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            found.extend(str(f) for f in sorted(p.rglob(f"*{RECORDING_SUFFIX}")))
+        else:
+            found.append(str(p))
+    return found
+
+
+def rescore_recordings(paths: Iterable[str], exercise: Optional[str] = None,
+                       trainer_spec: Optional[str] = None,
+                       overrides: Optional[Dict[str, Any]] = None,
+                       workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Re-score every recording under `paths`; returns one report row per session"""
+    recordings = find_recordings(paths)
+    if not recordings:
+        return []
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        return [rescore_session(p, exercise, trainer_spec, overrides) for p in recordings]
+
+    n = len(recordings)
+    with ProcessPoolExecutor(max_workers=min(workers, n)) as pool:
+        return list(pool.map(
+            rescore_session, recordings, [exercise] * n, [trainer_spec] * n, [overrides] * n,
+            chunksize=max(1, math.ceil(n / (workers * 4))),
+        ))
+
+
+def write_report(rows: List[Dict[str, Any]], out) -> None:
+    writer = csv.DictWriter(out, fieldnames=REPORT_FIELDS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def parse_override(text: str):
+    name, sep, raw = text.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"Expected NAME=VALUE, got {text!r}")
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    return name, value
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-score recorded workout sessions")
+    parser.add_argument("paths", nargs="+", help="Recording files or directories")
+    parser.add_argument("--exercise", help="Override the exercise stored in each recording")
+    parser.add_argument("--trainer", help="Trainer class as package.module:ClassName")
+    parser.add_argument("--set", dest="overrides", action="append", type=parse_override, default=[],
+                        metavar="NAME=VALUE", help="Trainer attribute to override (repeatable)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--report", help="Write the CSV report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    rows = rescore_recordings(args.paths, args.exercise, args.trainer, dict(args.overrides), args.workers)
+    if args.report:
+        with open(args.report, "w", newline="") as f:
+            write_report(rows, f)
+    else:
+        write_report(rows, sys.stdout)
+
+    changed = sum(1 for r in rows if r["rep_diff"])
+    failed = sum(1 for r in rows if r["error"])
+    print(f"📊 {len(rows)} sessions re-scored, {changed} changed, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
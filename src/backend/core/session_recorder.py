@@ -0,0 +1,347 @@
+"""
+Session Recorder
+Captures what a live workout session saw: per-frame timestamps, the raw
+MediaPipe landmarks (33 x [x, y, z, visibility]) and the trainer output.
+
+File layout (append-only, little-endian):
+
+    b"AIREC\\x00" + uint16 format version
+    uint32 metadata length + UTF-8 JSON metadata
+    chunk*
+
+    chunk := b"CHNK" + uint32 n_frames + uint32 payload length + payload
+    payload := zlib(float64[n] timestamps
+                    + float32[n, 33, 4] landmarks (NaN when no pose)
+                    + uint16[n, 2] frame sizes (width, height)
+                    + UTF-8 JSON list of trainer outputs)
+
+Format version 1 had no frame sizes in the payload; readers fill in
+V1_FRAME_SIZE for those files.
+
+Chunks are self-delimiting, so a recording cut short by a crash is still
+readable up to its last complete chunk. Compression and disk writes happen
+on a background thread; the frame loop only copies into a preallocated
+buffer.
+"""
+
+import json
+import logging
+import mmap
+import os
+import queue
+import re
+import struct
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+RECORDINGS_DIR = Path(os.getenv("SESSION_RECORDINGS_DIR", "data/recordings"))
+# The workout socket is unauthenticated: ?record=true only works where the server opts in
+RECORDING_ENABLED = os.getenv("SESSION_RECORDING_ENABLED", "false").lower() == "true"
+RECORDING_MAX_FILES = int(os.getenv("SESSION_RECORDING_MAX_FILES", "500"))  # recordings kept in RECORDINGS_DIR
+RECORDING_MAX_FRAMES = int(os.getenv("SESSION_RECORDING_MAX_FRAMES", "54000"))  # per session, ~30 min at 30fps
+RECORDING_CHUNK_FRAMES = int(os.getenv("RECORDING_CHUNK_FRAMES", "300"))  # ~10s at 30fps
+RECORDING_COMPRESSION_LEVEL = int(os.getenv("RECORDING_COMPRESSION_LEVEL", "6"))
+RECORDING_MAX_PENDING_CHUNKS = 8  # chunks queued for the writer before we start dropping
+
+FILE_MAGIC = b"AIREC\x00"
+FORMAT_VERSION = 2  # 2: frame sizes in the chunk payload
+V1_FRAME_SIZE = (640, 480)  # assumed for version 1 recordings (webcam default)
+CHUNK_MAGIC = b"CHNK"
+RECORDING_SUFFIX = ".airec"
+
+NUM_LANDMARKS = 33
+LANDMARK_FIELDS = 4  # x, y, z, visibility
+
+_FILE_HEADER = struct.Struct("<6sHI")
+_CHUNK_HEADER = struct.Struct("<4sII")
+
+
+def landmarks_to_array(pose_landmarks, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Copy MediaPipe pose landmarks into a (33, 4) float32 array"""
+    if out is None:
+        out = np.empty((NUM_LANDMARKS, LANDMARK_FIELDS), dtype=np.float32)
+    if pose_landmarks is None:
+        out.fill(np.nan)
+        return out
+    for i, lm in enumerate(pose_landmarks.landmark[:NUM_LANDMARKS]):
+        out[i, 0] = lm.x
+        out[i, 1] = lm.y
+        out[i, 2] = lm.z
+        out[i, 3] = lm.visibility
+    return out
+
+
+def _json_default(value):
+    # Trainers return numpy scalars in their angle dicts
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def encode_chunk(timestamps: np.ndarray, landmarks: np.ndarray, frame_sizes: np.ndarray,
+                 outputs: List[Dict[str, Any]], level: int = RECORDING_COMPRESSION_LEVEL) -> bytes:
+    """Serialize one chunk (header + compressed payload)"""
+    n = len(timestamps)
+    raw = b"".join((
+        np.ascontiguousarray(timestamps, dtype="<f8").tobytes(),
+        np.ascontiguousarray(landmarks, dtype="<f4").tobytes(),
+        np.ascontiguousarray(frame_sizes, dtype="<u2").tobytes(),
+        json.dumps(outputs, separators=(",", ":"), default=_json_default).encode("utf-8"),
+    ))
+    payload = zlib.compress(raw, level)
+    return _CHUNK_HEADER.pack(CHUNK_MAGIC, n, len(payload)) + payload
+
+
+class Chunk(NamedTuple):
+    timestamps: np.ndarray  # (n,) float64 seconds since the epoch
+    landmarks: np.ndarray  # (n, 33, 4) float32, NaN rows where no pose was detected
+    frame_sizes: np.ndarray  # (n, 2) uint16 width, height
+    outputs: List[Dict[str, Any]]  # trainer output per frame
+
+
+def decode_chunk_payload(n_frames: int, payload, version: int = FORMAT_VERSION) -> Chunk:
+    raw = zlib.decompress(payload)
+    ts_end = n_frames * 8
+    lm_end = ts_end + n_frames * NUM_LANDMARKS * LANDMARK_FIELDS * 4
+    timestamps = np.frombuffer(raw, dtype="<f8", count=n_frames)
+    landmarks = np.frombuffer(raw, dtype="<f4", count=n_frames * NUM_LANDMARKS * LANDMARK_FIELDS,
+                              offset=ts_end).reshape(n_frames, NUM_LANDMARKS, LANDMARK_FIELDS)
+    if version < 2:
+        frame_sizes = np.tile(np.array(V1_FRAME_SIZE, dtype=np.uint16), (n_frames, 1))
+        size_end = lm_end
+    else:
+        size_end = lm_end + n_frames * 2 * 2
+        frame_sizes = np.frombuffer(raw, dtype="<u2", count=n_frames * 2, offset=lm_end).reshape(n_frames, 2)
+    outputs = json.loads(raw[size_end:].decode("utf-8"))
+    return Chunk(timestamps, landmarks, frame_sizes, outputs)
+
+
+class SessionRecorder:
+    """
+    Buffers frames for one session and hands full chunks to a writer thread.
+    add_frame never touches the disk; if the writer falls too far behind,
+    chunks are dropped (and counted) rather than stalling the session.
+    """
+
+    def __init__(self, path: Path, metadata: Optional[Dict[str, Any]] = None,
+                 chunk_frames: int = RECORDING_CHUNK_FRAMES,
+                 compression_level: int = RECORDING_COMPRESSION_LEVEL,
+                 max_frames: int = RECORDING_MAX_FRAMES):
+        self.path = Path(path)
+        self.chunk_frames = chunk_frames
+        self.compression_level = compression_level
+        self.max_frames = max_frames  # later frames are dropped (and counted)
+        self.frames_recorded = 0
+        self.frames_dropped = 0
+        self.closed = False
+
+        self._timestamps = np.empty(chunk_frames, dtype=np.float64)
+        self._landmarks = np.empty((chunk_frames, NUM_LANDMARKS, LANDMARK_FIELDS), dtype=np.float32)
+        self._frame_sizes = np.zeros((chunk_frames, 2), dtype=np.uint16)
+        self._outputs: List[Dict[str, Any]] = []
+        self._count = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "landmarks": NUM_LANDMARKS,
+            "fields": ["x", "y", "z", "visibility"],
+            "started_at": datetime.utcnow().isoformat(),
+        }
+        meta.update(metadata or {})
+        meta_bytes = json.dumps(meta, default=_json_default).encode("utf-8")
+        self._file = open(self.path, "wb")
+        self._file.write(_FILE_HEADER.pack(FILE_MAGIC, FORMAT_VERSION, len(meta_bytes)) + meta_bytes)
+        self._file.flush()
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=RECORDING_MAX_PENDING_CHUNKS)
+        self._writer = threading.Thread(target=self._write_loop, name="session-recorder", daemon=True)
+        self._writer.start()
+
+    def add_frame(self, pose_landmarks, output: Dict[str, Any], frame_size: Tuple[int, int] = (0, 0),
+                  timestamp: Optional[float] = None) -> None:
+        """
+        Record one frame. pose_landmarks is MediaPipe's landmark list (None
+        when no pose was detected) or a ready (33, 4) array; frame_size is
+        the (width, height) the trainer saw, needed to replay pixel angles.
+        """
+        if self.closed:
+            return
+        if self.frames_recorded + self.frames_dropped + self._count >= self.max_frames:
+            if self.frames_dropped == 0:
+                logger.warning(f"Recording {self.path.name} reached {self.max_frames} frames, not recording more")
+            self.frames_dropped += 1
+            return
+        i = self._count
+        self._timestamps[i] = time.time() if timestamp is None else timestamp
+        if isinstance(pose_landmarks, np.ndarray):
+            self._landmarks[i] = pose_landmarks
+        else:
+            landmarks_to_array(pose_landmarks, out=self._landmarks[i])
+        self._frame_sizes[i] = frame_size
+        # Trainers reuse their result dict across frames - keep a snapshot
+        self._outputs.append({k: dict(v) if isinstance(v, dict) else v for k, v in output.items()})
+        self._count += 1
+        if self._count == self.chunk_frames:
+            self._hand_off()
+
+    def _hand_off(self) -> None:
+        if not self._count:
+            return
+        n = self._count
+        item = (self._timestamps[:n], self._landmarks[:n], self._frame_sizes[:n], self._outputs)
+        try:
+            self._queue.put_nowait(item)
+            self.frames_recorded += self._count
+            # The writer owns the old buffers now; start fresh ones
+            self._timestamps = np.empty_like(self._timestamps)
+            self._landmarks = np.empty_like(self._landmarks)
+            self._frame_sizes = np.zeros_like(self._frame_sizes)
+        except queue.Full:
+            self.frames_dropped += self._count
+            logger.warning(f"Recorder for {self.path.name} is behind, dropped {self._count} frames")
+        self._outputs = []
+        self._count = 0
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            try:
+                self._file.write(encode_chunk(*item, level=self.compression_level))
+                self._file.flush()
+            except Exception as e:
+                logger.error(f"Failed to write recording chunk to {self.path}: {e}")
+
+    def close(self) -> None:
+        """Flush the partial chunk and wait for the writer to finish"""
+        if self.closed:
+            return
+        self._hand_off()
+        self.closed = True
+        self._queue.put(None)
+        self._writer.join()
+        self._file.close()
+        logger.info(
+            f"Recording saved: {self.path} ({self.frames_recorded} frames, "
+            f"{self.frames_dropped} dropped)"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def recording_slug(exercise: str) -> str:
+    """Exercise name reduced to [a-z0-9-] for file names and metadata"""
+    return re.sub(r"[^a-z0-9-]", "", exercise.lower())[:64].strip("-") or "session"
+
+
+def start_session_recording(exercise: str, directory: Path = RECORDINGS_DIR,
+                            max_files: int = RECORDING_MAX_FILES, **metadata) -> SessionRecorder:
+    """
+    Open a recorder with a unique file name for a new session. `exercise`
+    comes from the client, so only its slug reaches the path; raises
+    ValueError if the path would leave `directory` or it already holds
+    max_files recordings.
+    """
+    slug = recording_slug(exercise)
+    directory = Path(directory).resolve()
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    path = (directory / f"{slug}-{stamp}-{uuid.uuid4().hex[:8]}{RECORDING_SUFFIX}").resolve()
+    if path.parent != directory:
+        raise ValueError(f"Recording path {path} is outside {directory}")
+    if directory.is_dir() and sum(1 for _ in directory.glob(f"*{RECORDING_SUFFIX}")) >= max_files:
+        raise ValueError(f"{directory} already holds {max_files} recordings")
+    return SessionRecorder(path, {"exercise": slug, **metadata})
+
+
+class Recording(NamedTuple):
+    metadata: Dict[str, Any]
+    timestamps: np.ndarray
+    landmarks: np.ndarray
+    frame_sizes: np.ndarray
+    outputs: List[Dict[str, Any]]
+
+
+def _parse_metadata(buf, offset: int = 0) -> Tuple[Dict[str, Any], int, int]:
+    """Parse the file header; returns (metadata, format version, offset of the first chunk)"""
+    if len(buf) - offset < _FILE_HEADER.size:
+        raise ValueError("Not a session recording (file too short)")
+    magic, version, meta_len = _FILE_HEADER.unpack_from(buf, offset)
+    if magic != FILE_MAGIC:
+        raise ValueError("Not a session recording (bad magic)")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Unsupported recording format version {version}")
+    start = offset + _FILE_HEADER.size
+    metadata = json.loads(bytes(buf[start:start + meta_len]).decode("utf-8"))
+    return metadata, version, start + meta_len
+
+
+def read_metadata(path: Path) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        head = f.read(_FILE_HEADER.size)
+        if len(head) == _FILE_HEADER.size:
+            head += f.read(_FILE_HEADER.unpack(head)[2])
+    return _parse_metadata(head)[0]
+
+
+def iter_chunks(path: Path) -> Iterator[Chunk]:
+    """
+    Yield the recording chunk by chunk, stopping at a truncated tail. The
+    file is memory-mapped, so only the chunk being decoded is ever
+    materialized, however long the session was.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError("Not a session recording (empty file)")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            _, version, offset = _parse_metadata(mm)
+            view = memoryview(mm)
+            try:
+                while len(mm) - offset >= _CHUNK_HEADER.size:
+                    magic, n_frames, length = _CHUNK_HEADER.unpack_from(mm, offset)
+                    start = offset + _CHUNK_HEADER.size
+                    if magic != CHUNK_MAGIC or start + length > len(mm):
+                        logger.warning(f"Ignoring truncated chunk at the end of {path}")
+                        return
+                    yield decode_chunk_payload(n_frames, view[start:start + length], version)
+                    offset = start + length
+            finally:
+                view.release()
+
+
+def read_recording(path: Path) -> Recording:
+    """Load a whole recording into memory"""
+    metadata = read_metadata(path)
+    chunks = list(iter_chunks(path))
+    if not chunks:
+        return Recording(
+            metadata,
+            np.empty(0),
+            np.empty((0, NUM_LANDMARKS, LANDMARK_FIELDS), np.float32),
+            np.empty((0, 2), np.uint16),
+            [],
+        )
+    return Recording(
+        metadata,
+        np.concatenate([c.timestamps for c in chunks]),
+        np.concatenate([c.landmarks for c in chunks]),
+        np.concatenate([c.frame_sizes for c in chunks]),
+        [out for c in chunks for out in c.outputs],
+    )
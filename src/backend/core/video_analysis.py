@@ -0,0 +1,263 @@
+"""
+Uploaded Video Analysis
+Runs pose estimation over a workout video in parallel time chunks, then
+replays the landmarks through the exercise's trainer to build a rep
+timeline, per-frame angles and form-violation spans.
+
+Each chunk starts VIDEO_CHUNK_OVERLAP_SECONDS early: those warm-up frames
+are decoded and fed to MediaPipe so its tracker can re-lock on the person,
+but only frames inside the chunk proper are kept. The video is read from
+disk chunk by chunk and never held in memory; only the compact (N, 33, 4)
+landmark arrays come back from the workers.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from src.backend.core.rescoring import ReplayResults, create_trainer
+from src.backend.core.session_recorder import LANDMARK_FIELDS, NUM_LANDMARKS, landmarks_to_array
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+VIDEO_CHUNK_SECONDS = float(os.getenv("VIDEO_CHUNK_SECONDS", "20"))
+VIDEO_CHUNK_OVERLAP_SECONDS = float(os.getenv("VIDEO_CHUNK_OVERLAP_SECONDS", "2"))
+VIDEO_ANALYSIS_WORKERS = int(os.getenv("VIDEO_ANALYSIS_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+MAX_VIDEO_UPLOAD_MB = int(os.getenv("MAX_VIDEO_UPLOAD_MB", "500"))
+# Exported posture classifier (posture_model.npz or its directory); optional
+VIDEO_POSTURE_MODEL = os.getenv("VIDEO_POSTURE_MODEL", "")
+
+# Trainer messages that are status/encouragement rather than form corrections
+NEUTRAL_FEEDBACK_PREFIXES = (
+    "Good",
+    "Great",
+    "Rep ",
+    "Going down",
+    "Setup verified",
+    "Start",
+    "No pose",
+    "Low confidence",
+    "Keep going",
+    "Hold",
+)
+
+
+class VideoInfo(NamedTuple):
+    frame_count: int
+    fps: float
+    width: int
+    height: int
+
+
+class ChunkPlan(NamedTuple):
+    warmup_start: int  # first frame decoded (tracker warm-up, discarded)
+    start: int  # first frame kept
+    end: int  # one past the last frame kept
+
+
+def probe_video(path: str) -> VideoInfo:
+    import cv2
+
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            raise ValueError("Could not open video (unsupported or corrupt file)")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        return VideoInfo(
+            frame_count=int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+            fps=float(fps),
+            width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        )
+    finally:
+        cap.release()
+
+
+def plan_chunks(frame_count: int, fps: float, chunk_seconds: float = VIDEO_CHUNK_SECONDS,
+                overlap_seconds: float = VIDEO_CHUNK_OVERLAP_SECONDS) -> List[ChunkPlan]:
+    """Split [0, frame_count) into contiguous chunks with a warm-up lead-in each"""
+    chunk_frames = max(1, int(round(chunk_seconds * fps)))
+    overlap_frames = max(0, int(round(overlap_seconds * fps)))
+    return [
+        ChunkPlan(max(0, start - overlap_frames), start, min(start + chunk_frames, frame_count))
+        for start in range(0, frame_count, chunk_frames)
+    ]
+
+
+def extract_chunk_landmarks(path: str, chunk: ChunkPlan) -> Tuple[ChunkPlan, np.ndarray]:
+    """
+    Worker: decode one chunk and run MediaPipe Pose on it. Returns the
+    landmarks of the kept frames, NaN where no pose was found (or the
+    video ended early).
+    """
+    import cv2
+    import mediapipe as mp
+
+    kept = np.full((chunk.end - chunk.start, NUM_LANDMARKS, LANDMARK_FIELDS), np.nan, dtype=np.float32)
+    cap = cv2.VideoCapture(path)
+    try:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, chunk.warmup_start)
+        with mp.solutions.pose.Pose(
+            static_image_mode=False,
+            model_complexity=1,
+            enable_segmentation=False,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5,
+        ) as pose:
+            for index in range(chunk.warmup_start, chunk.end):
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                results = pose.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                if index >= chunk.start and results.pose_landmarks:
+                    landmarks_to_array(results.pose_landmarks, out=kept[index - chunk.start])
+    finally:
+        cap.release()
+    return chunk, kept
+
+
+def _is_violation(message: str) -> bool:
+    return bool(message) and not message.startswith(NEUTRAL_FEEDBACK_PREFIXES)
+
+
+def score_landmarks(exercise: str, landmarks: np.ndarray, fps: float, width: int, height: int,
+                    trainer_spec: Optional[str] = None,
+                    posture_model: Optional[str] = VIDEO_POSTURE_MODEL) -> Dict[str, Any]:
+    """
+    Worker: feed the whole landmark timeline through a fresh trainer (reps
+    depend on state carried across chunks, so this part is sequential).
+    If a posture model is configured, every frame is also classified in one
+    batched pass.
+    """
+    trainer = create_trainer(exercise, trainer_spec)
+    results = ReplayResults()
+
+    frames: List[Dict[str, Any]] = []
+    rep_timeline: List[Dict[str, Any]] = []
+    violations: List[Dict[str, Any]] = []
+    open_spans: Dict[str, int] = {}  # message -> start frame
+    last_reps = 0
+
+    def close_span(message: str, end_frame: int) -> None:
+        start_frame = open_spans.pop(message)
+        violations.append({
+            "message": message,
+            "start_time": round(start_frame / fps, 3),
+            "end_time": round(end_frame / fps, 3),
+            "frames": end_frame - start_frame,
+        })
+
+    start_wall = time.time()
+    for index in range(len(landmarks)):
+        t = index / fps
+        if results.load(landmarks[index]).pose_landmarks is None:
+            frames.append({"time": round(t, 3), "pose": False, "angles": {}})
+            active = set()
+        else:
+            # Video time, so feedback cooldowns don't depend on scoring speed
+            output = trainer.process_frame(results, width, height, now=start_wall + t)
+            reps = int(output.get("reps", 0) or 0)
+            if reps > last_reps:
+                for rep in range(last_reps + 1, reps + 1):
+                    rep_timeline.append({"rep": rep, "time": round(t, 3), "frame": index})
+                last_reps = reps
+            frames.append({
+                "time": round(t, 3),
+                "pose": True,
+                "angles": dict(output.get("angles", {})),
+                "progress": output.get("progress", 0.0),
+            })
+            active = {
+                m.strip() for m in str(output.get("feedback", "")).split("|") if _is_violation(m.strip())
+            }
+
+        for message in [m for m in open_spans if m not in active]:
+            close_span(message, index)
+        for message in active:
+            open_spans.setdefault(message, index)
+
+    for message in list(open_spans):
+        close_span(message, len(landmarks))
+
+    if posture_model and os.path.exists(posture_model):
+        from src.backend.training.numpy_predictor import NumpyPosturePredictor
+
+        labels, confidences = NumpyPosturePredictor.load(posture_model).predict_batch(landmarks)
+        for frame, label, confidence in zip(frames, labels, confidences):
+            if label is not None:
+                frame["posture"] = str(label)
+                frame["posture_confidence"] = round(float(confidence), 3)
+
+    violations.sort(key=lambda v: v["start_time"])
+    return {
+        "reps": last_reps,
+        "rep_timeline": rep_timeline,
+        "frames": frames,
+        "violations": violations,
+    }
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_video_pool() -> ProcessPoolExecutor:
+    """Shared worker pool (spawned lazily; spawn keeps MediaPipe out of forked state)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=VIDEO_ANALYSIS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def discard_video_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool (a worker crashed) so the next request gets a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def merge_chunks(results: List[Tuple[ChunkPlan, np.ndarray]], frame_count: int) -> np.ndarray:
+    """Stitch per-chunk landmark arrays back into one (frame_count, 33, 4) timeline"""
+    timeline = np.full((frame_count, NUM_LANDMARKS, LANDMARK_FIELDS), np.nan, dtype=np.float32)
+    for chunk, landmarks in results:
+        timeline[chunk.start:chunk.end] = landmarks
+    return timeline
+
+
+def summarize(exercise: str, info: VideoInfo, scored: Dict[str, Any], started: float) -> Dict[str, Any]:
+    return {
+        "exercise": exercise,
+        "duration_seconds": round(info.frame_count / info.fps, 2) if info.fps else 0,
+        "fps": info.fps,
+        "frame_count": info.frame_count,
+        "width": info.width,
+        "height": info.height,
+        "processing_seconds": round(time.monotonic() - started, 2),
+        **scored,
+    }
+
+
+def analyze_video(path: str, exercise: str, workers: int = VIDEO_ANALYSIS_WORKERS) -> Dict[str, Any]:
+    """Synchronous entry point (scripts/tests); the API streams progress instead"""
+    started = time.monotonic()
+    info = probe_video(path)
+    chunks = plan_chunks(info.frame_count, info.fps)
+    with ProcessPoolExecutor(max_workers=max(1, min(workers, len(chunks) or 1))) as pool:
+        extracted = list(pool.map(extract_chunk_landmarks, [path] * len(chunks), chunks))
+    landmarks = merge_chunks(extracted, info.frame_count)
+    scored = score_landmarks(exercise, landmarks, info.fps, info.width, info.height)
+    return summarize(exercise, info, scored, started)
+
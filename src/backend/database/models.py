@@ -4,7 +4,17 @@ Database Models
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    text,
+)
 from sqlalchemy.orm import relationship
 
 from src.backend.database.db import Base
@@ -58,11 +68,20 @@ class Workout(Base):
     )  # Weight used in lbs (for progression tracking)
     sets_completed = Column(Integer, default=2)  # Number of sets completed (2-3)
     reps_per_set = Column(Integer, default=15)  # Reps per set (15-20)
+    client_id = Column(String, nullable=True)  # Idempotency key from offline sync
+    utc_offset_minutes = Column(Integer, nullable=True)  # Client's local time minus UTC (None = unknown)
 
     # Relationships
     user = relationship("User", back_populates="workouts")
     exercise = relationship("Exercise", back_populates="workouts")
 
+    __table_args__ = (
+        # Keyset pagination of a user's history walks (user_id, date, id)
+        Index("ix_workouts_user_date_id", "user_id", "date", "id"),
+        # A replayed sync batch can't insert the same workout twice
+        Index("uq_workouts_user_client_id", "user_id", "client_id", unique=True),
+    )
+
 
 class Achievement(Base):
     __tablename__ = "achievements"
@@ -93,6 +112,16 @@ class UserAchievement(Base):
     achievement = relationship("Achievement", back_populates="user_achievements")
 
 
+class UserCounter(Base):
+    """Running per-user totals (reps, streak, max weight...) for achievements"""
+
+    __tablename__ = "user_counters"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    name = Column(String, primary_key=True)  # e.g., "reps", "reps:rehab", "streak"
+    value = Column(Float, default=0.0)
+
+
 class DietEntry(Base):
     __tablename__ = "diet_entries"
 
@@ -119,6 +148,10 @@ class DietEntry(Base):
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_diet_entries_user_date_id", "user_id", "date", "id"),
+    )
+
 
 class Booking(Base):
     __tablename__ = "bookings"
@@ -141,3 +174,16 @@ class Booking(Base):
     
     # Relationship
     user = relationship("User")
+
+    # At most one confirmed booking per slot; cancelled rows don't count.
+    # Also serves the date-windowed availability query.
+    __table_args__ = (
+        Index(
+            "uq_bookings_confirmed_slot",
+            "booking_date",
+            "time",
+            unique=True,
+            sqlite_where=text("status = 'confirmed'"),
+            postgresql_where=text("status = 'confirmed'"),
+        ),
+    )
@@ -0,0 +1,80 @@
+# Ball Squeeze Trainer (Rehab Exercise)
+# Run: python -m src.backend.exercises.ball_squeeze_trainer
+
+from typing import Optional
+
+from src.backend.exercises.base_trainer import SIDES, BaseTrainer
+
+LEFT, RIGHT = SIDES['left'], SIDES['right']
+
+
+class BallSqueezeTrainer(BaseTrainer):
+	NAME = "BallSqueezeTrainer"
+	TITLE = "Ball Squeeze Trainer"
+	VOICE_TYPE = 'ball_squeeze'
+	LANDMARKS = ("LEFT_HIP", "RIGHT_HIP", "LEFT_KNEE", "RIGHT_KNEE")
+	GUIDE = (
+		"Ball squeeze start karne se pehle sahi posture set karo.",
+		"Butterfly position mein baitho, ball knees ke beech.",
+		"Back seedhi rakho, feet ground par.",
+		"Knees se ball ko dabao aur teen second hold karo.",
+	)
+	GUIDANCE = "Groin muscles se squeeze karo, saans mat roko."
+	READY_MESSAGE = "Setup verified! Start squeezing"
+	SETUP_MESSAGE = "Ball Squeeze - Butterfly position with ball between knees"
+	IDLE_MESSAGE = "Ball Squeeze - Focus on adductor (groin) activation"
+
+	def __init__(self, use_enhanced_processor: bool = True) -> None:
+		super().__init__(use_enhanced_processor)
+		self.squeeze_fraction = 0.10   # knee gap this much narrower than relaxed = squeezing
+		self.hold_seconds = 3.0   # squeeze held this long = 1 rep
+		self.relaxed_gap: Optional[float] = None  # knee gap at rest (knees / hip width), see calibrate()
+		self.squeeze_start: Optional[float] = None
+		self.hold = 0.0  # seconds of the current squeeze
+
+	def compute_knee_gap(self) -> Optional[float]:
+		"""Horizontal knee distance relative to hip width"""
+		points = (LEFT['HIP'], RIGHT['HIP'], LEFT['KNEE'], RIGHT['KNEE'])
+		if not all(self.confident[i] for i in points):
+			return None
+		x = self.x
+		hip_width = abs(x[LEFT['HIP']] - x[RIGHT['HIP']])
+		if hip_width < 1.0:
+			return None
+		return abs(x[LEFT['KNEE']] - x[RIGHT['KNEE']]) / hip_width
+
+	def analyze(self, results, w: int, h: int, side: str) -> Optional[float]:
+		gap = self.compute_knee_gap()
+		if gap is None:
+			return None
+		if self.relaxed_gap is None:
+			self.relaxed_gap = self.calibrate(gap)
+			return 0.0
+
+		squeezing = gap <= self.relaxed_gap * (1.0 - self.squeeze_fraction)
+		if squeezing:
+			if self.squeeze_start is None:
+				self.squeeze_start = self.now
+				self.messages.append("Squeeze! Hold karo")
+			self.hold = self.now - self.squeeze_start
+		elif self.squeeze_start is not None:
+			# Released: a rep if the squeeze was held long enough
+			if self.hold >= self.hold_seconds:
+				self.rep_done()
+			elif self.feedback_ready():
+				self.correct(f"Thoda aur hold karo - {int(self.hold_seconds)} second")
+			self.squeeze_start = None
+			self.hold = 0.0
+
+		self.angles["knee_gap"] = round(gap * 100, 1)  # Percentage of hip width
+		self.angles["hold"] = round(self.hold, 1)
+		return min(1.0, self.hold / self.hold_seconds)
+
+
+def main() -> None:
+	trainer = BallSqueezeTrainer()
+	trainer.run()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,399 @@
+# Base Trainer
+# Shared plumbing for the exercise trainers: MediaPipe loading, landmark
+# reading, voice, the process_frame() result and the webcam run() loop.
+#
+# Subclasses declare the landmarks they read (LANDMARKS) and implement only
+# the exercise math in analyze(). Per-session buffers (landmark coordinates,
+# feedback messages, the result dict) are allocated once and reused every
+# frame, so process_frame() returns the same dict each time - callers that
+# keep results across frames must copy them.
+
+import math
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.backend.core.form_rules import LANDMARK_INDEX
+
+# Lazy load mediapipe to prevent hang at module load time
+mp = None
+mp_pose = None
+mp_drawing = None
+
+def get_mediapipe():
+	"""Lazy load mediapipe"""
+	global mp, mp_pose, mp_drawing
+	if mp is None:
+		import mediapipe as _mp
+		mp = _mp
+		mp_pose = mp.solutions.pose
+		mp_drawing = mp.solutions.drawing_utils
+	return mp, mp_pose, mp_drawing
+
+try:
+	# Skip voice on headless servers - check if display available
+	if os.environ.get('DISPLAY') or os.name == 'nt':  # Has display or is Windows
+		from src.backend.core.voice_feedback import VoiceSystem
+		voice = VoiceSystem()
+		VOICE_ENABLED = True
+	else:
+		VOICE_ENABLED = False
+		print("[Trainers] Voice disabled - no display available (server mode)")
+except Exception as e:
+	VOICE_ENABLED = False
+	print(f"[Trainers] Voice disabled: {e}")
+
+# Import enhanced pose processor - skip on headless servers
+ENHANCED_PROCESSOR_AVAILABLE = False
+if os.environ.get('DISPLAY') or os.name == 'nt':
+	try:
+		from src.backend.core.pose_processor import EnhancedPoseProcessor
+		ENHANCED_PROCESSOR_AVAILABLE = True
+	except ImportError:
+		print("[WARNING] EnhancedPoseProcessor not available, using basic processing")
+else:
+	print("[Trainers] EnhancedPoseProcessor disabled - server mode (no display)")
+
+def get_xy(results, idx, w, h):
+	lm = results.pose_landmarks.landmark[idx]
+	return (lm.x * w, lm.y * h)
+
+def angle_deg(a, b, c) -> float:
+	pa = np.array(a, dtype=float)
+	pb = np.array(b, dtype=float)
+	pc = np.array(c, dtype=float)
+	v1 = pa - pb
+	v2 = pc - pb
+	n1 = v1 / (np.linalg.norm(v1) + 1e-8)
+	n2 = v2 / (np.linalg.norm(v2) + 1e-8)
+	cosang = float(np.clip(np.dot(n1, n2), -1.0, 1.0))
+	return float(np.degrees(np.arccos(cosang)))
+
+def angle_xy(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> float:
+	"""angle_deg on plain floats: internal angle at b (0..180), no arrays"""
+	v1x, v1y = ax - bx, ay - by
+	v2x, v2y = cx - bx, cy - by
+	n1 = math.hypot(v1x, v1y) + 1e-8
+	n2 = math.hypot(v2x, v2y) + 1e-8
+	cosang = (v1x * v2x + v1y * v2y) / (n1 * n2)
+	return math.degrees(math.acos(max(-1.0, min(1.0, cosang))))
+
+def say(text: str, min_interval: float = 1.8, msg_type: str = 'general') -> None:
+	if VOICE_ENABLED:
+		priority = 'high' if min_interval <= 1.0 else ('normal' if min_interval <= 2.0 else 'low')
+		voice.say(text, priority=priority, msg_type=msg_type)
+
+def fraction(value: float, low: float, high: float) -> float:
+	"""Where value sits between low and high, clamped to 0..1"""
+	return max(0.0, min(1.0, (value - low) / (high - low)))
+
+# Side-relative landmark indices, e.g. SIDES['left']['KNEE'] == 25
+SIDES = {
+	side: {name[len(side) + 1:]: idx for name, idx in LANDMARK_INDEX.items() if name.startswith(side.upper() + "_")}
+	for side in ('left', 'right')
+}
+
+
+class BaseTrainer:
+	NAME = "Trainer"  # log prefix
+	TITLE = "Trainer"  # run() window title
+	VOICE_TYPE = "general"
+	# Landmarks analyze() reads, by name ("LEFT_KNEE"); only these are
+	# converted to pixels each frame
+	LANDMARKS: Sequence[str] = ()
+	GUIDE: Sequence[str] = ()  # posture_guide() lines
+	GUIDANCE = ""  # repeated every guidance_interval seconds in run()
+	READY_MESSAGE = "Setup verified! Start"
+	SETUP_MESSAGE = "Adjust position"
+	NO_POSE_MESSAGE = "No pose detected - step into frame"
+	LOW_CONFIDENCE_MESSAGE = "Low confidence - adjust position"
+	IDLE_MESSAGE = "Good form - keep going!"
+	CALIBRATION_FRAMES = 30  # frames calibrate() averages
+
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		unknown = [name for name in cls.LANDMARKS if name not in LANDMARK_INDEX]
+		if unknown:
+			raise ValueError(f"{cls.__name__}.LANDMARKS has unknown landmarks: {unknown}")
+		cls.LANDMARK_IDS = tuple(sorted(LANDMARK_INDEX[name] for name in set(cls.LANDMARKS)))
+
+	def __init__(self, use_enhanced_processor: bool = True) -> None:
+		self.reps = 0
+		self.direction = 0  # hysteresis state, see count_hysteresis()
+		self.last_guidance_time = time.time()
+		self.last_feedback_time = 0.0
+		self.feedback_cooldown = 2.0  # seconds between feedback messages
+		self.guidance_interval = 12
+		self.calibrated = False
+		self.current_feedback = ""  # Store current feedback message
+		self.now = 0.0  # time.time() of the frame being processed
+		self.calib_frames = 0
+		self.calib_sum = 0.0
+
+		# Per-session buffers, reused every frame
+		self.x: List[float] = [0.0] * len(LANDMARK_INDEX)  # pixels
+		self.y: List[float] = [0.0] * len(LANDMARK_INDEX)
+		self.confident: List[bool] = [False] * len(LANDMARK_INDEX)
+		self.messages: List[str] = []  # this frame's feedback
+		self.correction: Optional[str] = None  # this frame's form correction, if any
+		self.angles: Dict[str, Any] = {}
+		self.result: Dict[str, Any] = {"reps": 0, "feedback": "", "angles": self.angles, "progress": 0.0}
+
+		# Initialize enhanced pose processor if available
+		self.use_enhanced = use_enhanced_processor and ENHANCED_PROCESSOR_AVAILABLE
+		if self.use_enhanced:
+			self.processor = EnhancedPoseProcessor(use_mediapipe=True)
+			print(f"[{self.NAME}] ✅ Using EnhancedPoseProcessor")
+		else:
+			self.processor = None
+
+	# --- exercise hooks -------------------------------------------------
+
+	def analyze(self, results, w: int, h: int, side: str) -> Optional[float]:
+		"""
+		Exercise math for one frame: read self.x/self.y, fill self.angles,
+		append to self.messages. Returns progress (0..1), or None when the
+		landmarks it needs aren't confident enough.
+		"""
+		raise NotImplementedError
+
+	def check_setup(self, results, w: int, h: int) -> bool:
+		"""Starting position check (landmarks are already loaded)"""
+		return True
+
+	def on_ready(self) -> None:
+		"""Called once when check_setup() first passes"""
+
+	def idle_feedback(self) -> str:
+		return self.IDLE_MESSAGE
+
+	def posture_guide(self) -> None:
+		for line in self.GUIDE:
+			self.say(line)
+
+	# --- helpers for analyze() -----------------------------------------
+
+	def say(self, text: str, min_interval: float = 1.8) -> None:
+		say(text, min_interval, self.VOICE_TYPE)
+
+	def load_landmarks(self, results, w: int, h: int, smoothed: bool = True) -> None:
+		"""Pixel coordinates of the declared landmarks into self.x/self.y"""
+		landmarks = results.pose_landmarks.landmark
+		x, y, confident = self.x, self.y, self.confident
+		if self.processor is None or not smoothed:
+			for i in self.LANDMARK_IDS:
+				lm = landmarks[i]
+				x[i] = lm.x * w
+				y[i] = lm.y * h
+				confident[i] = True
+			return
+		# Enhanced: smoothed coordinates, flagged when visibility is too low
+		get = self.processor.get_landmark_with_confidence
+		for i in self.LANDMARK_IDS:
+			point = get(results, i, w, h)
+			if point is None:
+				lm = landmarks[i]
+				x[i] = lm.x * w
+				y[i] = lm.y * h
+				confident[i] = False
+			else:
+				x[i] = point[0]
+				y[i] = point[1]
+				confident[i] = True
+
+	def angle(self, a: int, b: int, c: int) -> Optional[float]:
+		"""Angle at landmark b, or None if any of the three is low confidence"""
+		if not (self.confident[a] and self.confident[b] and self.confident[c]):
+			return None
+		x, y = self.x, self.y
+		return angle_xy(x[a], y[a], x[b], y[b], x[c], y[c])
+
+	def mid_y(self, a: int, b: int) -> float:
+		return (self.y[a] + self.y[b]) / 2.0
+
+	def calibrate(self, value: float) -> Optional[float]:
+		"""
+		Average a resting measurement over CALIBRATION_FRAMES frames (the
+		user holding the start position). Returns the mean once complete,
+		None while still collecting.
+		"""
+		self.calib_sum += value
+		self.calib_frames += 1
+		self.angles["calibration"] = int(self.calib_frames / self.CALIBRATION_FRAMES * 100)
+		if self.calib_frames < self.CALIBRATION_FRAMES:
+			self.messages.append("Hold position for calibration")
+			return None
+		return self.calib_sum / self.calib_frames
+
+	def reset_calibration(self) -> None:
+		self.calib_frames = 0
+		self.calib_sum = 0.0
+
+	def correct(self, message: str) -> None:
+		"""Form correction (the caller checks feedback_ready() first)"""
+		self.messages.append(message)
+		self.correction = message
+		self.last_feedback_time = self.now
+
+	def feedback_ready(self) -> bool:
+		return self.now - self.last_feedback_time > self.feedback_cooldown
+
+	def rep_done(self) -> None:
+		self.reps += 1
+		self.messages.append(f"Rep {self.reps} complete! Shabash!")
+		self.say(f"Rep {self.reps} complete. Shabash!", 1.5)
+
+	def count_hysteresis(self, value: float, low: float, high: float, turn_message: str) -> bool:
+		"""
+		Two-threshold rep counting: down to `low` (turn_message), then back
+		to `high` completes the rep. Returns True on a completed rep.
+		"""
+		if value <= low and self.direction == 0:
+			self.direction = 1
+			self.messages.append(turn_message)
+		elif value >= high and self.direction == 1:
+			self.direction = 0
+			self.rep_done()
+			return True
+		return False
+
+	# --- per frame -------------------------------------------------------
+
+	def _reply(self, feedback: str, progress: float = 0.0) -> Dict[str, Any]:
+		result = self.result
+		result["reps"] = self.reps
+		result["feedback"] = feedback
+		result["progress"] = progress
+		return result
+
+	def process_frame(self, results, w: int, h: int, side: str = 'left',
+	                  now: Optional[float] = None) -> Dict[str, Any]:
+		"""
+		Process a single frame for API/WebSocket use
+		Returns feedback dict with reps, angles, corrections (reused per frame)
+		`now` is the frame's time; replays pass the recorded time (default: time.time())
+		"""
+		self.messages.clear()
+		self.angles.clear()
+		self.correction = None
+		if not results.pose_landmarks:
+			return self._reply(self.NO_POSE_MESSAGE)
+
+		self.now = time.time() if now is None else now
+		# Auto-calibrate if not done; setup checks read the raw landmarks
+		if not self.calibrated:
+			self.load_landmarks(results, w, h, smoothed=False)
+			if self.check_setup(results, w, h):
+				self.calibrated = True
+				self.current_feedback = self.READY_MESSAGE
+				self.on_ready()
+			else:
+				self.current_feedback = self.SETUP_MESSAGE
+			if self.processor is not None:
+				self.load_landmarks(results, w, h)
+		else:
+			self.load_landmarks(results, w, h)
+
+		progress = self.analyze(results, w, h, side)
+		if progress is None:
+			self.angles.clear()
+			return self._reply(self.LOW_CONFIDENCE_MESSAGE)
+
+		messages = self.messages
+		if messages:
+			self.current_feedback = messages[0] if len(messages) == 1 else " | ".join(messages)
+		elif not self.current_feedback or self.now - self.last_feedback_time > 5.0:
+			self.current_feedback = self.idle_feedback()
+		return self._reply(self.current_feedback, round(progress, 2))
+
+	# --- standalone webcam loop -----------------------------------------
+
+	def run(self) -> None:
+		import cv2
+
+		cap = cv2.VideoCapture(0)
+		if not cap.isOpened():
+			print("❌ Could not open webcam.")
+			return
+
+		cv2.namedWindow(self.TITLE, cv2.WINDOW_NORMAL)
+		side = 'left'
+		self.posture_guide()
+
+		_, mp_pose, mp_drawing = get_mediapipe()
+		pose_context = None
+		if self.use_enhanced and self.processor:
+			# Enhanced processor's pose is already initialized
+			pose = self.processor.pose
+		else:
+			pose_context = mp_pose.Pose(
+				static_image_mode=False,
+				model_complexity=1,
+				enable_segmentation=False,
+				min_detection_confidence=0.5,
+				min_tracking_confidence=0.5
+			)
+			pose = pose_context.__enter__()
+
+		try:
+			p_time = 0.0
+			fps_prev = 0.0
+			while True:
+				ok, frame = cap.read()
+				if not ok:
+					continue
+
+				h, w = frame.shape[:2]
+				rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+				results = pose.process(rgb)
+				img = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+
+				output = self.process_frame(results, w, h, side)
+				if results.pose_landmarks:
+					mp_drawing.draw_landmarks(img, results.pose_landmarks, mp_pose.POSE_CONNECTIONS)
+					if self.correction:
+						self.say(self.correction, 1.0)
+					cv2.putText(img, output["feedback"], (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0,255,255), 2)
+					for i, (name, value) in enumerate(output["angles"].items()):
+						cv2.putText(img, f"{name}: {value}", (10, 110 + 25 * i), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,255), 2)
+
+					# Periodic guidance
+					now = time.time()
+					if self.GUIDANCE and now - self.last_guidance_time > self.guidance_interval:
+						self.last_guidance_time = now
+						self.say(self.GUIDANCE, 2.5)
+				else:
+					cv2.putText(img, "No pose detected", (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0,0,255), 2)
+
+				# HUD
+				cv2.putText(img, f"Reps: {self.reps}", (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255,255,255), 2)
+				cv2.putText(img, "q=quit, l=switch side", (10, h - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,0), 2)
+
+				# FPS
+				c_time = time.time()
+				fps = 1.0 / (c_time - p_time) if c_time > p_time else fps_prev
+				p_time, fps_prev = c_time, fps
+				cv2.putText(img, f"FPS: {int(fps)}", (w - 120, h - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,0), 2)
+
+				cv2.imshow(self.TITLE, img)
+				key = cv2.waitKey(1) & 0xFF
+				if key == ord('q'):
+					break
+				elif key == ord('l'):
+					side = 'right' if side == 'left' else 'left'
+					self.say(f"Ab {side} side.")
+		finally:
+			# Cleanup: only exit context manager for basic MediaPipe
+			if pose_context is not None:
+				try:
+					pose_context.__exit__(None, None, None)
+				except Exception:
+					pass
+			# Reset enhanced processor if used
+			if self.use_enhanced and self.processor:
+				self.processor.reset()
+
+		cap.release()
+		cv2.destroyAllWindows()
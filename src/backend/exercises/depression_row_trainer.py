@@ -0,0 +1,120 @@
+# Depression Row Trainer (Rehab Exercise)
+# Run: python -m src.backend.exercises.depression_row_trainer
+
+import math
+from typing import Optional
+
+from src.backend.core.form_rules import FormChecker, FormRule
+from src.backend.core.rep_detector import Rep, RepDetector
+from src.backend.exercises.base_trainer import SIDES, BaseTrainer, fraction
+
+LEFT, RIGHT = SIDES['left'], SIDES['right']
+
+
+class DepressionRowTrainer(BaseTrainer):
+	NAME = "DepressionRowTrainer"
+	TITLE = "Depression Row Trainer"
+	VOICE_TYPE = 'depression_row'
+	LANDMARKS = (
+		"LEFT_EAR", "RIGHT_EAR", "LEFT_SHOULDER", "RIGHT_SHOULDER", "LEFT_HIP", "RIGHT_HIP",
+		"LEFT_ELBOW", "RIGHT_ELBOW", "LEFT_WRIST", "RIGHT_WRIST",
+	)
+	GUIDE = (
+		"Depression row start karne se pehle sahi posture set karo.",
+		"Shoulder thoda aage, chest upar rakho.",
+		"Elbow ko 45 degree par rakho, arm seedha.",
+		"Sirf shoulder blade ko neeche kheencho - row mat karo.",
+	)
+	GUIDANCE = "Chest high rakho, shoulder ko kaan se door le jao."
+	READY_MESSAGE = "Setup verified! Start depression rows"
+	SETUP_MESSAGE = "Depression Row - Shoulder forward, chest lifted, elbow at 45°"
+	IDLE_MESSAGE = "Depression Row - Focus on scapula depression, not rowing. Keep shoulder forward, chest high."
+
+	def __init__(self, use_enhanced_processor: bool = True) -> None:
+		super().__init__(use_enhanced_processor)
+		self.relaxed_depression = 0.0   # progress bar bottom (relative to the baseline)
+		self.target_depression = 6.0   # shoulder this much lower (% of torso length) = full rep
+		self.rep_prominence = 3.0   # % of torso length a rep must go down and come back up
+		self.elbow_min_angle = 140.0   # arm stays long; bending it means rowing
+		self.min_torso_px = 20.0   # shorter torso = side not really visible
+		self.baseline: Optional[float] = None  # ear-shoulder height at rest, see calibrate()
+		self.baseline_side: Optional[str] = None
+		self.rep_detector: Optional[RepDetector] = None  # created on first frame, see count_rep()
+		self.form: Optional[FormChecker] = None  # compiled per side, see form_rules()
+
+	def form_rules(self) -> list:
+		"""Form corrections; they share one feedback cooldown"""
+		shared = dict(cooldown=self.feedback_cooldown, cooldown_group="form")
+		return [
+			FormRule("no_rowing", "Arm seedha rakho - row nahi, sirf shoulder neeche", metric="angle",
+			         points=("SHOULDER", "ELBOW", "WRIST"), min=self.elbow_min_angle, persist_frames=3, **shared),
+		]
+
+	def compute_depression(self, side: str) -> Optional[float]:
+		"""
+		Ear to shoulder height as a percentage of the shoulder-hip length
+		(grows as the shoulder drops). Torso length holds up in the side
+		view this exercise is filmed from, unlike shoulder width.
+		"""
+		s = SIDES[side]
+		if not all(self.confident[i] for i in (s['EAR'], s['SHOULDER'], s['HIP'])):
+			return None
+		x, y = self.x, self.y
+		torso = math.hypot(x[s['SHOULDER']] - x[s['HIP']], y[s['SHOULDER']] - y[s['HIP']])
+		if torso < self.min_torso_px:
+			return None
+		return (y[s['SHOULDER']] - y[s['EAR']]) / torso * 100
+
+	def count_rep(self, depression: float, now: float) -> Optional[Rep]:
+		"""Feed the shoulder depression to the rep detector; returns the rep it completed"""
+		if self.rep_detector is None:
+			self.rep_detector = RepDetector(self.rep_prominence, start="valley")
+		rep = self.rep_detector.update(depression, now)
+		if rep is not None:
+			self.reps += 1
+		return rep
+
+	def analyze(self, results, w: int, h: int, side: str) -> Optional[float]:
+		depression = self.compute_depression(side)
+		if depression is None:
+			return None
+		if side != self.baseline_side:
+			# Each side has its own resting height
+			self.baseline, self.baseline_side = None, side
+			self.reset_calibration()
+			if self.rep_detector is not None:
+				self.rep_detector.reset()
+		if self.baseline is None:
+			self.baseline = self.calibrate(depression)
+			return 0.0
+		depression -= self.baseline
+
+		if self.form is None or self.form.compiled.side != side:
+			self.form = FormChecker(self.form_rules(), side)
+		for message in self.form.update(results, w, h, now=self.now):
+			self.correct(message)
+
+		rep = self.count_rep(depression, self.now)
+		if rep is not None:
+			if rep.range_of_motion < self.target_depression:
+				self.messages.append(f"Rep {self.reps} complete - shoulder ko aur neeche kheencho")
+			else:
+				self.messages.append(f"Rep {self.reps} complete! Shabash!")
+			self.say(f"Rep {self.reps} complete. Shabash!", 1.5)
+
+		angles = self.angles
+		angles["depression"] = round(depression, 1)
+		last = self.rep_detector.last_rep
+		if last is not None:
+			angles["rom"] = round(last.range_of_motion, 1)
+			angles["tempo"] = round(last.duration, 1)
+		return fraction(depression, self.relaxed_depression, self.target_depression)
+
+
+def main() -> None:
+	trainer = DepressionRowTrainer()
+	trainer.run()
+
+
+if __name__ == "__main__":
+	main()
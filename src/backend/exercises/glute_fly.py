@@ -4,6 +4,9 @@ import time
 import math
 import os
 
+from src.backend.core.form_rules import FormChecker, FormRule
+from src.backend.core.rep_detector import RepDetector
+
 # Lazy load MediaPipe
 mp = None
 mp_pose = None
@@ -80,22 +83,15 @@ class GluteFlyTrainer:
         
         # Tracking variables
         self.reps = 0
-        self.direction = 0  # 0 = down, 1 = up
+        self.rep_detector = None  # created on first use, see _rep_counter()
         self.side = 'left'  # Default side
         
         # Smoothing buffers
         self.sm_knee_y = None
         self.sm_progress = None
-        self.sm_pelvis_x = None
-        self.sm_lrhip_dx = None
-        self.sm_dorsi = None
         
-        # Violations (counters for dampening feedback)
-        self.vio = {
-            'pelvis_shift': 0,
-            'hip_roll': 0,
-            'dorsi': 0
-        }
+        # Form checks (smoothing + violation counters live in the checker)
+        self.form = None
         self.positive_vio = {
             'pelvis_stable': 0,
             'hip_straight': 0,
@@ -104,8 +100,8 @@ class GluteFlyTrainer:
         
         # Configuration
         self.KNEE_LIFT_TARGET_FRACTION = 0.09
-        self.KNEE_UP_THRESHOLD = 0.85
-        self.KNEE_DOWN_THRESHOLD = 0.20
+        self.KNEE_UP_THRESHOLD = 0.85 # Lift progress treated as the top position
+        self.REP_PROMINENCE = 0.30 # Lift progress a rep must rise and fall by
         self.PELVIS_MAX_X_SHIFT_FRAC = 0.05
         self.HIP_ROLL_MAX_DIFF_FRAC = 0.04
         self.DORSI_MIN = 80
@@ -114,10 +110,39 @@ class GluteFlyTrainer:
 
         print("[GluteFlyTrainer] Initialized (State: CALIBRATION)")
 
-    def process_frame(self, results, w: int, h: int, side: str = "left"):
+    def form_rules(self):
+        """Form checks, in feedback priority order (first warning wins)"""
+        return [
+            FormRule("pelvis_shift", "Keep hips stable! Don't rock forward/back.",
+                     metric="position", points=("MID_HIP",), axis="x", scale="width",
+                     relative_to_baseline=True, max=self.PELVIS_MAX_X_SHIFT_FRAC,
+                     smoothing=0.35, persist_frames=self.VIOLATION_PERSIST_FRAMES),
+            FormRule("hip_roll", "Don't let pelvis roll back!",
+                     metric="distance", points=("LEFT_HIP", "RIGHT_HIP"), axis="x", scale="width",
+                     relative_to_baseline=True, max=self.HIP_ROLL_MAX_DIFF_FRAC,
+                     smoothing=0.35, persist_frames=self.VIOLATION_PERSIST_FRAMES),
+            FormRule("dorsiflexion", "Keep ankle bent (toes to shin)",
+                     metric="angle", points=("KNEE", "ANKLE", "FOOT_INDEX"),
+                     min=self.DORSI_MIN, max=self.DORSI_MAX,
+                     smoothing=0.35, persist_frames=self.VIOLATION_PERSIST_FRAMES),
+        ]
+
+    def _form_checker(self):
+        # Compiled on first use so threshold overrides set after __init__ apply
+        if self.form is None:
+            self.form = FormChecker(self.form_rules(), self.side)
+        return self.form
+
+    def _rep_counter(self):
+        # Reps start with the knee down: valley -> lift peak -> back down
+        if self.rep_detector is None:
+            self.rep_detector = RepDetector(self.REP_PROMINENCE, start="valley")
+        return self.rep_detector
+
+    def process_frame(self, results, w: int, h: int, side: str = "left", now=None):
         """
         Process a single frame and return feedback dict.
-        Non-blocking.
+        Non-blocking. `now` is the frame's time (default: time.time()).
         """
         # Ensure MediaPipe is loaded
         _mp, _pose, _drawing = get_mediapipe()
@@ -131,6 +156,10 @@ class GluteFlyTrainer:
             # Reset smoothing on side switch
             self.sm_knee_y = None
             self.sm_progress = None
+            if self.rep_detector is not None:
+                self.rep_detector.reset()
+            if self.form is not None:
+                self.form = self.form.with_side(side)
         
         if not results.pose_landmarks:
             return {
@@ -220,6 +249,7 @@ class GluteFlyTrainer:
         self.calib_accumulators['knee_y'] += knee[1]
         self.calib_accumulators['lrhip_dx'] += lrhip_dx
         self.calib_accumulators['hip_ang'] += hip_ang
+        self._form_checker().add_baseline_frame(results, w, h)
         
         self.calib_frames += 1
         
@@ -232,6 +262,7 @@ class GluteFlyTrainer:
             self.baseline['lrhip_dx'] = self.calib_accumulators['lrhip_dx'] / self.calib_frames
             self.baseline['hip_angle'] = self.calib_accumulators['hip_ang'] / self.calib_frames
             self.knee_lift_target_px = self.KNEE_LIFT_TARGET_FRACTION * h
+            self._form_checker().finish_baseline()
             
             self.state = 'EXERCISE'
             return {
@@ -255,24 +286,13 @@ class GluteFlyTrainer:
         coords = self._get_landmarks_dict(results, w, h)
         
         # Extract metrics
-        lhip = coords['L_HIP']
-        rhip = coords['R_HIP']
-        pelvis_x = (lhip[0] + rhip[0]) / 2.0
-        lrhip_dx = abs(lhip[0] - rhip[0])
-        
         knee = coords['KNEE']
-        ankle = coords['ANKLE']
-        foot = coords['FOOT']
-        
-        dorsi_angle = angle_deg(knee, ankle, foot)
         
         # Smoothing
         self.sm_knee_y = smooth(self.sm_knee_y, knee[1], 0.35)
-        self.sm_pelvis_x = smooth(self.sm_pelvis_x, pelvis_x, 0.35)
-        self.sm_lrhip_dx = smooth(self.sm_lrhip_dx, lrhip_dx, 0.35)
-        self.sm_dorsi = smooth(self.sm_dorsi, dorsi_angle, 0.35)
         
         # --- Rep Counting Logic ---
+        now = time.time() if now is None else now
         progress = 0.0
         feedback_msg = ""
         
@@ -286,44 +306,14 @@ class GluteFlyTrainer:
             
             self.sm_progress = smooth(self.sm_progress, progress, 0.4)
             
-            # Rep hysteresis
-            if (self.sm_progress or 0) >= self.KNEE_UP_THRESHOLD and self.direction == 0:
-                self.direction = 1
-            if (self.sm_progress or 0) <= self.KNEE_DOWN_THRESHOLD and self.direction == 1:
-                self.direction = 0
+            # Lift up and back down by at least REP_PROMINENCE
+            rep = self._rep_counter().update(progress, now)
+            if rep is not None:
                 self.reps += 1
                 feedback_msg = f"Good! Rep {self.reps}"
 
-        # --- Form Checks ---
-        warnings = []
-        # Pelvis stability (X-axis)
-        if self.baseline['pelvis_x']:
-            x_shift = abs((self.sm_pelvis_x or pelvis_x) - self.baseline['pelvis_x'])
-            if x_shift > self.PELVIS_MAX_X_SHIFT_FRAC * w:
-                self.vio['pelvis_shift'] += 1
-                if self.vio['pelvis_shift'] > self.VIOLATION_PERSIST_FRAMES:
-                    warnings.append("Keep hips stable! Don't rock forward/back.")
-            else:
-                self.vio['pelvis_shift'] = max(0, self.vio['pelvis_shift'] - 1)
-
-        # Hip Roll (Relative Hip Spread)
-        if self.baseline['lrhip_dx']:
-            roll_diff = abs((self.sm_lrhip_dx or lrhip_dx) - self.baseline['lrhip_dx'])
-            if roll_diff > self.HIP_ROLL_MAX_DIFF_FRAC * w:
-                self.vio['hip_roll'] += 1
-                if self.vio['hip_roll'] > self.VIOLATION_PERSIST_FRAMES:
-                    warnings.append("Don't let pelvis roll back!")
-            else:
-                self.vio['hip_roll'] = max(0, self.vio['hip_roll'] - 1)
-
-        # Dorsiflexion
-        if self.sm_dorsi:
-            if not (self.DORSI_MIN <= self.sm_dorsi <= self.DORSI_MAX):
-                self.vio['dorsi'] += 1
-                if self.vio['dorsi'] > self.VIOLATION_PERSIST_FRAMES:
-                    warnings.append("Keep ankle bent (toes to shin)")
-            else:
-                self.vio['dorsi'] = max(0, self.vio['dorsi'] - 1)
+        # --- Form Checks --- (pelvis shift, hip roll, dorsiflexion; see form_rules)
+        warnings = self._form_checker().update(results, w, h, now=now)
         
         # Priority Feedback Selection
         final_feedback = feedback_msg
@@ -332,7 +322,7 @@ class GluteFlyTrainer:
             final_feedback = warnings[0] # Prioritize first warning
         elif not final_feedback:
             # Default state message if no rep event and no warning
-            if self.direction == 1:
+            if (self.sm_progress or 0) >= self.KNEE_UP_THRESHOLD:
                 final_feedback = "Hold top position..."
             else:
                 final_feedback = "Lift knee slowly..."
@@ -341,13 +331,20 @@ class GluteFlyTrainer:
             "reps": self.reps,
             "feedback": final_feedback,
             "angles": {
-                "dorsi": int(self.sm_dorsi or 0),
-                "lift": int((self.sm_progress or 0) * 100)
+                "dorsi": int(self.form.value("dorsiflexion") or 0),
+                "lift": int((self.sm_progress or 0) * 100),
+                **self._last_rep_metrics()
             },
             "progress": float(self.sm_progress or 0),
             "instruction": "Keep pelvis still"
         }
 
+    def _last_rep_metrics(self):
+        last = self.rep_detector.last_rep if self.rep_detector is not None else None
+        if last is None:
+            return {}
+        return {"rom": int(last.range_of_motion * 100), "tempo": round(last.duration, 1)}
+
 if __name__ == "__main__":
     # Simple test if run directly
     print("Testing GluteFlyTrainer...")
@@ -0,0 +1,85 @@
+# Hamstring Medial Bridge Trainer (Rehab Exercise)
+# Run: python -m src.backend.exercises.hamstring_medial_bridge_trainer
+
+from typing import Optional
+
+from src.backend.core.form_rules import FormChecker, FormRule
+from src.backend.exercises.base_trainer import SIDES, BaseTrainer, fraction
+
+LEFT, RIGHT = SIDES['left'], SIDES['right']
+
+
+class HamstringMedialBridgeTrainer(BaseTrainer):
+	NAME = "HamstringMedialBridgeTrainer"
+	TITLE = "Hamstring Medial Bridge Trainer"
+	VOICE_TYPE = 'bridge'
+	LANDMARKS = (
+		"LEFT_SHOULDER", "RIGHT_SHOULDER", "LEFT_HIP", "RIGHT_HIP",
+		"LEFT_KNEE", "RIGHT_KNEE", "LEFT_ANKLE", "RIGHT_ANKLE",
+	)
+	GUIDE = (
+		"Hamstring bridge start karne se pehle sahi posture set karo.",
+		"Peeth ke bal let jao, knees thode bent.",
+		"Heels ko ground par dabao, toes thode bahar.",
+		"Hips ko upar uthao jab tak body seedhi line na bane.",
+	)
+	GUIDANCE = "Heels se push karo, inner hamstring feel karo."
+	READY_MESSAGE = "Setup verified! Start bridges"
+	SETUP_MESSAGE = "Hamstring Medial Bridge - Lie on back, lift hips"
+	IDLE_MESSAGE = "Hamstring Medial Bridge - Focus on inner hamstring tension"
+
+	def __init__(self, use_enhanced_processor: bool = True) -> None:
+		super().__init__(use_enhanced_processor)
+		self.hip_down_angle = 140.0   # hips on the floor
+		self.hip_up_angle = 165.0     # hips lifted in line with shoulders and knees
+		self.knee_max_angle = 165.0   # knees stay a little bent
+		self.form: Optional[FormChecker] = None  # compiled per side, see form_rules()
+
+	def form_rules(self) -> list:
+		"""Form corrections; they share one feedback cooldown"""
+		shared = dict(cooldown=self.feedback_cooldown, cooldown_group="form")
+		return [
+			FormRule("knee_bend", "Knees thoda bend rakho - hamstring par focus", metric="angle",
+			         points=("HIP", "KNEE", "ANKLE"), max=self.knee_max_angle, persist_frames=3, **shared),
+			FormRule("hips_level", "Hips level rakho, ek side mat girao", metric="distance",
+			         points=("LEFT_HIP", "RIGHT_HIP"), axis="y", scale="height", max=0.05, **shared),
+		]
+
+	def check_setup(self, results, w: int, h: int) -> bool:
+		"""Lying down: shoulders and hips at about the same height"""
+		shoulder_y = self.mid_y(LEFT['SHOULDER'], RIGHT['SHOULDER'])
+		hip_y = self.mid_y(LEFT['HIP'], RIGHT['HIP'])
+		if abs(shoulder_y - hip_y) / h > 0.2:
+			self.say("Peeth ke bal let jao, knees bent.", 1.2)
+			return False
+		return True
+
+	def compute_hip_angle(self, side: str) -> Optional[float]:
+		"""Compute hip angle (shoulder-hip-knee)"""
+		s = SIDES[side]
+		return self.angle(s['SHOULDER'], s['HIP'], s['KNEE'])
+
+	def analyze(self, results, w: int, h: int, side: str) -> Optional[float]:
+		hip_angle = self.compute_hip_angle(side)
+		if hip_angle is None:
+			return None
+
+		if self.form is None or self.form.compiled.side != side:
+			self.form = FormChecker(self.form_rules(), side)
+		for message in self.form.update(results, w, h, now=self.now):
+			self.correct(message)
+
+		# Hips down first, rep completes at the top of the bridge
+		self.count_hysteresis(hip_angle, self.hip_down_angle, self.hip_up_angle, "Hips upar uthao, heels se push karo")
+
+		self.angles["hip"] = round(hip_angle, 1)
+		return fraction(hip_angle, self.hip_down_angle, self.hip_up_angle)
+
+
+def main() -> None:
+	trainer = HamstringMedialBridgeTrainer()
+	trainer.run()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,95 @@
+# Knee Drop Trainer (Rehab Exercise)
+# Run: python -m src.backend.exercises.knee_drop_trainer
+
+from typing import Optional
+
+from src.backend.core.rep_detector import Rep, RepDetector
+from src.backend.exercises.base_trainer import SIDES, BaseTrainer, angle_xy, fraction
+
+LEFT, RIGHT = SIDES['left'], SIDES['right']
+
+
+class KneeDropTrainer(BaseTrainer):
+	NAME = "KneeDropTrainer"
+	TITLE = "Knee Drop Trainer"
+	VOICE_TYPE = 'knee_drop'
+	LANDMARKS = ("LEFT_HIP", "RIGHT_HIP", "LEFT_KNEE", "RIGHT_KNEE")
+	GUIDE = (
+		"Knee drop start karne se pehle sahi posture set karo.",
+		"Sideline position mein let jao, knees bent aur ek ke upar ek.",
+		"Feet saath rakho, sirf upar wala knee kholo.",
+		"Knee ko dheere se neeche lao - teen tak count karo.",
+	)
+	GUIDANCE = "Down phase slow rakho, pelvis stable."
+	READY_MESSAGE = "Setup verified! Start knee drops"
+	SETUP_MESSAGE = "Knee Drop - Position yourself in sideline position"
+	IDLE_MESSAGE = "Knee Drop - Focus on slow, controlled down phase"
+
+	def __init__(self, use_enhanced_processor: bool = True) -> None:
+		super().__init__(use_enhanced_processor)
+		self.closed_angle = 10.0   # knees together
+		self.open_angle = 45.0     # target opening (progress bar)
+		self.max_open_angle = 70.0   # past this the hip is being forced
+		self.rep_prominence = 20.0   # degrees a rep must open and close again
+		self.min_drop_seconds = 2.0  # the down phase should take at least this long
+		self.rep_detector: Optional[RepDetector] = None  # created on first frame, see count_rep()
+
+	def check_setup(self, results, w: int, h: int) -> bool:
+		"""Knees start together (stacked)"""
+		opening = self.compute_opening()
+		if opening is not None and opening > self.open_angle:
+			self.say("Knees ko saath lao, ek ke upar ek.", 1.2)
+			return False
+		return True
+
+	def compute_opening(self) -> Optional[float]:
+		"""Angle between the thighs, at the midpoint of the hips"""
+		points = (LEFT['HIP'], RIGHT['HIP'], LEFT['KNEE'], RIGHT['KNEE'])
+		if not all(self.confident[i] for i in points):
+			return None
+		x, y = self.x, self.y
+		hip_x = (x[LEFT['HIP']] + x[RIGHT['HIP']]) / 2.0
+		hip_y = self.mid_y(LEFT['HIP'], RIGHT['HIP'])
+		return angle_xy(x[LEFT['KNEE']], y[LEFT['KNEE']], hip_x, hip_y, x[RIGHT['KNEE']], y[RIGHT['KNEE']])
+
+	def count_rep(self, opening: float, now: float) -> Optional[Rep]:
+		"""Feed the thigh opening to the rep detector; returns the rep it completed"""
+		if self.rep_detector is None:
+			self.rep_detector = RepDetector(self.rep_prominence, start="valley")
+		rep = self.rep_detector.update(opening, now)
+		if rep is not None:
+			self.reps += 1
+		return rep
+
+	def analyze(self, results, w: int, h: int, side: str) -> Optional[float]:
+		opening = self.compute_opening()
+		if opening is None:
+			return None
+
+		if self.feedback_ready() and opening > self.max_open_angle:
+			self.correct("Itna hi kaafi hai - force mat karo")
+
+		rep = self.count_rep(opening, self.now)
+		if rep is not None:
+			if rep.eccentric_seconds < self.min_drop_seconds:
+				self.messages.append(f"Rep {self.reps} complete - drop slower, count to three")
+			else:
+				self.messages.append(f"Rep {self.reps} complete! Shabash!")
+			self.say(f"Rep {self.reps} complete. Shabash!", 1.5)
+
+		angles = self.angles
+		angles["opening"] = round(opening, 1)
+		last = self.rep_detector.last_rep
+		if last is not None:
+			angles["rom"] = round(last.range_of_motion, 1)
+			angles["tempo"] = round(last.eccentric_seconds, 1)
+		return fraction(opening, self.closed_angle, self.open_angle)
+
+
+def main() -> None:
+	trainer = KneeDropTrainer()
+	trainer.run()
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,80 @@
+# Quad Stretch Trainer (Rehab Exercise)
+# Run: python -m src.backend.exercises.quad_stretch_trainer
+
+from typing import Optional
+
+from src.backend.core.rep_detector import Rep, RepDetector
+from src.backend.exercises.base_trainer import SIDES, BaseTrainer, fraction
+
+
+class QuadStretchTrainer(BaseTrainer):
+	NAME = "QuadStretchTrainer"
+	TITLE = "Quad Stretch Trainer"
+	VOICE_TYPE = 'quad_stretch'
+	LANDMARKS = ("LEFT_HIP", "LEFT_KNEE", "LEFT_ANKLE", "RIGHT_HIP", "RIGHT_KNEE", "RIGHT_ANKLE")
+	GUIDE = (
+		"Quad stretch start karne se pehle sahi posture set karo.",
+		"Peeth ke bal let jao, knee bent.",
+		"Leg ko dheere se seedha karo, jitna aaram se ho sake.",
+		"Force mat karo, apni range mein kaam karo.",
+	)
+	GUIDANCE = "Dheere se extend karo, pain mein mat jao."
+	READY_MESSAGE = "Setup verified! Start extending"
+	SETUP_MESSAGE = "Quad Stretch - Lie on back, extend leg gently"
+	IDLE_MESSAGE = "Quad Stretch - Work within available range, don't force"
+
+	def __init__(self, use_enhanced_processor: bool = True) -> None:
+		super().__init__(use_enhanced_processor)
+		self.knee_bent_angle = 90.0   # start position
+		self.knee_straight_angle = 170.0   # full extension (progress bar)
+		self.rep_prominence = 25.0   # degrees a rep must extend and bend back
+		self.min_rep_seconds = 3.0   # faster than this is forcing the stretch
+		self.best_extension = 0.0   # largest knee angle reached this session
+		self.rep_detector: Optional[RepDetector] = None  # created on first frame, see count_rep()
+
+	def compute_knee_angle(self, side: str) -> Optional[float]:
+		"""Compute knee angle (hip-knee-ankle)"""
+		s = SIDES[side]
+		return self.angle(s['HIP'], s['KNEE'], s['ANKLE'])
+
+	def count_rep(self, knee_angle: float, now: float) -> Optional[Rep]:
+		"""Feed the knee angle to the rep detector; returns the rep it completed"""
+		if self.rep_detector is None:
+			self.rep_detector = RepDetector(self.rep_prominence, start="valley")
+		rep = self.rep_detector.update(knee_angle, now)
+		if rep is not None:
+			self.reps += 1
+		return rep
+
+	def analyze(self, results, w: int, h: int, side: str) -> Optional[float]:
+		knee_angle = self.compute_knee_angle(side)
+		if knee_angle is None:
+			return None
+
+		rep = self.count_rep(knee_angle, self.now)
+		if rep is not None:
+			self.best_extension = max(self.best_extension, rep.turn_value)
+			if rep.duration < self.min_rep_seconds:
+				self.messages.append(f"Rep {self.reps} complete - dheere karo, stretch ko force mat karo")
+			else:
+				self.messages.append(f"Rep {self.reps} complete! Shabash!")
+			self.say(f"Rep {self.reps} complete. Shabash!", 1.5)
+
+		angles = self.angles
+		angles["knee"] = round(knee_angle, 1)
+		if self.best_extension:
+			angles["best"] = round(self.best_extension, 1)
+		last = self.rep_detector.last_rep
+		if last is not None:
+			angles["rom"] = round(last.range_of_motion, 1)
+			angles["tempo"] = round(last.duration, 1)
+		return fraction(knee_angle, self.knee_bent_angle, self.knee_straight_angle)
+
+
+def main() -> None:
+	trainer = QuadStretchTrainer()
+	trainer.run()
+
+
+if __name__ == "__main__":
+	main()
@@ -56,11 +56,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Has-More"],
 )
 
 # Import routers
 try:
-    from src.backend.api import auth, routes, bookings
+    from src.backend.api import auth, routes, bookings, videos
     from src.backend.api import websocket as ws
 except ImportError:
     # Fallback for direct execution
@@ -69,13 +70,14 @@ except ImportError:
 
     root = Path(__file__).parent.parent.parent
     sys.path.insert(0, str(root))
-    from src.backend.api import auth, routes, bookings
+    from src.backend.api import auth, routes, bookings, videos
     from src.backend.api import websocket as ws
 
 # Register routes
 app.include_router(auth.router, prefix="/api")
 app.include_router(routes.router, prefix="/api")
 app.include_router(bookings.router)
+app.include_router(videos.router, prefix="/api")
 app.include_router(ws.router)
 
 
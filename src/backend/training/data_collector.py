@@ -1,20 +1,157 @@
 """
 Data Collection Module for Glute Fly AI Trainer
 Collects pose landmarks and automatically labels them based on posture rules
+
+Two output modes:
+- "binary" (default): frames go into a preallocated NumPy ring buffer on the
+  capture thread; full blocks are written as compressed .npz chunks by a
+  writer thread, so collecting costs no frame rate.
+- "csv": the original one-row-per-frame CSV file.
+
+Binary sessions can be turned into the CSV format with export_csv()
+(python data_collector.py --to-csv data/<session_id>).
 """
 
+import argparse
 import csv
+import json
+import queue
+import threading
 import time
 import os
 from datetime import datetime
 import numpy as np
 
+NUM_LANDMARKS = 33
+LANDMARK_COLUMNS = [f"{axis}{i}" for i in range(NUM_LANDMARKS) for axis in ("x", "y", "z")]
+NUMERIC_METRICS = ["hip_angle", "dorsi_angle", "progress", "rep_count"]
+STATUS_METRICS = [
+    "heels_position", "achilles_touch", "back_arch",
+    "hip_stability", "hip_rotation", "range_status"
+]
+# String columns stored as integer codes into the session vocabulary
+CODED_COLUMNS = ["side", "label"] + STATUS_METRICS
+
+BLOCK_FRAMES = 256  # frames per chunk file
+RING_BLOCKS = 4     # blocks in the ring; the capture thread drops frames if all are waiting on disk
+SESSION_META_FILE = "session.json"
+
+
+def create_csv_header():
+    """CSV header with all landmark coordinates"""
+    return ["timestamp", "frame_number", "side", "label"] + LANDMARK_COLUMNS + NUMERIC_METRICS + STATUS_METRICS
+
+
+class BinarySessionWriter:
+    """
+    Ring buffer of RING_BLOCKS x BLOCK_FRAMES preallocated rows. The capture
+    thread only fills rows; a writer thread compresses each full block to
+    chunk_NNNNN.npz and hands the block back.
+    """
+
+    def __init__(self, session_dir, block_frames=BLOCK_FRAMES, ring_blocks=RING_BLOCKS):
+        self.session_dir = session_dir
+        self.block_frames = block_frames
+        self.timestamps = np.zeros((ring_blocks, block_frames), dtype=np.float64)
+        self.frame_numbers = np.zeros((ring_blocks, block_frames), dtype=np.int64)
+        self.landmarks = np.zeros((ring_blocks, block_frames, NUM_LANDMARKS * 3), dtype=np.float32)
+        self.metrics = np.zeros((ring_blocks, block_frames, len(NUMERIC_METRICS)), dtype=np.float32)
+        self.codes = np.zeros((ring_blocks, block_frames, len(CODED_COLUMNS)), dtype=np.int16)
+        self.vocabulary = {}  # string -> code, shared by all coded columns
+
+        self.chunks = []
+        self.frames_dropped = 0
+        self._free = queue.Queue()
+        for block in range(ring_blocks):
+            self._free.put(block)
+        self._full = queue.Queue()
+        self._block = self._free.get()
+        self._row = 0
+        self._chunk_index = 0
+
+        self._thread = threading.Thread(target=self._write_loop, name="data-collector", daemon=True)
+        self._thread.start()
+
+    def code(self, value):
+        value = str(value)
+        code = self.vocabulary.get(value)
+        if code is None:
+            code = self.vocabulary[value] = len(self.vocabulary)
+        return code
+
+    def append(self, timestamp, frame_number, landmarks, metrics, codes):
+        """Store one frame; never waits on the disk"""
+        if self._block is None:
+            try:
+                self._block = self._free.get_nowait()
+            except queue.Empty:
+                self.frames_dropped += 1
+                return False
+        b, r = self._block, self._row
+        self.timestamps[b, r] = timestamp
+        self.frame_numbers[b, r] = frame_number
+        self.landmarks[b, r] = landmarks
+        self.metrics[b, r] = metrics
+        self.codes[b, r] = codes
+        self._row += 1
+        if self._row == self.block_frames:
+            self._submit()
+        return True
+
+    def _submit(self):
+        if self._block is None or self._row == 0:
+            return
+        self._full.put((self._block, self._row, self._chunk_index))
+        self._chunk_index += 1
+        self._row = 0
+        try:
+            self._block = self._free.get_nowait()
+        except queue.Empty:
+            self._block = None
+
+    def _write_loop(self):
+        while True:
+            item = self._full.get()
+            if item is None:
+                break
+            block, rows, index = item
+            name = f"chunk_{index:05d}.npz"
+            try:
+                np.savez_compressed(
+                    os.path.join(self.session_dir, name),
+                    timestamp=self.timestamps[block, :rows],
+                    frame_number=self.frame_numbers[block, :rows],
+                    landmarks=self.landmarks[block, :rows],
+                    metrics=self.metrics[block, :rows],
+                    codes=self.codes[block, :rows],
+                )
+                self.chunks.append({"file": name, "frames": rows})
+            except Exception as e:
+                print(f"❌ Error writing {name}: {e}")
+            finally:
+                self._free.put(block)
+
+    def close(self):
+        """Flush the partial block and wait for all chunks to hit the disk"""
+        self._submit()
+        self._full.put(None)
+        self._thread.join()
+        self.chunks.sort(key=lambda c: c["file"])
+        return self.chunks
+
+
 class DataCollector:
-    def __init__(self, output_dir="data"):
+    def __init__(self, output_dir="data", mode="binary"):
+        if mode not in ("binary", "csv"):
+            raise ValueError(f"Unknown collection mode: {mode}")
         self.output_dir = output_dir
+        self.mode = mode
         self.csv_file = None
         self.writer = None
+        self.binary_writer = None
         self.session_id = None
+        self.session_path = None
+        self.session_started_at = None
         self.frame_count = 0
         
         # Create output directory if it doesn't exist
@@ -24,7 +161,18 @@ class DataCollector:
         """Start a new data collection session"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.session_id = f"glute_fly_{side}_{timestamp}"
+        self.session_started_at = datetime.now().isoformat()
+        self.frame_count = 0
+
+        if self.mode == "binary":
+            self.session_path = os.path.join(self.output_dir, self.session_id)
+            os.makedirs(self.session_path, exist_ok=True)
+            self.binary_writer = BinarySessionWriter(self.session_path)
+            print(f"📊 Data collection started: {self.session_path}")
+            return self.session_path
+
         csv_filename = os.path.join(self.output_dir, f"{self.session_id}.csv")
+        self.session_path = csv_filename
         
         self.csv_file = open(csv_filename, 'w', newline='')
         self.writer = csv.writer(self.csv_file)
@@ -38,23 +186,13 @@ class DataCollector:
         
     def _create_header(self):
         """Create CSV header with all landmark coordinates"""
-        header = ["timestamp", "frame_number", "side", "label"]
-        
-        # Add all 33 MediaPipe landmarks (x, y, z coordinates)
-        for i in range(33):
-            header.extend([f"x{i}", f"y{i}", f"z{i}"])
-            
-        # Add calculated metrics
-        header.extend([
-            "hip_angle", "dorsi_angle", "progress", "rep_count",
-            "heels_position", "achilles_touch", "back_arch", 
-            "hip_stability", "hip_rotation", "range_status"
-        ])
-        
-        return header
+        return create_csv_header()
         
     def collect_frame(self, results, side, label, metrics):
         """Collect data for current frame"""
+        if self.binary_writer:
+            self._collect_frame_binary(results, side, label, metrics)
+            return
         if not self.writer:
             return
             
@@ -96,23 +234,142 @@ class DataCollector:
         
         self.writer.writerow(row)
         self.frame_count += 1
+
+    def _collect_frame_binary(self, results, side, label, metrics):
+        w = self.binary_writer
+        if results.pose_landmarks:
+            landmarks = [c for lm in results.pose_landmarks.landmark for c in (lm.x, lm.y, lm.z)]
+        else:
+            landmarks = 0.0  # broadcast: same zero fill as the CSV mode
+        numeric = [metrics.get(name, 0) for name in NUMERIC_METRICS]
+        codes = [w.code(side), w.code(label)] + [w.code(metrics.get(name, 'unknown')) for name in STATUS_METRICS]
+        w.append(time.time(), self.frame_count, landmarks, numeric, codes)
+        self.frame_count += 1
         
     def stop_session(self):
         """Stop data collection session"""
-        if self.csv_file:
+        if self.binary_writer:
+            writer, self.binary_writer = self.binary_writer, None
+            chunks = writer.close()
+            self._write_session_meta(writer, chunks)
+            dropped = f" ({writer.frames_dropped} dropped)" if writer.frames_dropped else ""
+            print(f"📊 Data collection stopped. Total frames: {self.frame_count}{dropped}")
+        elif self.csv_file:
             self.csv_file.close()
+            self.csv_file = None
+            self.writer = None
             print(f"📊 Data collection stopped. Total frames: {self.frame_count}")
+
+    def _write_session_meta(self, writer, chunks):
+        vocabulary = [None] * len(writer.vocabulary)
+        for value, code in writer.vocabulary.items():
+            vocabulary[code] = value
+        meta = {
+            "session_id": self.session_id,
+            "started_at": self.session_started_at,
+            "landmark_columns": LANDMARK_COLUMNS,
+            "numeric_columns": NUMERIC_METRICS,
+            "coded_columns": CODED_COLUMNS,
+            "vocabulary": vocabulary,
+            "chunks": chunks,
+            "frames": sum(c["frames"] for c in chunks),
+            "frames_dropped": writer.frames_dropped,
+        }
+        with open(os.path.join(self.session_path, SESSION_META_FILE), "w") as f:
+            json.dump(meta, f, indent=2)
             
     def get_session_stats(self):
         """Get statistics for current session"""
+        if self.mode == "binary":
+            output = self.session_id
+        else:
+            output = f"{self.session_id}.csv" if self.session_id else None
         return {
             'session_id': self.session_id,
             'frame_count': self.frame_count,
-            'output_file': f"{self.session_id}.csv" if self.session_id else None
+            'output_file': output if self.session_id else None
+        }
+
+
+def is_binary_session(path):
+    return os.path.isfile(os.path.join(path, SESSION_META_FILE))
+
+
+def read_session_meta(session_dir):
+    with open(os.path.join(session_dir, SESSION_META_FILE)) as f:
+        return json.load(f)
+
+
+def iter_session_chunks(session_dir):
+    """Yield (meta, chunk arrays) for each chunk of a binary session"""
+    meta = read_session_meta(session_dir)
+    for chunk in meta["chunks"]:
+        with np.load(os.path.join(session_dir, chunk["file"])) as data:
+            yield meta, {key: data[key] for key in data.files}
+
+
+def export_csv(session_dir, csv_path=None):
+    """Convert a binary session into the CSV format the collector used to write"""
+    if csv_path is None:
+        csv_path = session_dir.rstrip(os.sep) + ".csv"
+    rows = 0
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(create_csv_header())
+        for meta, chunk in iter_session_chunks(session_dir):
+            vocabulary = meta["vocabulary"]
+            for i in range(len(chunk["timestamp"])):
+                codes = [vocabulary[c] for c in chunk["codes"][i]]
+                timestamp = datetime.fromtimestamp(chunk["timestamp"][i]).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+                metrics = chunk["metrics"][i].tolist()
+                metrics[3] = int(metrics[3])  # rep_count
+                writer.writerow(
+                    [timestamp, int(chunk["frame_number"][i]), codes[0], codes[1]]
+                    + chunk["landmarks"][i].tolist()
+                    + metrics
+                    + codes[2:]
+                )
+                rows += 1
+    print(f"📄 Exported {rows} frames to {csv_path}")
+    return csv_path
+
+
+def load_session_dataframe(session_dir):
+    """Binary session as a DataFrame with the same columns as the CSV export"""
+    import pandas as pd
+
+    frames = []
+    for meta, chunk in iter_session_chunks(session_dir):
+        vocabulary = np.array(meta["vocabulary"], dtype=object)
+        columns = {
+            "timestamp": pd.to_datetime(chunk["timestamp"], unit="s"),
+            "frame_number": chunk["frame_number"],
         }
+        for j, name in enumerate(CODED_COLUMNS[:2]):
+            columns[name] = vocabulary[chunk["codes"][:, j]]
+        df = pd.DataFrame(columns)
+        df = pd.concat([
+            df,
+            pd.DataFrame(chunk["landmarks"], columns=LANDMARK_COLUMNS),
+            pd.DataFrame(chunk["metrics"], columns=NUMERIC_METRICS),
+            pd.DataFrame({name: vocabulary[chunk["codes"][:, j + 2]] for j, name in enumerate(STATUS_METRICS)}),
+        ], axis=1)
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame(columns=create_csv_header())
+    return pd.concat(frames, ignore_index=True)
+
 
 # Example usage:
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Glute fly data collection tools")
+    parser.add_argument("--to-csv", metavar="SESSION_DIR", help="Convert a binary session to CSV")
+    parser.add_argument("--output", help="CSV path (default: <SESSION_DIR>.csv)")
+    args = parser.parse_args()
+    if args.to_csv:
+        export_csv(args.to_csv, args.output)
+        raise SystemExit(0)
+
     collector = DataCollector()
     collector.start_session('left')
     
@@ -0,0 +1,292 @@
+"""
+Dataset Store for Glute Fly AI Trainer
+Consolidates collected sessions (CSV files and binary collector sessions)
+into one float32 feature matrix on disk that training memory-maps and
+reads in mini-batches.
+
+Layout of the cache directory (default: data/.dataset_cache):
+- features.f32: raw float32 rows of the 99 landmark columns
+- labels.i32: int32 label codes, one per row
+- manifest.json: row count, label vocabulary and, per source file, its
+  sha256 and the row range it occupies
+
+Syncing only ingests sources that aren't in the manifest yet. If an
+ingested source changed or disappeared, the store is rebuilt.
+"""
+
+import csv
+import hashlib
+import json
+import os
+
+import numpy as np
+
+try:
+    from .data_collector import LANDMARK_COLUMNS, is_binary_session, iter_session_chunks, read_session_meta
+except ImportError:
+    # Run as a script from the training directory
+    from data_collector import LANDMARK_COLUMNS, is_binary_session, iter_session_chunks, read_session_meta
+
+STORE_VERSION = 1
+FEATURES_FILE = "features.f32"
+LABELS_FILE = "labels.i32"
+MANIFEST_FILE = "manifest.json"
+DEFAULT_CACHE_DIR = ".dataset_cache"
+INGEST_BLOCK_ROWS = 4096  # CSV rows parsed per block while ingesting
+NUM_FEATURES = len(LANDMARK_COLUMNS)
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_stat(path):
+    """(size, mtime) used to skip re-hashing sources that weren't touched"""
+    if is_binary_session(path):
+        path = os.path.join(path, "session.json")
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime
+
+
+def source_sha256(path):
+    """Content hash of a CSV file, or of all files of a binary session"""
+    if not is_binary_session(path):
+        return file_sha256(path)
+    files = ["session.json"] + [c["file"] for c in read_session_meta(path)["chunks"]]
+    digest = hashlib.sha256()
+    for name in files:
+        digest.update(file_sha256(os.path.join(path, name)).encode())
+    return digest.hexdigest()
+
+
+class DatasetStore:
+    def __init__(self, data_dir="data", cache_dir=None):
+        self.data_dir = data_dir
+        self.cache_dir = cache_dir or os.path.join(data_dir, DEFAULT_CACHE_DIR)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.manifest = self._load_manifest()
+
+    # --- manifest -------------------------------------------------------
+
+    def _path(self, name):
+        return os.path.join(self.cache_dir, name)
+
+    def _empty_manifest(self):
+        return {
+            "version": STORE_VERSION,
+            "feature_columns": LANDMARK_COLUMNS,
+            "rows": 0,
+            "labels": [],
+            "sources": {},
+        }
+
+    def _load_manifest(self):
+        try:
+            with open(self._path(MANIFEST_FILE)) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return self._reset()
+        if manifest.get("version") != STORE_VERSION or manifest.get("feature_columns") != LANDMARK_COLUMNS:
+            return self._reset()
+        # Rows appended after the last manifest write (interrupted sync) are discarded
+        rows = manifest["rows"]
+        for name, itemsize in ((FEATURES_FILE, 4 * NUM_FEATURES), (LABELS_FILE, 4)):
+            path = self._path(name)
+            if not os.path.exists(path) or os.path.getsize(path) < rows * itemsize:
+                return self._reset()
+            with open(path, "r+b") as f:
+                f.truncate(rows * itemsize)
+        return manifest
+
+    def _save_manifest(self):
+        tmp = self._path(MANIFEST_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, self._path(MANIFEST_FILE))
+
+    def _reset(self):
+        for name in (FEATURES_FILE, LABELS_FILE):
+            open(self._path(name), "wb").close()
+        self.manifest = self._empty_manifest()
+        self._save_manifest()
+        return self.manifest
+
+    # --- ingest ---------------------------------------------------------
+
+    def list_sources(self):
+        sources = []
+        for name in sorted(os.listdir(self.data_dir)):
+            path = os.path.join(self.data_dir, name)
+            if os.path.abspath(path) == os.path.abspath(self.cache_dir):
+                continue
+            if name.endswith(".csv") or is_binary_session(path):
+                sources.append(name)
+        return sources
+
+    def sync(self):
+        """Ingest new sources (rebuilding if an ingested one changed); returns rows added"""
+        sources = self.list_sources()
+        known = self.manifest["sources"]
+        fingerprints = {}
+        stale = [name for name in known if name not in sources]
+        for name in sources:
+            path = os.path.join(self.data_dir, name)
+            size, mtime = source_stat(path)
+            entry = known.get(name)
+            if entry and entry["size"] == size and entry["mtime"] == mtime:
+                continue  # unchanged, skip hashing
+            sha = source_sha256(path)
+            fingerprints[name] = (size, mtime, sha)
+            if entry and entry["sha256"] != sha:
+                stale.append(name)
+            elif entry:
+                # Touched but identical content: just refresh the stat info
+                entry["size"], entry["mtime"] = size, mtime
+
+        if stale:
+            print(f"♻️  {len(stale)} source(s) changed or removed, rebuilding dataset store")
+            self._reset()
+            known = self.manifest["sources"]
+
+        added = 0
+        label_codes = {label: i for i, label in enumerate(self.manifest["labels"])}
+        with open(self._path(FEATURES_FILE), "ab") as features, open(self._path(LABELS_FILE), "ab") as labels:
+            for name in sources:
+                if name in known:
+                    continue
+                path = os.path.join(self.data_dir, name)
+                if name in fingerprints:
+                    size, mtime, sha = fingerprints[name]
+                else:
+                    size, mtime = source_stat(path)
+                    sha = source_sha256(path)
+                start = self.manifest["rows"]
+                known_labels = len(self.manifest["labels"])
+                rows = 0
+                try:
+                    for X, y in self._read_source(path):
+                        codes = np.empty(len(y), dtype=np.int32)
+                        for i, label in enumerate(y):
+                            code = label_codes.get(label)
+                            if code is None:
+                                code = label_codes[label] = len(label_codes)
+                                self.manifest["labels"].append(label)
+                            codes[i] = code
+                        features.write(np.ascontiguousarray(X, dtype="<f4").tobytes())
+                        labels.write(codes.astype("<i4").tobytes())
+                        rows += len(y)
+                    features.flush()
+                    labels.flush()
+                except Exception as e:
+                    # Drop this source's partial rows; the next sync retries it
+                    features.flush()
+                    labels.flush()
+                    features.truncate(start * 4 * NUM_FEATURES)
+                    labels.truncate(start * 4)
+                    for label in self.manifest["labels"][known_labels:]:
+                        del label_codes[label]
+                    del self.manifest["labels"][known_labels:]
+                    print(f"  ❌ Error ingesting {name}: {e}")
+                    continue
+                # Commit each source on its own so a bad file doesn't cost the others
+                known[name] = {"sha256": sha, "size": size, "mtime": mtime, "start": start, "rows": rows}
+                self.manifest["rows"] += rows
+                self._save_manifest()
+                added += rows
+                print(f"  ✅ Ingested {rows} rows from {name}")
+
+        self._save_manifest()
+        return added
+
+    def _read_source(self, path):
+        """Yield (float32 features, labels) blocks from one source without loading it whole"""
+        if is_binary_session(path):
+            for meta, chunk in iter_session_chunks(path):
+                label_col = meta["coded_columns"].index("label")
+                vocabulary = meta["vocabulary"]
+                yield chunk["landmarks"], [vocabulary[c] for c in chunk["codes"][:, label_col]]
+            return
+
+        with open(path, newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return
+            if "label" not in header:
+                raise ValueError(f"No 'label' column found in {path}")
+            columns = [header.index(c) for c in LANDMARK_COLUMNS if c in header]
+            if len(columns) != NUM_FEATURES:
+                raise ValueError(f"{path} is missing landmark columns")
+            label_idx = header.index("label")
+
+            block = np.empty((INGEST_BLOCK_ROWS, NUM_FEATURES), dtype=np.float32)
+            labels = []
+            for row in reader:
+                if not row:
+                    continue
+                block[len(labels)] = [row[c] for c in columns]
+                labels.append(row[label_idx])
+                if len(labels) == INGEST_BLOCK_ROWS:
+                    yield block, labels
+                    labels = []
+            if labels:
+                yield block[:len(labels)], labels
+
+    # --- reading --------------------------------------------------------
+
+    def __len__(self):
+        return self.manifest["rows"]
+
+    @property
+    def label_names(self):
+        return list(self.manifest["labels"])
+
+    def features(self):
+        """(rows, 99) float32 memory map"""
+        if not len(self):
+            return np.empty((0, NUM_FEATURES), dtype=np.float32)
+        return np.memmap(self._path(FEATURES_FILE), dtype="<f4", mode="r", shape=(len(self), NUM_FEATURES))
+
+    def labels(self):
+        """(rows,) int32 label codes into label_names"""
+        if not len(self):
+            return np.empty(0, dtype=np.int32)
+        return np.memmap(self._path(LABELS_FILE), dtype="<i4", mode="r", shape=(len(self),))
+
+    def split_indices(self, test_size=0.2, sources=None):
+        """
+        (train, holdout) row indices, optionally only for some sources.
+        Holdout membership is drawn per source from its content hash, so a
+        row stays in the same split across syncs, rebuilds and runs.
+        """
+        train, holdout = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+        for name, entry in self.manifest["sources"].items():
+            if sources is not None and name not in sources:
+                continue
+            rows = np.arange(entry["start"], entry["start"] + entry["rows"])
+            in_holdout = np.random.default_rng(int(entry["sha256"][:16], 16)).random(len(rows)) < test_size
+            train.append(rows[~in_holdout])
+            holdout.append(rows[in_holdout])
+        return np.concatenate(train), np.concatenate(holdout)
+
+    def iter_batches(self, batch_size=32, indices=None, shuffle=True, seed=None, transform=None):
+        """
+        Yield (X, y) mini-batches read from the memory map. Indices within a
+        batch are sorted so each read walks the file forward.
+        """
+        X, y = self.features(), self.labels()
+        if indices is None:
+            indices = np.arange(len(self))
+        indices = np.asarray(indices)
+        if shuffle:
+            indices = np.random.default_rng(seed).permutation(indices)
+        for start in range(0, len(indices), batch_size):
+            batch = np.sort(indices[start:start + batch_size])
+            X_batch = np.asarray(X[batch])
+            if transform is not None:
+                X_batch = transform(X_batch)
+            yield X_batch, np.asarray(y[batch])
@@ -10,9 +10,27 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 from sklearn.metrics import classification_report, confusion_matrix
 import joblib
+import json
 import os
 from datetime import datetime
 
+try:
+    from .data_collector import is_binary_session, load_session_dataframe
+    from .dataset_store import NUM_FEATURES, DatasetStore
+    from .numpy_predictor import NUMPY_MODEL_FILE, export_numpy_model
+    from .model_registry import ModelRegistry
+    from .temporal_features import WINDOW_FRAMES, session_windows, window_features
+except ImportError:
+    # Run as a script from the training directory
+    from data_collector import is_binary_session, load_session_dataframe
+    from dataset_store import NUM_FEATURES, DatasetStore
+    from numpy_predictor import NUMPY_MODEL_FILE, export_numpy_model
+    from model_registry import ModelRegistry
+    from temporal_features import WINDOW_FRAMES, session_windows, window_features
+
+FEATURES_FILE = "features.json"
+TRAINING_STATE_FILE = "training_state.json"
+
 class MLTrainer:
     def __init__(self, data_dir="data", model_dir="models"):
         self.data_dir = data_dir
@@ -20,17 +38,22 @@ class MLTrainer:
         self.model = None
         self.label_encoder = LabelEncoder()
         self.scaler = StandardScaler()
+        self.feature_window = 1  # > 1: temporal model on window_features
+        self.training_state = None  # store sources/holdout the model was trained on
         
         # Create model directory if it doesn't exist
         os.makedirs(model_dir, exist_ok=True)
         
     def load_training_data(self, csv_files=None):
         """
-        Load training data from CSV files
-        If csv_files is None, load all CSV files from data directory
+        Load training data from CSV files and binary collector sessions
+        If csv_files is None, load all of them from data directory
         """
         if csv_files is None:
-            csv_files = [f for f in os.listdir(self.data_dir) if f.endswith('.csv')]
+            csv_files = [
+                f for f in os.listdir(self.data_dir)
+                if f.endswith('.csv') or is_binary_session(os.path.join(self.data_dir, f))
+            ]
         
         if not csv_files:
             raise ValueError("No CSV files found for training")
@@ -41,7 +64,11 @@ class MLTrainer:
         for csv_file in csv_files:
             file_path = os.path.join(self.data_dir, csv_file)
             try:
-                df = pd.read_csv(file_path)
+                if is_binary_session(file_path):
+                    df = load_session_dataframe(file_path)
+                else:
+                    df = pd.read_csv(file_path)
+                df['source'] = csv_file
                 all_data.append(df)
                 print(f"  ✅ Loaded {len(df)} rows from {csv_file}")
             except Exception as e:
@@ -91,6 +118,33 @@ class MLTrainer:
         print(f"📊 Label distribution: {np.bincount(y_encoded)}")
         
         return X, y_encoded
+
+    def prepare_temporal_features(self, data, window=WINDOW_FRAMES, step=1):
+        """
+        Like prepare_features_and_labels, but one sample per sliding window
+        of `window` frames (see temporal_features.py). Windows stay inside
+        one source file; each takes the label of its last frame.
+        """
+        print(f"🔧 Preparing temporal features ({window}-frame windows)...")
+
+        landmark_columns = [f'{axis}{i}' for i in range(33) for axis in 'xyz']
+        missing_columns = [col for col in landmark_columns if col not in data.columns]
+        if missing_columns:
+            raise ValueError(f"Temporal features need all landmark columns, missing {missing_columns[:10]}")
+        if 'label' not in data.columns:
+            raise ValueError("No 'label' column found in data")
+
+        groups = data['source'].values if 'source' in data.columns else np.zeros(len(data))
+        X, y = session_windows(data[landmark_columns].values, data['label'].values, groups, window, step)
+        if not len(X):
+            raise ValueError(f"No session has at least {window} frames")
+
+        y_encoded = self.label_encoder.fit_transform(y)
+        print(f"📊 Feature shape: {X.shape}")
+        print(f"📊 Label classes: {self.label_encoder.classes_}")
+        print(f"📊 Label distribution: {np.bincount(y_encoded)}")
+
+        return X, y_encoded
         
     def create_model(self, input_shape, num_classes):
         """
@@ -116,8 +170,32 @@ class MLTrainer:
         
         print("✅ Model created successfully")
         return model
+
+    def create_temporal_model(self, input_shape, num_classes):
+        """
+        Smaller MLP for window features: the angles and velocities already
+        summarize the movement, so it needs far fewer weights than the
+        raw-landmark model
+        """
+        print("🏗️  Creating temporal TensorFlow model...")
+
+        model = tf.keras.Sequential([
+            tf.keras.layers.Dense(64, activation='relu', input_shape=(input_shape,)),
+            tf.keras.layers.Dropout(0.2),
+            tf.keras.layers.Dense(32, activation='relu'),
+            tf.keras.layers.Dense(num_classes, activation='softmax')
+        ])
+
+        model.compile(
+            optimizer='adam',
+            loss='sparse_categorical_crossentropy',
+            metrics=['accuracy']
+        )
+
+        print("✅ Model created successfully")
+        return model
         
-    def train_model(self, X, y, test_size=0.2, epochs=50, batch_size=32):
+    def train_model(self, X, y, test_size=0.2, epochs=50, batch_size=32, create_model=None):
         """
         Train the model on the provided data
         """
@@ -136,7 +214,9 @@ class MLTrainer:
         X_test_scaled = self.scaler.transform(X_test)
         
         # Create model
-        self.model = self.create_model(X_train.shape[1], len(np.unique(y)))
+        self.model = (create_model or self.create_model)(X_train.shape[1], len(np.unique(y)))
+        self.feature_window = 1
+        self.training_state = None
         
         # Train model
         history = self.model.fit(
@@ -160,6 +240,167 @@ class MLTrainer:
                                   target_names=self.label_encoder.classes_))
         
         return history
+
+    def train_temporal_model(self, data, window=WINDOW_FRAMES, step=1, test_size=0.2, epochs=50, batch_size=32):
+        """
+        Train a posture classifier on sliding-window features instead of
+        single raw frames (data as returned by load_training_data)
+        """
+        X, y = self.prepare_temporal_features(data, window, step)
+        history = self.train_model(X, y, test_size, epochs, batch_size, create_model=self.create_temporal_model)
+        self.feature_window = window
+        return history
+        
+    def load_dataset_store(self, sync=True):
+        """
+        Open the cached feature store for data_dir, ingesting any new
+        session files first (see dataset_store.py)
+        """
+        store = DatasetStore(self.data_dir)
+        if sync:
+            added = store.sync()
+            print(f"📊 Dataset store: {len(store)} rows ({added} new)")
+        if not len(store):
+            raise ValueError("No training data found in dataset store")
+        return store
+
+    def _store_dataset(self, store, indices, code_to_class, batch_size, shuffle):
+        """tf.data pipeline that streams scaled mini-batches from the store"""
+        def batches():
+            for X, y in store.iter_batches(batch_size, indices, shuffle=shuffle,
+                                           transform=self.scaler.transform):
+                yield X.astype(np.float32), code_to_class[y]
+
+        return tf.data.Dataset.from_generator(
+            batches,
+            output_signature=(
+                tf.TensorSpec(shape=(None, NUM_FEATURES), dtype=tf.float32),
+                tf.TensorSpec(shape=(None,), dtype=tf.int32),
+            ),
+        ).prefetch(2)
+
+    def train_from_store(self, store, test_size=0.2, epochs=50, batch_size=32):
+        """
+        Train like train_model, but stream mini-batches from a DatasetStore
+        instead of holding the whole dataset (and its scaled copy) in memory
+        """
+        print("🚀 Starting model training (streaming from dataset store)...")
+
+        # Store label codes -> encoded classes
+        self.label_encoder.fit(store.label_names)
+        code_to_class = self.label_encoder.transform(store.label_names).astype(np.int32)
+        # Fixed per-row holdout, so later incremental runs evaluate on the same rows
+        train_idx, test_idx = store.split_indices(test_size)
+        print(f"📊 Training set: {len(train_idx)} samples")
+        print(f"📊 Test set: {len(test_idx)} samples")
+
+        # Fit the scaler in one streaming pass over the training rows
+        self.scaler = StandardScaler()
+        self.feature_window = 1
+        for X_batch, _ in store.iter_batches(4096, train_idx, shuffle=False):
+            self.scaler.partial_fit(X_batch)
+
+        self.model = self.create_model(NUM_FEATURES, len(self.label_encoder.classes_))
+
+        train_ds = self._store_dataset(store, train_idx, code_to_class, batch_size, shuffle=True)
+        test_ds = self._store_dataset(store, test_idx, code_to_class, batch_size, shuffle=False)
+        history = self.model.fit(train_ds, validation_data=test_ds, epochs=epochs, verbose=1)
+
+        test_loss, test_accuracy = self.model.evaluate(test_ds, verbose=0)
+        print(f"📊 Test Accuracy: {test_accuracy:.4f}")
+        self.training_state = {
+            "test_size": test_size,
+            "sources": {name: entry["sha256"] for name, entry in store.manifest["sources"].items()},
+            "runs": [],
+        }
+        self._record_run(len(train_idx), len(test_idx), test_accuracy, incremental=False)
+
+        y_true, y_pred_classes = [], []
+        for X_batch, y_batch in test_ds:
+            y_true.append(y_batch.numpy())
+            y_pred_classes.append(np.argmax(self.model.predict(X_batch, verbose=0), axis=1))
+        print("\n📊 Classification Report:")
+        print(classification_report(np.concatenate(y_true), np.concatenate(y_pred_classes),
+                                    labels=np.arange(len(self.label_encoder.classes_)),
+                                    target_names=self.label_encoder.classes_))
+
+        return history
+        
+    def _record_run(self, train_rows, holdout_rows, holdout_accuracy, incremental):
+        self.training_state["runs"].append({
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "incremental": incremental,
+            "train_rows": int(train_rows),
+            "holdout_rows": int(holdout_rows),
+            "holdout_accuracy": float(holdout_accuracy),
+        })
+
+    def train_incremental(self, store, model_path, epochs=10, batch_size=32, replay_fraction=0.5):
+        """
+        Continue training a saved model on the store sources it hasn't seen.
+
+        The scaler's running statistics are updated with the new training
+        rows, the network is warm-started from model_path and fitted on the
+        new rows plus a replay sample of old ones (replay_fraction of the new
+        row count, against forgetting), and evaluated on the same fixed
+        holdout as before. Falls back to a full retrain when the model
+        can't be extended: temporal models are retrained with the same
+        window (their training data isn't in the store), and
+        train_from_store is used when there is no training state, a
+        trained source changed, or a new label appeared.
+        """
+        self.load_model(model_path)
+        state = self.training_state
+        if self.feature_window > 1:
+            print(f"⚠️  Temporal model (window {self.feature_window}), training from scratch")
+            return self.train_temporal_model(self.load_training_data(), window=self.feature_window,
+                                             batch_size=batch_size)
+        if state is None:
+            print("⚠️  Model has no training state, training from scratch")
+            return self.train_from_store(store, batch_size=batch_size)
+
+        test_size = state["test_size"]
+        sources = store.manifest["sources"]
+        changed = [name for name, sha in state["sources"].items() if sources.get(name, {}).get("sha256") != sha]
+        new_labels = set(store.label_names) - set(self.label_encoder.classes_)
+        if changed or new_labels:
+            reason = f"{len(changed)} trained source(s) changed" if changed else f"new labels {sorted(new_labels)}"
+            print(f"⚠️  {reason}, training from scratch")
+            return self.train_from_store(store, test_size=test_size, batch_size=batch_size)
+
+        new_sources = [name for name in sources if name not in state["sources"]]
+        if not new_sources:
+            print("✅ No new data since the last training run")
+            return None
+
+        print(f"🚀 Incremental training on {len(new_sources)} new source(s)...")
+        code_to_class = self.label_encoder.transform(store.label_names).astype(np.int32)
+        new_train, _ = store.split_indices(test_size, new_sources)
+        old_train, _ = store.split_indices(test_size, state["sources"])
+        _, holdout = store.split_indices(test_size)
+
+        for X_batch, _ in store.iter_batches(4096, new_train, shuffle=False):
+            self.scaler.partial_fit(X_batch)
+
+        replay_rows = min(len(old_train), int(len(new_train) * replay_fraction))
+        replay = np.random.default_rng().choice(old_train, size=replay_rows, replace=False)
+        train_idx = np.concatenate([new_train, replay])
+        print(f"📊 Training set: {len(new_train)} new + {len(replay)} replayed samples")
+        print(f"📊 Holdout set: {len(holdout)} samples")
+
+        train_ds = self._store_dataset(store, train_idx, code_to_class, batch_size, shuffle=True)
+        holdout_ds = self._store_dataset(store, holdout, code_to_class, batch_size, shuffle=False)
+        history = self.model.fit(train_ds, epochs=epochs, verbose=1)
+
+        holdout_loss, holdout_accuracy = self.model.evaluate(holdout_ds, verbose=0)
+        previous = state["runs"][-1]["holdout_accuracy"] if state["runs"] else None
+        change = f" (was {previous:.4f})" if previous is not None else ""
+        print(f"📊 Holdout Accuracy: {holdout_accuracy:.4f}{change}")
+
+        for name in new_sources:
+            state["sources"][name] = sources[name]["sha256"]
+        self._record_run(len(train_idx), len(holdout), holdout_accuracy, incremental=True)
+        return history
         
     def save_model(self, model_name=None):
         """
@@ -181,10 +422,40 @@ class MLTrainer:
         # Save preprocessing objects
         joblib.dump(self.label_encoder, os.path.join(model_path, "label_encoder.pkl"))
         joblib.dump(self.scaler, os.path.join(model_path, "scaler.pkl"))
+        with open(os.path.join(model_path, FEATURES_FILE), "w") as f:
+            json.dump({"window": self.feature_window}, f)
+        state_path = os.path.join(model_path, TRAINING_STATE_FILE)
+        if self.training_state is not None:
+            with open(state_path, "w") as f:
+                json.dump(self.training_state, f, indent=2)
+        elif os.path.exists(state_path):
+            os.remove(state_path)  # stale state from a model trained another way
+
+        # TensorFlow-free copy for serving (see numpy_predictor.py)
+        self.export_numpy_model(os.path.join(model_path, NUMPY_MODEL_FILE))
         
         print(f"💾 Model saved to: {model_path}")
         return model_path
         
+    def export_numpy_model(self, path):
+        """
+        Write weights, scaler and label encoder to one .npz file that
+        NumpyPosturePredictor can run without importing TensorFlow
+        """
+        if self.model is None:
+            raise ValueError("No model to export. Train or load a model first.")
+        export_numpy_model(self.model, self.scaler, self.label_encoder, path, window=self.feature_window)
+        print(f"💾 NumPy model exported to: {path}")
+        return path
+
+    def publish_model(self, model_path, name="glute_fly", registry_dir=None):
+        """
+        Publish a saved model directory to the model registry; live sessions
+        serving `name` switch to it without a restart
+        """
+        registry = ModelRegistry(registry_dir or os.path.join(self.model_dir, "registry"))
+        return registry.publish(name, model_path)
+
     def load_model(self, model_path):
         """
         Load trained model and preprocessing objects
@@ -197,6 +468,16 @@ class MLTrainer:
         # Load preprocessing objects
         self.label_encoder = joblib.load(os.path.join(model_path, "label_encoder.pkl"))
         self.scaler = joblib.load(os.path.join(model_path, "scaler.pkl"))
+        features_path = os.path.join(model_path, FEATURES_FILE)
+        self.feature_window = 1
+        if os.path.exists(features_path):
+            with open(features_path) as f:
+                self.feature_window = json.load(f).get("window", 1)
+        state_path = os.path.join(model_path, TRAINING_STATE_FILE)
+        self.training_state = None
+        if os.path.exists(state_path):
+            with open(state_path) as f:
+                self.training_state = json.load(f)
         
         print("✅ Model loaded successfully")
         
@@ -206,6 +487,8 @@ class MLTrainer:
         """
         if self.model is None:
             raise ValueError("No model loaded. Load or train model first.")
+        if self.feature_window > 1:
+            raise ValueError("Temporal model: classify frame sequences with predict_posture_batch")
             
         # Prepare input data
         if isinstance(landmarks, dict):
@@ -233,6 +516,25 @@ class MLTrainer:
         
         return predicted_label, confidence
         
+    def predict_posture_batch(self, X, batch_size=1024):
+        """
+        Classify an (N, 99) array in one call instead of N predict_posture
+        calls. Returns (labels, confidences). A temporal model takes
+        consecutive frames and returns one result per full window, i.e.
+        N - window + 1 of them.
+        """
+        if self.model is None:
+            raise ValueError("No model loaded. Load or train model first.")
+
+        X = np.asarray(X, dtype=np.float32)
+        if self.feature_window > 1:
+            X = window_features(X, self.feature_window)
+        X_scaled = self.scaler.transform(X)
+        prediction = self.model.predict(X_scaled, batch_size=batch_size, verbose=0)
+        predicted_classes = np.argmax(prediction, axis=1)
+        confidences = np.max(prediction, axis=1)
+        return self.label_encoder.inverse_transform(predicted_classes), confidences
+        
     def get_model_info(self):
         """
         Get information about the current model
@@ -0,0 +1,293 @@
+"""
+Model Registry for Glute Fly AI Trainer
+Versioned posture models that live sessions load once and share.
+
+Layout (default: models/registry):
+    <name>/v0001/          posture_model.npz + whatever else the model
+                           directory held (model.h5, scaler.pkl, ...)
+    <name>/v0001/metadata.json
+    <name>/CURRENT         the active version, e.g. "v0002"
+
+Publishing copies the artifacts into a staging directory, checks that they
+load, then renames it into place and rewrites CURRENT with os.replace, so
+readers only ever see complete versions. ModelRegistry.get() loads a model
+on first use and re-reads CURRENT at most every MODEL_RELOAD_CHECK_SECONDS;
+when it changed, the new version is loaded and swapped in with a single
+reference assignment. Sessions that call get() per frame (or hold a
+RegisteredPosturePredictor) pick it up without a restart.
+
+Run:
+    python -m src.backend.training.model_registry publish glute_fly models/glute_fly_model
+    python -m src.backend.training.model_registry list glute_fly
+    python -m src.backend.training.model_registry activate glute_fly v0001
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import NamedTuple
+
+try:
+    from .numpy_predictor import BATCH_CHUNK_ROWS, NUMPY_MODEL_FILE, FrameHistory, NumpyPosturePredictor
+except ImportError:
+    # Run as a script from the training directory
+    from numpy_predictor import BATCH_CHUNK_ROWS, NUMPY_MODEL_FILE, FrameHistory, NumpyPosturePredictor
+
+REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", os.path.join("models", "registry"))
+RELOAD_CHECK_SECONDS = float(os.getenv("MODEL_RELOAD_CHECK_SECONDS", "2"))
+CURRENT_FILE = "CURRENT"
+METADATA_FILE = "metadata.json"
+TRAINING_STATE_FILE = "training_state.json"
+
+_VERSION_RE = re.compile(r"^v(\d{4,})$")
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class _LoadedModel(NamedTuple):
+    version: str
+    predictor: NumpyPosturePredictor
+    next_check: float  # time.monotonic() after which CURRENT is re-read
+
+
+class ModelRegistry:
+    def __init__(self, root=REGISTRY_DIR, check_interval=RELOAD_CHECK_SECONDS):
+        self.root = root
+        self.check_interval = check_interval
+        self._loaded = {}  # name -> _LoadedModel, replaced whole on every update
+        self._lock = threading.Lock()
+
+    # --- versions -------------------------------------------------------
+
+    def _model_dir(self, name):
+        if not name or os.sep in name or name.startswith("."):
+            raise ValueError(f"Invalid model name {name!r}")
+        return os.path.join(self.root, name)
+
+    def versions(self, name):
+        """Published versions of a model, oldest first"""
+        try:
+            entries = os.listdir(self._model_dir(name))
+        except FileNotFoundError:
+            return []
+        return sorted((e for e in entries if _VERSION_RE.match(e)), key=lambda e: int(e[1:]))
+
+    def current_version(self, name):
+        try:
+            with open(os.path.join(self._model_dir(name), CURRENT_FILE)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def metadata(self, name, version=None):
+        version = version or self.current_version(name)
+        if version is None:
+            raise LookupError(f"No published version of model {name!r}")
+        with open(os.path.join(self._model_dir(name), version, METADATA_FILE)) as f:
+            return json.load(f)
+
+    def publish(self, name, source, metadata=None, activate=True):
+        """
+        Copy a model directory (or a bare posture_model.npz) in as the next
+        version; returns the version id
+        """
+        model_dir = self._model_dir(name)
+        os.makedirs(model_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=model_dir)
+        try:
+            if os.path.isdir(source):
+                for entry in os.listdir(source):
+                    path = os.path.join(source, entry)
+                    if os.path.isfile(path):
+                        shutil.copy2(path, staging)
+            else:
+                shutil.copy2(source, os.path.join(staging, NUMPY_MODEL_FILE))
+
+            # Refuse to publish something sessions couldn't load
+            predictor = NumpyPosturePredictor.load(staging)
+            info = {
+                "name": name,
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "source": os.path.abspath(source),
+                "sha256": _file_sha256(os.path.join(staging, NUMPY_MODEL_FILE)),
+                "classes": predictor.classes.tolist(),
+                "window": predictor.window,
+            }
+            state_path = os.path.join(staging, TRAINING_STATE_FILE)
+            if os.path.exists(state_path):
+                with open(state_path) as f:
+                    runs = json.load(f).get("runs") or [None]
+                info["last_training_run"] = runs[-1]
+            info.update(metadata or {})
+
+            while True:
+                existing = self.versions(name)
+                version = f"v{(int(existing[-1][1:]) + 1) if existing else 1:04d}"
+                info["version"] = version
+                with open(os.path.join(staging, METADATA_FILE), "w") as f:
+                    json.dump(info, f, indent=2)
+                try:
+                    os.rename(staging, os.path.join(model_dir, version))
+                    break
+                except OSError:
+                    if not os.path.exists(os.path.join(model_dir, version)):
+                        raise
+                    # Another publisher took this number; try the next one
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        print(f"📦 Published {name} {version}")
+        if activate:
+            self.activate(name, version)
+        return version
+
+    def activate(self, name, version):
+        """Point CURRENT at a published version (also used to roll back)"""
+        if version not in self.versions(name):
+            raise LookupError(f"Model {name!r} has no version {version!r}")
+        model_dir = self._model_dir(name)
+        fd, tmp = tempfile.mkstemp(prefix=".current-", dir=model_dir)
+        with os.fdopen(fd, "w") as f:
+            f.write(version)
+        os.replace(tmp, os.path.join(model_dir, CURRENT_FILE))
+        print(f"✅ {name} now serving {version}")
+
+    # --- serving --------------------------------------------------------
+
+    def get(self, name):
+        """
+        The shared predictor for the active version, loaded on first use.
+        Cheap enough to call on every frame.
+        """
+        entry = self._loaded.get(name)
+        if entry is not None and time.monotonic() < entry.next_check:
+            return entry.predictor
+
+        with self._lock:
+            entry = self._loaded.get(name)
+            if entry is not None and time.monotonic() < entry.next_check:
+                return entry.predictor
+
+            version = self.current_version(name)
+            if version is None and entry is None:
+                raise LookupError(f"No published version of model {name!r}")
+            if entry is None or (version is not None and version != entry.version):
+                try:
+                    predictor = NumpyPosturePredictor.load(os.path.join(self._model_dir(name), version))
+                except Exception as e:
+                    if entry is None:
+                        raise
+                    # Keep serving the old version; retry after the next interval
+                    print(f"❌ Error loading {name} {version}, still serving {entry.version}: {e}")
+                else:
+                    if entry is not None:
+                        print(f"🔄 {name}: swapped {entry.version} -> {version}")
+                    entry = _LoadedModel(version, predictor, 0.0)
+
+            entry = entry._replace(next_check=time.monotonic() + self.check_interval)
+            self._loaded[name] = entry
+            return entry.predictor
+
+    def loaded_version(self, name):
+        entry = self._loaded.get(name)
+        return entry.version if entry else None
+
+    def session(self, name):
+        """Per-session handle onto a shared model (see RegisteredPosturePredictor)"""
+        return RegisteredPosturePredictor(self, name)
+
+
+class RegisteredPosturePredictor:
+    """
+    What one live session holds: the weights come from the registry (shared,
+    hot-swapped), only the temporal frame history is per session
+    """
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+        self._history = None
+
+    @property
+    def version(self):
+        return self.registry.loaded_version(self.name)
+
+    def reset(self):
+        if self._history is not None:
+            self._history.reset()
+
+    def predict_posture(self, landmarks):
+        predictor = self.registry.get(self.name)
+        if predictor.window <= 1:
+            return predictor.predict_posture(landmarks)
+        if self._history is None or self._history.window != predictor.window:
+            self._history = FrameHistory(predictor.window)
+        return predictor.predict_posture(landmarks, self._history)
+
+    def predict_batch(self, X, chunk_size=BATCH_CHUNK_ROWS):
+        return self.registry.get(self.name).predict_batch(X, chunk_size)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    """Process-wide registry, so every session shares the loaded models"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage published posture models")
+    parser.add_argument("--root", default=REGISTRY_DIR, help="Registry directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    publish = commands.add_parser("publish", help="Publish a model directory as a new version")
+    publish.add_argument("name")
+    publish.add_argument("source", help="Model directory (or posture_model.npz)")
+    publish.add_argument("--no-activate", action="store_true", help="Publish without serving it yet")
+    listing = commands.add_parser("list", help="List versions of a model")
+    listing.add_argument("name")
+    activate = commands.add_parser("activate", help="Serve a published version (roll forward/back)")
+    activate.add_argument("name")
+    activate.add_argument("version")
+    args = parser.parse_args(argv)
+
+    registry = ModelRegistry(args.root)
+    try:
+        if args.command == "publish":
+            registry.publish(args.name, args.source, activate=not args.no_activate)
+        elif args.command == "activate":
+            registry.activate(args.name, args.version)
+        else:
+            current = registry.current_version(args.name)
+            for version in registry.versions(args.name):
+                meta = registry.metadata(args.name, version)
+                marker = "*" if version == current else " "
+                print(f"{marker} {version}  {meta['created_at']}  classes={','.join(meta['classes'])}")
+    except (LookupError, OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+NumPy Posture Predictor
+Runs the posture MLP trained by MLTrainer without TensorFlow.
+
+export_numpy_model() writes the Dense layer weights, the StandardScaler
+statistics and the label classes into one .npz file; NumpyPosturePredictor
+loads it and does the forward pass with plain matrix products (Dropout is
+the identity at inference). The scaler is folded into the first layer, so
+a single-frame prediction is a handful of small matmuls.
+"""
+
+import json
+import os
+
+import numpy as np
+
+try:
+    from .temporal_features import NUM_POSE_FEATURES, window_features
+except ImportError:
+    # Run as a script from the training directory
+    from temporal_features import NUM_POSE_FEATURES, window_features
+
+NUMPY_MODEL_FILE = "posture_model.npz"
+KERAS_MODEL_FILE = "model.h5"  # what MLTrainer.save_model wrote before the NumPy export
+NUMPY_MODEL_VERSION = 1
+BATCH_CHUNK_ROWS = 4096  # rows per matmul chunk in predict_batch
+
+_ACTIVATIONS = ("linear", "relu", "sigmoid", "tanh", "softmax")
+
+
+def export_numpy_model(model, scaler, label_encoder, path, window=1):
+    """
+    Save a trained Keras Sequential MLP + preprocessing as a NumPy .npz file.
+    window > 1 marks a temporal model trained on window_features.
+    """
+    arrays = {}
+    activations = []
+    for layer in model.layers:
+        kind = type(layer).__name__
+        if kind == "Dropout":
+            continue
+        if kind != "Dense":
+            raise ValueError(f"Can't export layer type {kind} (only Dense/Dropout MLPs)")
+        activation = layer.get_config().get("activation", "linear")
+        if activation not in _ACTIVATIONS:
+            raise ValueError(f"Unsupported activation {activation!r} in layer {layer.name}")
+        weights, bias = layer.get_weights()
+        arrays[f"W{len(activations)}"] = weights.astype(np.float32)
+        arrays[f"b{len(activations)}"] = bias.astype(np.float32)
+        activations.append(activation)
+
+    np.savez(
+        path,
+        meta=np.array(json.dumps({
+            "version": NUMPY_MODEL_VERSION,
+            "activations": activations,
+            "window": window,
+        })),
+        scaler_mean=np.asarray(scaler.mean_, dtype=np.float64),
+        scaler_scale=np.asarray(scaler.scale_, dtype=np.float64),
+        classes=np.asarray(label_encoder.classes_).astype(str),
+        **arrays,
+    )
+    return path
+
+
+def export_legacy_model(model_dir):
+    """
+    Write the missing posture_model.npz of a model directory saved before
+    the NumPy export existed (model.h5, scaler.pkl, label_encoder.pkl).
+    Needs TensorFlow; returns the path of the .npz.
+    """
+    path = os.path.join(model_dir, NUMPY_MODEL_FILE)
+    try:
+        import joblib
+        import tensorflow as tf
+    except ImportError:
+        raise FileNotFoundError(
+            f"{model_dir} has no {NUMPY_MODEL_FILE} (saved before the NumPy export) and TensorFlow "
+            "isn't installed to convert it - re-run train_model.py to re-export the model"
+        ) from None
+
+    model = tf.keras.models.load_model(os.path.join(model_dir, KERAS_MODEL_FILE))
+    scaler = joblib.load(os.path.join(model_dir, "scaler.pkl"))
+    label_encoder = joblib.load(os.path.join(model_dir, "label_encoder.pkl"))
+    window = 1
+    features_path = os.path.join(model_dir, "features.json")
+    if os.path.exists(features_path):
+        with open(features_path) as f:
+            window = json.load(f).get("window", 1)
+    print(f"💾 Exporting NumPy model for {model_dir}")
+    return export_numpy_model(model, scaler, label_encoder, path, window=window)
+
+
+def landmarks_to_features(landmarks):
+    """
+    (N, 99) feature rows from recorded (N, 33, 3|4) landmark arrays (the
+    visibility column is dropped) or pass (N, 99) through unchanged
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    if landmarks.ndim == 3:
+        return landmarks[:, :, :3].reshape(len(landmarks), -1)
+    if landmarks.ndim == 1:
+        return landmarks[None, :]
+    return landmarks
+
+
+def _relu(x):
+    return np.maximum(x, 0.0, out=x)
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _softmax(x):
+    x = x - x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+    return x
+
+
+_ACTIVATION_FUNCS = {
+    "linear": lambda x: x,
+    "relu": _relu,
+    "sigmoid": _sigmoid,
+    "tanh": np.tanh,
+    "softmax": _softmax,
+}
+
+
+class FrameHistory:
+    """Ring buffer of the last `window` live frames for a temporal model"""
+
+    def __init__(self, window):
+        self.window = window
+        self.frames = np.zeros((window, NUM_POSE_FEATURES), dtype=np.float32)
+        self.seen = 0
+
+    def reset(self):
+        self.seen = 0
+
+    def push(self, vector):
+        """Add a frame; returns the window in time order once it is full, else None"""
+        self.frames[self.seen % self.window] = vector[:NUM_POSE_FEATURES]
+        self.seen += 1
+        if self.seen < self.window:
+            return None
+        return np.roll(self.frames, -(self.seen % self.window), axis=0)
+
+
+class NumpyPosturePredictor:
+    def __init__(self, weights, biases, activations, classes, scaler_mean=None, scaler_scale=None,
+                 window=1):
+        weights = [np.asarray(w, dtype=np.float32) for w in weights]
+        biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        if scaler_mean is not None:
+            # (x - mean) / scale @ W + b  ==  x @ (W / scale) + (b - (mean / scale) @ W)
+            scale = np.asarray(scaler_scale, dtype=np.float64)
+            mean = np.asarray(scaler_mean, dtype=np.float64)
+            W0 = weights[0].astype(np.float64)
+            weights[0] = (W0 / scale[:, None]).astype(np.float32)
+            biases[0] = (biases[0] - (mean / scale) @ W0).astype(np.float32)
+        self.weights = weights
+        self.biases = biases
+        self.activations = [_ACTIVATION_FUNCS[a] for a in activations]
+        self.classes = np.asarray(classes)
+        self.num_features = weights[0].shape[0]
+        self.window = window
+        # Live frames for predict_posture when the caller doesn't pass its own
+        self._history = FrameHistory(window) if window > 1 else None
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an exported model (a .npz file, or a model directory containing
+        one). An older model directory with only model.h5 is exported first.
+        """
+        if os.path.isdir(path):
+            model_dir, path = path, os.path.join(path, NUMPY_MODEL_FILE)
+            if not os.path.exists(path) and os.path.exists(os.path.join(model_dir, KERAS_MODEL_FILE)):
+                path = export_legacy_model(model_dir)
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != NUMPY_MODEL_VERSION:
+                raise ValueError(f"Unsupported NumPy model version {meta.get('version')}")
+            n = len(meta["activations"])
+            return cls(
+                [data[f"W{i}"] for i in range(n)],
+                [data[f"b{i}"] for i in range(n)],
+                meta["activations"],
+                data["classes"],
+                data["scaler_mean"],
+                data["scaler_scale"],
+                meta.get("window", 1),
+            )
+
+    def predict_proba(self, X):
+        """Class probabilities for an (n, features) or (features,) array"""
+        x = np.asarray(X, dtype=np.float32)
+        if x.ndim == 1:
+            x = x[None, :]
+        for W, b, activation in zip(self.weights, self.biases, self.activations):
+            x = activation(x @ W + b)
+        return x
+
+    def predict_batch(self, X, chunk_size=BATCH_CHUNK_ROWS):
+        """
+        Classify many frames at once. X is (N, 99) or recorded (N, 33, 4)
+        landmarks; rows containing NaN (no pose) get label None and
+        confidence 0. Returns (labels object array, float32 confidences).
+
+        For a temporal model X must be consecutive frames of one session;
+        the first window - 1 frames (and any window containing a frame
+        without a pose) get None.
+        """
+        X = landmarks_to_features(X)
+        n = len(X)
+        labels = np.empty(n, dtype=object)
+        confidences = np.zeros(n, dtype=np.float32)
+        offset = 0
+        if self.window > 1:
+            X = window_features(X, self.window)
+            offset = self.window - 1
+        valid = ~np.isnan(X).any(axis=1)
+        for start in range(0, len(X), chunk_size):
+            stop = min(start + chunk_size, len(X))
+            rows = np.flatnonzero(valid[start:stop]) + start
+            if not len(rows):
+                continue
+            probabilities = self.predict_proba(X[rows])
+            best = probabilities.argmax(axis=1)
+            labels[rows + offset] = self.classes[best]
+            confidences[rows + offset] = probabilities[np.arange(len(rows)), best]
+        return labels, confidences
+
+    def predict_stream(self, batches, chunk_size=BATCH_CHUNK_ROWS):
+        """
+        predict_batch over an iterable of arrays (e.g. the landmarks of each
+        recorded chunk); yields (labels, confidences) per input array.
+        Temporal windows carry over from one array to the next.
+        """
+        history = self.window - 1
+        tail = np.empty((0, NUM_POSE_FEATURES), dtype=np.float32)
+        for X in batches:
+            X = landmarks_to_features(X)
+            if not history:
+                yield self.predict_batch(X, chunk_size)
+                continue
+            frames = np.concatenate([tail, X])
+            labels, confidences = self.predict_batch(frames, chunk_size)
+            yield labels[len(tail):], confidences[len(tail):]
+            tail = frames[-history:]
+
+    def _landmark_vector(self, landmarks):
+        """One frame's pose features; a temporal model stacks these via FrameHistory"""
+        if isinstance(landmarks, dict):
+            # Same layout as MLTrainer.predict_posture: x, y, z per landmark, zeros if missing
+            vector = np.zeros(NUM_POSE_FEATURES, dtype=np.float32)
+            for i in range(NUM_POSE_FEATURES // 3):
+                if i in landmarks:
+                    vector[3 * i:3 * i + 3] = landmarks[i][:3]
+            return vector
+        return np.asarray(landmarks, dtype=np.float32)
+
+    def reset(self):
+        """Forget the live frame history (new session/set)"""
+        if self._history is not None:
+            self._history.reset()
+
+    def predict_posture(self, landmarks, history=None):
+        """
+        Drop-in for MLTrainer.predict_posture: returns (label, confidence).
+        A temporal model classifies the window ending at this frame and
+        returns (None, 0.0) until it has seen a full window. Callers sharing
+        one predictor pass their own FrameHistory.
+        """
+        if self.window > 1:
+            frames = (history or self._history).push(self._landmark_vector(landmarks))
+            if frames is None:
+                return None, 0.0
+            labels, confidences = self.predict_batch(frames)
+            return labels[-1], float(confidences[-1])
+        probabilities = self.predict_proba(self._landmark_vector(landmarks))[0]
+        best = int(np.argmax(probabilities))
+        return self.classes[best].item(), float(probabilities[best])
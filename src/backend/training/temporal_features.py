@@ -0,0 +1,115 @@
+"""
+Temporal Posture Features for Glute Fly AI Trainer
+Turns a sequence of raw (N, 99) landmark rows into per-window features
+that don't depend on where the person stands in the frame and that see
+the movement, not just a single pose.
+
+Per frame:
+- landmarks re-centred on the hip midpoint and scaled by torso length
+- 2D joint angles (elbows, shoulders, hips, knees) and their velocities
+
+Per window of WINDOW_FRAMES frames (ending at the frame being classified):
+- the normalized pose of the last frame
+- mean / std / min / max of each joint angle
+- mean and peak absolute angle velocity
+
+Windows are strided views over the per-frame arrays
+(numpy.lib.stride_tricks.sliding_window_view), so no per-frame Python
+loop and no window copies.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+WINDOW_FRAMES = 15  # ~0.5 s at 30 fps
+
+LEFT_SHOULDER, RIGHT_SHOULDER = 11, 12
+LEFT_HIP, RIGHT_HIP = 23, 24
+
+# Joint name -> (a, vertex, c) landmark indices; angle is measured at the vertex
+ANGLE_JOINTS = {
+    "left_elbow": (11, 13, 15),
+    "right_elbow": (12, 14, 16),
+    "left_shoulder": (23, 11, 13),
+    "right_shoulder": (24, 12, 14),
+    "left_hip": (11, 23, 25),
+    "right_hip": (12, 24, 26),
+    "left_knee": (23, 25, 27),
+    "right_knee": (24, 26, 28),
+}
+_A, _B, _C = (np.array(idx) for idx in zip(*ANGLE_JOINTS.values()))
+
+NUM_ANGLES = len(ANGLE_JOINTS)
+NUM_POSE_FEATURES = 99
+NUM_WINDOW_FEATURES = NUM_POSE_FEATURES + 6 * NUM_ANGLES
+
+
+def normalize_pose(X):
+    """(N, 99) raw landmarks -> (N, 33, 3) centred on the hips, in torso lengths"""
+    pose = np.asarray(X, dtype=np.float32).reshape(-1, 33, 3)
+    hips = (pose[:, LEFT_HIP] + pose[:, RIGHT_HIP]) * 0.5
+    shoulders = (pose[:, LEFT_SHOULDER] + pose[:, RIGHT_SHOULDER]) * 0.5
+    torso = np.linalg.norm((shoulders - hips)[:, :2], axis=1)
+    torso = np.maximum(torso, 1e-6)
+    return (pose - hips[:, None, :]) / torso[:, None, None]
+
+
+def joint_angles(pose):
+    """(N, 33, 2|3) pose -> (N, NUM_ANGLES) 2D joint angles in degrees, 0..180"""
+    ba = pose[:, _A, :2] - pose[:, _B, :2]
+    bc = pose[:, _C, :2] - pose[:, _B, :2]
+    cross = ba[..., 0] * bc[..., 1] - ba[..., 1] * bc[..., 0]
+    dot = (ba * bc).sum(axis=-1)
+    return np.degrees(np.abs(np.arctan2(cross, dot))).astype(np.float32)
+
+
+def window_features(X, window=WINDOW_FRAMES, step=1):
+    """
+    (N, 99) consecutive frames of one session -> (M, NUM_WINDOW_FEATURES)
+    with M = (N - window) // step + 1. Row i describes frames
+    [i * step, i * step + window) and belongs to its last frame.
+    """
+    if window < 2:
+        raise ValueError("A temporal window needs at least 2 frames")
+    X = np.asarray(X, dtype=np.float32)
+    if len(X) < window:
+        return np.empty((0, NUM_WINDOW_FEATURES), dtype=np.float32)
+
+    pose = normalize_pose(X)
+    angles = joint_angles(pose) / 180.0
+    velocity = np.diff(angles, axis=0)
+
+    # (M, NUM_ANGLES, window) views, no copies; velocities stay inside the window
+    angle_windows = sliding_window_view(angles, window, axis=0)[::step]
+    velocity_windows = sliding_window_view(velocity, window - 1, axis=0)[::step]
+    last = np.arange(window - 1, len(X), step)
+
+    return np.concatenate([
+        pose[last].reshape(len(last), -1),
+        angle_windows.mean(axis=-1),
+        angle_windows.std(axis=-1),
+        angle_windows.min(axis=-1),
+        angle_windows.max(axis=-1),
+        velocity_windows.mean(axis=-1),
+        np.abs(velocity_windows).max(axis=-1),
+    ], axis=1).astype(np.float32, copy=False)
+
+
+def window_labels(y, window=WINDOW_FRAMES, step=1):
+    """Label of the last frame of each window, aligned with window_features"""
+    return np.asarray(y)[window - 1::step]
+
+
+def session_windows(X, y, groups, window=WINDOW_FRAMES, step=1):
+    """
+    window_features/window_labels over several sessions stacked in one
+    array; `groups` marks each row's session so windows never span two.
+    Rows of a session must be contiguous and in time order.
+    """
+    groups = np.asarray(groups)
+    boundaries = np.flatnonzero(groups[1:] != groups[:-1]) + 1
+    features, labels = [], []
+    for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(groups)]):
+        features.append(window_features(X[start:end], window, step))
+        labels.append(window_labels(y[start:end], window, step) if end - start >= window else y[:0])
+    return np.concatenate(features), np.concatenate(labels)
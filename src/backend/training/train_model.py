@@ -6,6 +6,7 @@ Demonstrates how to train ML model on collected data
 import os
 import sys
 from ml_trainer import MLTrainer
+from data_collector import is_binary_session
 
 def main():
     print("🤖 Glute Fly AI Trainer - Model Training")
@@ -16,7 +17,10 @@ def main():
     
     try:
         # Check if data exists
-        data_files = [f for f in os.listdir("data") if f.endswith('.csv')]
+        data_files = [
+            f for f in os.listdir("data")
+            if f.endswith('.csv') or is_binary_session(os.path.join("data", f))
+        ]
         
         if not data_files:
             print("❌ No training data found!")
@@ -28,26 +32,40 @@ def main():
         for file in data_files:
             print(f"  - {file}")
         
-        # Load training data
-        print("\n📊 Loading training data...")
-        data = trainer.load_training_data()
-        
-        # Prepare features and labels
-        print("\n🔧 Preparing features and labels...")
-        X, y = trainer.prepare_features_and_labels(data)
-        
         # Train model
-        print("\n🚀 Training model...")
-        print("   This may take a few minutes...")
-        
-        history = trainer.train_model(X, y, epochs=50)
+        if "--temporal" in sys.argv:
+            # Sliding-window features need each session's frames in order
+            print("\n📊 Loading training data...")
+            data = trainer.load_training_data()
+
+            print("\n🚀 Training temporal model...")
+            print("   This may take a few minutes...")
+            history = trainer.train_temporal_model(data, epochs=50)
+        else:
+            # Load training data (new files are ingested into the cached store once)
+            print("\n📊 Loading training data...")
+            store = trainer.load_dataset_store()
+
+            previous_model = os.path.join(trainer.model_dir, "glute_fly_model")
+            if "--incremental" in sys.argv and os.path.isdir(previous_model):
+                # Only sessions added since the last run are trained on
+                print("\n🚀 Updating model with new sessions...")
+                history = trainer.train_incremental(store, previous_model)
+                if history is None:
+                    return
+            else:
+                print("\n🚀 Training model...")
+                print("   This may take a few minutes...")
+                history = trainer.train_from_store(store, epochs=50)
         
         # Save model
         print("\n💾 Saving model...")
         model_path = trainer.save_model("glute_fly_model")
+        version = trainer.publish_model(model_path)
         
         print(f"\n🎉 Training completed successfully!")
         print(f"📁 Model saved to: {model_path}")
+        print(f"📦 Published as glute_fly {version} (running sessions pick it up automatically)")
         print(f"\n💡 To use the trained model:")
         print(f"   1. Run: python glute_fly_trainer_enhanced.py")
         print(f"   2. Press 'm' to load model")
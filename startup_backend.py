@@ -4,7 +4,9 @@ Backend startup script
 Adds project root to Python path and starts FastAPI
 """
 
+import logging
 import sys
+from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -16,6 +18,34 @@ sys.path.insert(0, str(root))
 env_path = Path(__file__).parent / ".env"
 _ = load_dotenv(dotenv_path=env_path)
 
+logger = logging.getLogger(__name__)
+
+def cancel_duplicate_bookings(cursor):
+    """
+    Cancel every confirmed booking that shares its slot with an earlier one
+    (lowest id keeps the slot), so uq_bookings_confirmed_slot can be created.
+    Each cancelled row is logged; returns how many were cancelled.
+    """
+    cursor.execute(
+        "SELECT b.id, b.user_id, b.booking_date, b.time, keep.id FROM bookings b "
+        "JOIN (SELECT booking_date, time, MIN(id) AS id FROM bookings WHERE status = 'confirmed' "
+        "      GROUP BY booking_date, time HAVING COUNT(*) > 1) keep "
+        "ON b.booking_date = keep.booking_date AND b.time = keep.time "
+        "WHERE b.status = 'confirmed' AND b.id != keep.id ORDER BY b.id"
+    )
+    duplicates = cursor.fetchall()
+    for booking_id, user_id, booking_date, time, kept_id in duplicates:
+        logger.error(
+            f"Double booking: cancelling booking {booking_id} (user {user_id}, {booking_date} {time}), "
+            f"booking {kept_id} keeps the slot"
+        )
+    now = datetime.utcnow().isoformat(sep=" ")
+    cursor.executemany(
+        "UPDATE bookings SET status = 'cancelled', cancelled_at = ? WHERE id = ?",
+        [(now, row[0]) for row in duplicates],
+    )
+    return len(duplicates)
+
 def run_migrations():
     """Add missing columns to existing tables if needed"""
     import sqlite3
@@ -36,6 +66,42 @@ def run_migrations():
             cursor.execute("ALTER TABLE users ADD COLUMN role TEXT DEFAULT 'user'")
             conn.commit()
             print("✅ Migration: Added 'role' column to users.")
+
+        # Check workouts table for client_id column (offline sync idempotency key)
+        cursor.execute("PRAGMA table_info(workouts)")
+        columns = [column[1] for column in cursor.fetchall()]
+        if 'client_id' not in columns:
+            print("🚀 Adding 'client_id' column to 'workouts' table...")
+            cursor.execute("ALTER TABLE workouts ADD COLUMN client_id TEXT")
+            conn.commit()
+            print("✅ Migration: Added 'client_id' column to workouts.")
+        cursor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_workouts_user_client_id ON workouts (user_id, client_id)"
+        )
+        if 'utc_offset_minutes' not in columns:
+            print("🚀 Adding 'utc_offset_minutes' column to 'workouts' table...")
+            cursor.execute("ALTER TABLE workouts ADD COLUMN utc_offset_minutes INTEGER")
+            conn.commit()
+            print("✅ Migration: Added 'utc_offset_minutes' column to workouts.")
+
+        # Composite indexes used by keyset-paginated history endpoints
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_workouts_user_date_id ON workouts (user_id, date, id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_diet_entries_user_date_id ON diet_entries (user_id, date, id)"
+        )
+        conn.commit()
+
+        # One confirmed booking per slot; existing double bookings are resolved first
+        cancelled = cancel_duplicate_bookings(cursor)
+        if cancelled:
+            logger.error(f"Cancelled {cancelled} double-booked consultation(s), see above")
+        cursor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_bookings_confirmed_slot "
+            "ON bookings (booking_date, time) WHERE status = 'confirmed'"
+        )
+        conn.commit()
             
         conn.close()
     except Exception as e:
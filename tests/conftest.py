@@ -0,0 +1,66 @@
+import os
+
+# security.py refuses to import without a signing key
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+
+@pytest.fixture
+def session_factory():
+    """Sessionmaker bound to a fresh in-memory SQLite database"""
+    from src.backend.database.db import Base
+    from src.backend.database import models  # noqa: F401 (register tables)
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def override_get_db(session_factory):
+    def _get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    return _get_db
+
+
+@pytest.fixture
+def client_for(session_factory, override_get_db):
+    """
+    Factory for a TestClient on the REST routers (mounted as in main.py)
+    that is authenticated as the given user id
+    """
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from src.backend.api import auth, bookings, routes
+    from src.backend.auth.user_cache import UserSnapshot
+    from src.backend.database.db import get_db
+    from src.backend.database.models import User
+
+    def make(user_id):
+        db = session_factory()
+        snapshot = UserSnapshot.from_user(db.get(User, user_id))
+        db.close()
+
+        app = FastAPI()
+        app.include_router(auth.router, prefix="/api")
+        app.include_router(routes.router, prefix="/api")
+        app.include_router(bookings.router)
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[auth.get_current_user] = lambda: snapshot
+        app.dependency_overrides[bookings.get_current_user] = lambda: snapshot
+        return TestClient(app)
+
+    return make
@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.backend.core.achievement_engine import AchievementEngine, ThresholdRule, apply_workout
+from src.backend.database.db import Base
+from src.backend.database.models import Achievement, User, UserAchievement, UserCounter, Workout
+
+RULES = [
+    ThresholdRule("basic-first-workout", "workouts:basic", 1),
+    ThresholdRule("basic-50-reps", "reps:basic", 50),
+    ThresholdRule("basic-100-reps", "reps:basic", 100),
+    ThresholdRule("basic-7-day-streak", "streak", 7),
+    ThresholdRule("weight-10lbs", "max_weight", 10),
+]
+
+
+def exercise_type_for(exercise_id):
+    return "basic"
+
+
+def setup_user(db):
+    user = User(name="Lifter", email="lifter@example.com")
+    db.add(user)
+    db.add_all(Achievement(id=rule.achievement_id, name=rule.achievement_id) for rule in RULES)
+    db.commit()
+    return user.id
+
+
+def save(db, engine, user_id, when, reps=10, weight=None):
+    workout = Workout(user_id=user_id, exercise_id="wall-squat", date=when,
+                      duration_seconds=300, reps_completed=reps, weight_lbs=weight)
+    db.add(workout)
+    db.commit()
+    unlocked = engine.record_workout(db, user_id, workout, exercise_type_for)
+    db.commit()
+    return unlocked
+
+
+def test_crossed_only_returns_thresholds_in_range():
+    engine = AchievementEngine(RULES)
+    assert engine.crossed("reps:basic", 40, 120) == ["basic-50-reps", "basic-100-reps"]
+    assert engine.crossed("reps:basic", 50, 60) == []
+    assert engine.crossed("unknown", 0, 10) == []
+
+
+def test_unlocks_incrementally(session_factory):
+    db = session_factory()
+    engine = AchievementEngine(RULES)
+    user_id = setup_user(db)
+    start = datetime(2025, 5, 1, 18)
+
+    assert save(db, engine, user_id, start, reps=30) == ["basic-first-workout"]
+    assert save(db, engine, user_id, start + timedelta(days=1), reps=30) == ["basic-50-reps"]
+    assert save(db, engine, user_id, start + timedelta(days=2), reps=5, weight=12) == ["weight-10lbs"]
+
+    unlocked = []
+    for day in range(3, 7):
+        unlocked += save(db, engine, user_id, start + timedelta(days=day), reps=10)
+    assert unlocked == ["basic-100-reps", "basic-7-day-streak"]
+
+    # Nothing is ever awarded twice
+    total = db.query(UserAchievement).filter(UserAchievement.user_id == user_id).count()
+    assert total == 5
+    db.close()
+
+
+def test_bootstraps_counters_from_existing_history(session_factory):
+    db = session_factory()
+    engine = AchievementEngine(RULES)
+    user_id = setup_user(db)
+    for day in range(3):
+        db.add(Workout(user_id=user_id, exercise_id="wall-squat",
+                       date=datetime(2025, 6, 1 + day, 18), duration_seconds=300,
+                       reps_completed=20))
+    db.commit()
+
+    unlocked = save(db, engine, user_id, datetime(2025, 6, 4, 18), reps=1)
+    assert unlocked == ["basic-first-workout", "basic-50-reps"]
+    db.close()
+
+
+def test_concurrent_bootstrap_keeps_both_workouts(tmp_path):
+    # Separate connections, like two requests against the real database
+    db_engine = create_engine(f"sqlite:///{tmp_path / 'race.db'}")
+    Base.metadata.create_all(bind=db_engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+    first, second = factory(), factory()
+    engine = AchievementEngine(RULES)
+    user_id = setup_user(first)
+
+    def add_workout(db, reps):
+        workout = Workout(user_id=user_id, exercise_id="wall-squat", date=datetime(2025, 7, 1, 18),
+                          duration_seconds=300, reps_completed=reps)
+        db.add(workout)
+        db.commit()
+        return workout
+
+    # The second request reads the (still empty) counters, then the first
+    # request bootstraps and commits before the second one stores its own
+    load_counters = engine._load_counters
+
+    def racing_load(db, uid):
+        loaded = load_counters(db, uid)
+        if db is second and not first.query(UserCounter).count():
+            engine.record_workout(first, user_id, add_workout(first, 30), exercise_type_for)
+            first.commit()
+        return loaded
+
+    engine._load_counters = racing_load
+    unlocked = engine.record_workout(second, user_id, add_workout(second, 25), exercise_type_for)
+    second.commit()
+
+    counters = {row.name: row.value for row in second.query(UserCounter).filter(UserCounter.user_id == user_id)}
+    assert counters["workouts:basic"] == 2
+    assert counters["reps:basic"] == 55
+    # The first request's history already held both workouts and unlocked everything once
+    assert unlocked == []
+    awarded = second.query(UserAchievement.achievement_id).filter(UserAchievement.user_id == user_id)
+    assert sorted(a for (a,) in awarded) == ["basic-50-reps", "basic-first-workout"]
+    first.close()
+    second.close()
+    db_engine.dispose()
+
+
+def test_early_bird_uses_the_clients_local_hour():
+    counters = {}
+    for utc_hour, offset in ((1, 330), (12, -300), (5, 330), (9, None)):
+        workout = Workout(date=datetime(2025, 8, 1, utc_hour, 30), reps_completed=5, duration_seconds=600,
+                          utc_offset_minutes=offset)
+        apply_workout(counters, workout, "basic")
+    # 07:00 IST and 07:30 EST are early; 11:00 IST and 09:30 UTC (offset unknown) aren't
+    assert counters["early_workouts"] == 2
@@ -1,30 +1,144 @@
+import datetime
+import time
+
 import pytest
-from unittest.mock import patch, MagicMock
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from src.backend.main import app
+from google.auth import crypt
+from google.auth import jwt as google_jwt
+
+from src.backend.api import auth
+from src.backend.auth.google_verifier import (
+    GoogleCertCache,
+    GoogleTokenVerifier,
+    StaticCertSource,
+    parse_max_age,
+)
 from src.backend.database.db import get_db
-from src.backend.database.models import User
-from sqlalchemy import create_test_instance # This is pseudo-code, I will use real sqlalchemy setup
-
-# Mocking the DB for test
-# ... (standard FastAPI testing setup)
-
-def test_google_login_new_user():
-    # Mock google.oauth2.id_token.verify_oauth2_token
-    with patch("src.backend.api.auth.id_token.verify_oauth2_token") as mock_verify:
-        mock_verify.return_value = {
-            "sub": "google123",
-            "email": "test@example.com",
-            "name": "Test User"
-        }
-        
-        # Test client
-        client = TestClient(app)
-        
-        # We need a way to mock the DB session too if we want to run this without a real DB
-        # But for now, let's assume a dev DB is okay or we mock get_db
-        
-        response = client.post("/api/auth/google", json={"credential": "fake_token"})
-        
-        # This will fail without real DB setup, but serves as a proof of concept for the user
-        # In a real scenario, I'd setup a sqlite in-memory DB for tests.
+
+CLIENT_ID = "test-client.apps.googleusercontent.com"
+KEY_ID = "local-test-key"
+
+
+@pytest.fixture(scope="module")
+def key_pair():
+    """Local stand-in for Google's signing key: (private PEM, cert PEM)"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "test")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    cert_pem = cert.public_bytes(serialization.Encoding.PEM).decode()
+    return private_pem, cert_pem
+
+
+def make_token(private_pem, **overrides):
+    now = int(time.time())
+    payload = {
+        "iss": "https://accounts.google.com",
+        "aud": CLIENT_ID,
+        "sub": "google123",
+        "email": "test@example.com",
+        "name": "Test User",
+        "iat": now,
+        "exp": now + 300,
+    }
+    payload.update(overrides)
+    signer = crypt.RSASigner.from_string(private_pem, key_id=KEY_ID)
+    return google_jwt.encode(signer, payload).decode()
+
+
+def test_verifier_accepts_token_signed_by_local_key(key_pair):
+    private_pem, cert_pem = key_pair
+    verifier = GoogleTokenVerifier(CLIENT_ID, StaticCertSource({KEY_ID: cert_pem}))
+    idinfo = verifier.verify(make_token(private_pem))
+    assert idinfo["sub"] == "google123"
+
+
+def test_verifier_rejects_wrong_audience_and_issuer(key_pair):
+    private_pem, cert_pem = key_pair
+    verifier = GoogleTokenVerifier(CLIENT_ID, StaticCertSource({KEY_ID: cert_pem}))
+    with pytest.raises(ValueError):
+        verifier.verify(make_token(private_pem, aud="someone-else"))
+    with pytest.raises(ValueError):
+        verifier.verify(make_token(private_pem, iss="https://evil.example.com"))
+
+
+class FakeResponse:
+    def __init__(self, certs, headers):
+        self.status_code = 200
+        self.headers = headers
+        self._certs = certs
+
+    def json(self):
+        return self._certs
+
+
+class FakeSession:
+    def __init__(self, certs, headers):
+        self.certs = certs
+        self.headers = headers
+        self.calls = 0
+
+    def get(self, url, timeout=None):
+        self.calls += 1
+        return FakeResponse(self.certs, self.headers)
+
+
+def test_cert_cache_honors_max_age(key_pair):
+    _, cert_pem = key_pair
+    session = FakeSession({KEY_ID: cert_pem}, {"Cache-Control": "public, max-age=600"})
+    cache = GoogleCertCache(session=session)
+    cache.get_certs()
+    cache.get_certs()
+    assert session.calls == 1
+
+    session = FakeSession({KEY_ID: cert_pem}, {"Cache-Control": "no-cache"})
+    cache = GoogleCertCache(session=session)
+    cache.get_certs()
+    cache.get_certs()
+    assert session.calls == 2
+
+
+def test_parse_max_age_subtracts_age():
+    assert parse_max_age({"Cache-Control": "public, max-age=100", "Age": "40"}) == 60
+    assert parse_max_age({}) is None
+
+
+def test_google_login_new_user(key_pair, override_get_db):
+    private_pem, cert_pem = key_pair
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api")
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[auth.get_google_verifier] = lambda: GoogleTokenVerifier(
+        CLIENT_ID, StaticCertSource({KEY_ID: cert_pem})
+    )
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/auth/google", json={"credential": make_token(private_pem)}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["user"]["email"] == "test@example.com"
+    assert body["user"]["role"] == "user"
+
+    response = client.post("/api/auth/google", json={"credential": "not-a-jwt"})
+    assert response.status_code == 401
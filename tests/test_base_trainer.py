@@ -0,0 +1,46 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.backend.core.rescoring import ReplayResults
+from src.backend.exercises.base_trainer import BaseTrainer, angle_deg, angle_xy
+from src.backend.exercises.bicep_curl_trainer import BicepCurlTrainer
+
+
+def arm_frame(elbow_angle):
+    """Left arm with the given elbow angle: shoulder above the elbow, wrist swung around it"""
+    frame = np.full((33, 4), 0.5, dtype=np.float32)
+    frame[11, :2] = (0.5, 0.3)
+    frame[13, :2] = (0.5, 0.5)
+    theta = math.radians(elbow_angle)
+    frame[15, :2] = (0.5 + 0.2 * math.sin(theta), 0.5 - 0.2 * math.cos(theta))
+    return frame
+
+
+def test_angle_xy_matches_angle_deg():
+    rng = np.random.default_rng(0)
+    for a, b, c in rng.uniform(0, 640, size=(20, 3, 2)):
+        assert angle_xy(*a, *b, *c) == pytest.approx(angle_deg(a, b, c), abs=1e-6)
+
+
+def test_unknown_landmarks_are_rejected():
+    with pytest.raises(ValueError, match="LEFT_ELBOWW"):
+        type("Broken", (BaseTrainer,), {"LANDMARKS": ("LEFT_ELBOWW",)})
+    assert BicepCurlTrainer.LANDMARK_IDS == (11, 12, 13, 14, 15, 16)
+
+
+def test_bicep_curl_counts_reps_and_reuses_result():
+    trainer = BicepCurlTrainer(use_enhanced_processor=False)
+    results = ReplayResults()
+    first = trainer.process_frame(results.load(arm_frame(170)), 480, 480)
+    for angle in [90, 20, 90, 170, 90, 20, 170]:
+        output = trainer.process_frame(results.load(arm_frame(angle)), 480, 480)
+        assert output is first
+    assert output["reps"] == 2
+    assert output["angles"]["elbow"] == pytest.approx(170, abs=0.5)
+    assert output["progress"] == 1.0
+
+    missing = np.full((33, 4), np.nan, dtype=np.float32)
+    output = trainer.process_frame(results.load(missing), 480, 480)
+    assert output["feedback"] == BicepCurlTrainer.NO_POSE_MESSAGE and output["angles"] == {}
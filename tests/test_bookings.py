@@ -0,0 +1,59 @@
+from src.backend.database.models import User
+
+
+def add_user(session_factory, email):
+    db = session_factory()
+    user = User(name=email.split("@")[0], email=email)
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+    return user_id
+
+
+def booking(time="09:00 AM"):
+    # 2025-12-22 is a Monday
+    return {"name": "Consult", "day": "Monday", "time": time, "booking_date": "2025-12-22"}
+
+
+def test_double_booking_is_rejected_by_the_index(session_factory, client_for):
+    alice = client_for(add_user(session_factory, "alice@example.com"))
+    bob = client_for(add_user(session_factory, "bob@example.com"))
+
+    assert alice.post("/api/bookings/", json=booking()).status_code == 201
+    response = bob.post("/api/bookings/", json=booking())
+    assert response.status_code == 409
+    assert response.json()["detail"] == "This time slot is already booked"
+
+    # A different slot on the same day is still free
+    assert bob.post("/api/bookings/", json=booking("11:00 AM")).status_code == 201
+
+
+def test_availability_window(session_factory, client_for):
+    alice = client_for(add_user(session_factory, "alice@example.com"))
+    bob = client_for(add_user(session_factory, "bob@example.com"))
+    alice.post("/api/bookings/", json=booking())
+    bob.post("/api/bookings/", json=booking("04:00 PM"))
+
+    response = alice.get(
+        "/api/bookings/availability",
+        params={"start_date": "2025-12-22", "end_date": "2025-12-28"},
+    )
+    assert response.status_code == 200
+    days = response.json()
+    assert [d["day"] for d in days][0] == "Monday"
+    assert len(days) == 7
+    monday = {s["time"]: s["status"] for s in days[0]["slots"]}
+    assert monday == {
+        "09:00 AM": "mine",
+        "11:00 AM": "available",
+        "04:00 PM": "booked",
+        "05:00 PM": "available",
+    }
+    assert days[-1]["slots"] == []  # Sunday
+
+    too_long = alice.get(
+        "/api/bookings/availability",
+        params={"start_date": "2025-01-01", "end_date": "2025-03-01"},
+    )
+    assert too_long.status_code == 400
@@ -0,0 +1,48 @@
+import csv
+from types import SimpleNamespace
+
+from src.backend.training.data_collector import DataCollector, export_csv, read_session_meta
+
+METRICS = {
+    "hip_angle": 85.5,
+    "dorsi_angle": 95.0,
+    "progress": 0.25,
+    "rep_count": 3,
+    "heels_position": "good",
+    "achilles_touch": "touching",
+    "back_arch": "no_arch",
+}
+
+
+def fake_results(i, detected=True):
+    if not detected:
+        return SimpleNamespace(pose_landmarks=None)
+    landmarks = [SimpleNamespace(x=i + 0.5, y=k * 0.25, z=-1.0) for k in range(33)]
+    return SimpleNamespace(pose_landmarks=SimpleNamespace(landmark=landmarks))
+
+
+def collect(collector, frames):
+    collector.start_session("left")
+    for i in range(frames):
+        label = "correct_posture" if i % 2 else "incorrect_posture"
+        collector.collect_frame(fake_results(i, detected=i != 3), "left", label, METRICS)
+    collector.stop_session()
+    return collector.session_path
+
+
+def read_rows(path):
+    with open(path, newline="") as f:
+        # Timestamps differ between the two runs; everything else must match
+        return [row[1:] for row in csv.reader(f)]
+
+
+def test_binary_session_exports_same_csv_as_csv_mode(tmp_path):
+    csv_path = collect(DataCollector(str(tmp_path / "csv"), mode="csv"), frames=600)
+
+    session_dir = collect(DataCollector(str(tmp_path / "bin")), frames=600)
+    meta = read_session_meta(session_dir)
+    assert meta["frames"] == 600
+    assert [c["frames"] for c in meta["chunks"]] == [256, 256, 88]
+
+    exported = export_csv(session_dir)
+    assert read_rows(exported) == read_rows(csv_path)
@@ -0,0 +1,74 @@
+import csv
+
+import numpy as np
+
+from src.backend.training.data_collector import LANDMARK_COLUMNS
+from src.backend.training.dataset_store import DatasetStore
+
+
+def write_csv(path, rows, label):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["timestamp", "frame_number", "side", "label"] + LANDMARK_COLUMNS)
+        for i in range(rows):
+            writer.writerow(["t", i, "left", label] + [i] * len(LANDMARK_COLUMNS))
+
+
+def test_only_new_files_are_ingested(tmp_path):
+    write_csv(tmp_path / "a.csv", 5, "correct")
+    store = DatasetStore(str(tmp_path))
+    assert store.sync() == 5
+    assert store.sync() == 0
+
+    write_csv(tmp_path / "b.csv", 3, "wrong")
+    store = DatasetStore(str(tmp_path))
+    assert store.sync() == 3
+    assert store.manifest["sources"]["b.csv"]["start"] == 5
+    assert store.label_names == ["correct", "wrong"]
+    assert store.features().shape == (8, 99)
+    np.testing.assert_array_equal(store.labels(), [0] * 5 + [1] * 3)
+
+    # Editing an ingested file rebuilds the store from scratch
+    write_csv(tmp_path / "a.csv", 2, "correct")
+    assert store.sync() == 5
+    assert len(store) == 5
+
+
+def test_iter_batches_covers_indices_once(tmp_path):
+    write_csv(tmp_path / "a.csv", 10, "correct")
+    store = DatasetStore(str(tmp_path))
+    store.sync()
+
+    seen = []
+    for X, y in store.iter_batches(batch_size=4, indices=np.arange(2, 10), seed=0):
+        assert X.dtype == np.float32 and len(X) <= 4
+        seen.extend(X[:, 0].astype(int))
+    assert sorted(seen) == list(range(2, 10))
+
+
+def test_interrupted_sync_is_truncated(tmp_path):
+    write_csv(tmp_path / "a.csv", 4, "correct")
+    store = DatasetStore(str(tmp_path))
+    store.sync()
+    with open(tmp_path / ".dataset_cache" / "features.f32", "ab") as f:
+        f.write(b"\0" * 99 * 4)  # rows written but never recorded in the manifest
+
+    store = DatasetStore(str(tmp_path))
+    assert len(store) == 4
+    assert (tmp_path / ".dataset_cache" / "features.f32").stat().st_size == 4 * 99 * 4
+
+
+def test_holdout_split_is_stable_across_syncs(tmp_path):
+    write_csv(tmp_path / "a.csv", 200, "correct")
+    store = DatasetStore(str(tmp_path))
+    store.sync()
+    train, holdout = store.split_indices(0.25)
+    assert len(train) + len(holdout) == 200 and 20 < len(holdout) < 80
+
+    write_csv(tmp_path / "b.csv", 50, "wrong")
+    store.sync()
+    train_after, holdout_after = store.split_indices(0.25)
+    assert set(holdout) <= set(holdout_after) and set(train) <= set(train_after)
+
+    new_train, new_holdout = store.split_indices(0.25, sources=["b.csv"])
+    assert set(new_train) | set(new_holdout) == set(range(200, 250))
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from src.backend.database.models import DietEntry, User
+
+
+def seed(session_factory):
+    db = session_factory()
+    user = User(name="Eater", email="eater@example.com")
+    other = User(name="Other", email="other@example.com")
+    db.add_all([user, other])
+    db.commit()
+    db.add_all([
+        DietEntry(user_id=user.id, meal_name="Breakfast", food_item="Eggs",
+                  date=datetime(2025, 3, 1, 8), protein=12.0, calories=150.0, zinc=1.0),
+        DietEntry(user_id=user.id, meal_name="Lunch", food_item="Chicken",
+                  date=datetime(2025, 3, 1, 13), protein=40.0, calories=300.0),
+        DietEntry(user_id=user.id, meal_name="Dinner", food_item="Dal",
+                  date=datetime(2025, 3, 3, 20), protein=18.0, carbs=40.0),
+        DietEntry(user_id=other.id, meal_name="Lunch", food_item="Not mine",
+                  date=datetime(2025, 3, 1, 13), protein=99.0),
+    ])
+    db.commit()
+    user_id = user.id
+    db.close()
+    return user_id
+
+
+def test_daily_stats_single_aggregate(session_factory, client_for):
+    client = client_for(seed(session_factory))
+    stats = client.get("/api/diet/stats", params={"target_date": "2025-03-01"}).json()
+    assert stats["total_protein"] == 52.0
+    assert stats["total_calories"] == 450.0
+    assert stats["total_zinc"] == 1.0
+    assert stats["entries_count"] == 2
+
+    empty = client.get("/api/diet/stats", params={"target_date": "2025-03-02"}).json()
+    assert empty["total_protein"] == 0.0
+    assert empty["entries_count"] == 0
+
+
+def test_range_stats_one_row_per_day(session_factory, client_for):
+    client = client_for(seed(session_factory))
+    response = client.get(
+        "/api/diet/stats/range",
+        params={"start_date": "2025-03-01", "end_date": "2025-03-03"},
+    )
+    assert response.status_code == 200
+    days = response.json()
+    assert [d["date"] for d in days] == ["2025-03-01", "2025-03-02", "2025-03-03"]
+    assert [d["total_protein"] for d in days] == [52.0, 0.0, 18.0]
+    assert days[2]["total_carbs"] == 40.0
+
+
+def test_range_stats_rejects_inverted_range(session_factory, client_for):
+    client = client_for(seed(session_factory))
+    response = client.get(
+        "/api/diet/stats/range",
+        params={"start_date": "2025-03-03", "end_date": "2025-03-01"},
+    )
+    assert response.status_code == 400
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from src.backend.core.exercise_analyzer import PostureRules
+
+BASELINE = {'hip_position': (320.0, 240.0), 'knee_y': 330.0, 'target_knee_y': 300.0}
+
+
+def random_frames(n, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = np.empty((n, 33, 2))
+    frames[..., 0] = rng.uniform(0, 640, size=(n, 33))
+    frames[..., 1] = rng.uniform(0, 480, size=(n, 33))
+    # Keep hips near the baseline and heels near the hips so every status occurs
+    frames[:, [23, 24]] = np.array(BASELINE['hip_position']) + rng.normal(0, 20, size=(n, 2, 2))
+    frames[:, [29, 30]] = frames[:, [23, 24]] + rng.normal(0, 25, size=(n, 2, 2))
+    return frames
+
+
+@pytest.mark.parametrize("side", ["left", "right"])
+def test_batch_matches_per_frame_evaluation(side):
+    rules = PostureRules()
+    frames = random_frames(300)
+
+    batch = rules.evaluate_posture_batch(frames, side, BASELINE, 640, 480)
+
+    for i, frame in enumerate(frames):
+        single = rules.evaluate_posture({j: tuple(p) for j, p in enumerate(frame)}, side, BASELINE, 640, 480)
+        assert set(single) == set(batch)
+        for name, value in single.items():
+            if name == 'overall_label':
+                assert batch[name][i] == value
+            else:
+                assert (bool(batch[name][0][i]), str(batch[name][1][i])) == value, name
+
+
+def test_missing_landmarks_fail_only_the_rules_that_use_them():
+    rules = PostureRules()
+    frames = random_frames(2)
+    frames[1, 31] = np.nan  # left foot
+
+    batch = rules.evaluate_posture_batch(frames, "left", {}, 640, 480)
+
+    assert batch['achilles_touch'][1][1] == "missing_landmarks"
+    assert batch['dorsiflexion'][1][1] == "missing_landmarks"
+    assert batch['heels_position'][1][1] != "missing_landmarks"
+    assert 'hip_stability' not in batch and 'range_status' not in batch
@@ -0,0 +1,75 @@
+import json
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.backend.api import routes
+from src.backend.api.exercise_catalog import DEFAULT_CATALOG_PATH, CatalogLoader, load_catalog_file
+
+
+def catalog_exercises():
+    with open(DEFAULT_CATALOG_PATH, encoding="utf-8") as f:
+        return json.load(f)["exercises"]
+
+
+def make_client():
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/api")
+    return TestClient(app)
+
+
+def test_list_matches_filters_and_revalidates():
+    client = make_client()
+    response = client.get("/api/exercises")
+    assert response.status_code == 200
+    assert len(response.json()) == len(catalog_exercises())
+    etag = response.headers["ETag"]
+
+    cached = client.get("/api/exercises", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    lower = client.get("/api/exercises", params={"category": "lower"}).json()
+    assert lower == [e for e in response.json() if e["category"] == "lower"]
+    assert client.get("/api/exercises", params={"category": "nope"}).json() == []
+
+
+def test_single_exercise_lookup_and_etag():
+    client = make_client()
+    first_id = catalog_exercises()[0]["id"]
+    response = client.get(f"/api/exercises/{first_id}")
+    assert response.status_code == 200
+    assert response.json()["id"] == first_id
+
+    weak = "W/" + response.headers["ETag"]
+    assert client.get(f"/api/exercises/{first_id}", headers={"If-None-Match": weak}).status_code == 304
+    assert client.get("/api/exercises/does-not-exist").status_code == 404
+
+
+def test_loader_reloads_changed_file_and_keeps_last_good(tmp_path):
+    path = tmp_path / "exercises.json"
+    exercise = catalog_exercises()[0]
+    path.write_text(json.dumps({"version": 1, "exercises": [exercise]}))
+    loader = CatalogLoader(path, reload_interval=0)
+    first = loader.get()
+    assert len(first) == 1
+    assert loader.get() is first
+
+    renamed = dict(exercise, id="renamed")
+    path.write_text(json.dumps({"version": 1, "exercises": [exercise, renamed]}))
+    os.utime(path, (1, 1))
+    second = loader.get()
+    assert second.get("renamed") is not None
+
+    path.write_text("{broken")
+    os.utime(path, (2, 2))
+    assert loader.get() is second
+
+
+def test_rejects_unknown_version(tmp_path):
+    path = tmp_path / "exercises.json"
+    path.write_text(json.dumps({"version": 99, "exercises": []}))
+    with pytest.raises(ValueError):
+        load_catalog_file(path)
@@ -0,0 +1,130 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.backend.core.form_rules import LANDMARK_INDEX, CompiledRules, FormChecker, FormRule
+from src.backend.exercises.glute_fly import GluteFlyTrainer, angle_deg, smooth
+
+W, H = 640, 480
+
+
+def blank_frame():
+    return np.full((33, 2), 0.5)
+
+
+def test_metrics_are_computed_in_pixels():
+    frame = blank_frame()
+    frame[LANDMARK_INDEX["LEFT_HIP"]] = (0.5, 0.5)
+    frame[LANDMARK_INDEX["RIGHT_HIP"]] = (0.7, 0.5)
+    frame[LANDMARK_INDEX["LEFT_KNEE"]] = (0.5, 0.75)
+    frame[LANDMARK_INDEX["LEFT_ANKLE"]] = (0.75, 0.75)
+    rules = CompiledRules([
+        FormRule("knee", "", "angle", ("HIP", "KNEE", "ANKLE")),
+        FormRule("shin", "", "vertical_angle", ("ANKLE", "KNEE")),
+        FormRule("hip_width", "", "distance", ("LEFT_HIP", "RIGHT_HIP"), scale="width"),
+        FormRule("drop", "", "offset", ("KNEE", "MID_HIP"), axis="y"),
+        FormRule("pelvis", "", "position", ("MID_HIP",), axis="x"),
+        FormRule("ratio", "", "ratio", ("LEFT_HIP", "RIGHT_HIP", "LEFT_KNEE", "LEFT_ANKLE")),
+        FormRule("torso", "", "input", ("torso",)),
+    ], side="left")
+
+    values = rules.evaluate(frame[None], W, H, inputs={"torso": 42.0})[0]
+
+    np.testing.assert_allclose(values, [90, 90, 0.2, 120, 384, 128 / 160, 42], atol=1e-6)
+    assert np.isnan(rules.evaluate(frame[None], W, H)[0, 6])  # missing input
+
+
+def test_persistence_cooldown_groups_and_baselines():
+    shared = dict(cooldown=2.0, cooldown_group="form")
+    checker = FormChecker([
+        FormRule("slow", "Slow", "input", ("a",), max=1, persist_frames=2),
+        FormRule("fast", "Fast", "input", ("b",), max=1, **shared),
+        FormRule("also_fast", "Fast", "input", ("c",), max=1, **shared),
+        FormRule("drift", "Drift", "position", ("MID_HIP",), axis="x", scale="width",
+                 relative_to_baseline=True, max=0.05),
+    ])
+    frame = blank_frame()
+
+    def step(t, a=0, b=0, c=0):
+        return checker.update(frame, W, H, now=t, inputs={"a": a, "b": b, "c": c})
+
+    assert step(0, a=5) == [] and step(1, a=5) == []
+    assert step(2, a=5) == ["Slow"]  # third violating frame
+    assert step(3, b=5, c=5) == ["Fast"]  # deduplicated
+    assert step(4, c=5) == []  # group still cooling down
+    assert step(5.5, c=5) == ["Fast"]
+
+    # No baseline yet: the relative rule can't fire
+    frame[[23, 24], 0] = 0.9
+    assert step(10) == []
+    for x in (0.5, 0.52):
+        frame[[23, 24], 0] = x
+        checker.add_baseline_frame(frame, W, H)
+    checker.finish_baseline()
+    assert checker.baseline[3] == pytest.approx(0.51)
+    frame[[23, 24], 0] = 0.58
+    assert step(11) == ["Drift"]
+
+
+def reference_glute_warnings(trainer, frames, baseline_pelvis_x, baseline_lrhip_dx):
+    """The hand-written checks GluteFlyTrainer._handle_exercise used before form rules"""
+    sm_pelvis_x = sm_lrhip_dx = sm_dorsi = None
+    vio = {'pelvis_shift': 0, 'hip_roll': 0, 'dorsi': 0}
+    out = []
+    for frame in frames:
+        px = frame * (W, H)
+        lhip, rhip = px[23], px[24]
+        pelvis_x = (lhip[0] + rhip[0]) / 2.0
+        lrhip_dx = abs(lhip[0] - rhip[0])
+        sm_pelvis_x = smooth(sm_pelvis_x, pelvis_x, 0.35)
+        sm_lrhip_dx = smooth(sm_lrhip_dx, lrhip_dx, 0.35)
+        sm_dorsi = smooth(sm_dorsi, angle_deg(px[25], px[27], px[31]), 0.35)
+        warnings = []
+        checks = [
+            ('pelvis_shift', abs(sm_pelvis_x - baseline_pelvis_x) > trainer.PELVIS_MAX_X_SHIFT_FRAC * W,
+             "Keep hips stable! Don't rock forward/back."),
+            ('hip_roll', abs(sm_lrhip_dx - baseline_lrhip_dx) > trainer.HIP_ROLL_MAX_DIFF_FRAC * W,
+             "Don't let pelvis roll back!"),
+            ('dorsi', not (trainer.DORSI_MIN <= sm_dorsi <= trainer.DORSI_MAX),
+             "Keep ankle bent (toes to shin)"),
+        ]
+        for key, violated, message in checks:
+            if violated:
+                vio[key] += 1
+                if vio[key] > trainer.VIOLATION_PERSIST_FRAMES:
+                    warnings.append(message)
+            else:
+                vio[key] = max(0, vio[key] - 1)
+        out.append(warnings)
+    return out
+
+
+def test_glute_fly_rules_match_the_original_checks():
+    trainer = GluteFlyTrainer()
+    rng = np.random.default_rng(0)
+    start = rng.uniform(0.3, 0.7, size=(33, 2))
+    frames = start + np.cumsum(rng.normal(0, 0.01, size=(300, 33, 2)), axis=0)
+
+    calibration = frames[:30]
+    baseline_pelvis_x = np.mean(calibration[:, [23, 24], 0].mean(axis=1) * W)
+    baseline_lrhip_dx = np.mean(np.abs(calibration[:, 23, 0] - calibration[:, 24, 0]) * W)
+    expected = reference_glute_warnings(trainer, frames[30:], baseline_pelvis_x, baseline_lrhip_dx)
+
+    checker = FormChecker(trainer.form_rules(), "left")
+    for frame in calibration:
+        checker.add_baseline_frame(frame, W, H)
+    checker.finish_baseline()
+    actual = [checker.update(frame, W, H, now=float(i)) for i, frame in enumerate(frames[30:])]
+
+    assert actual == expected
+    assert any(expected)
+    assert math.isclose(checker.value("dorsiflexion"), reference_dorsi(frames[30:]), rel_tol=1e-6)
+
+
+def reference_dorsi(frames):
+    sm = None
+    for frame in frames:
+        px = frame * (W, H)
+        sm = smooth(sm, angle_deg(px[25], px[27], px[31]), 0.35)
+    return sm
@@ -0,0 +1,64 @@
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.backend.api import auth
+from src.backend.auth.hashing import HashingExecutor
+from src.backend.database.db import get_db
+
+
+def make_client(override_get_db):
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api")
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+
+def test_register_and_login_count_hashing_work(monkeypatch, override_get_db):
+    executor = HashingExecutor(max_workers=1, max_queue=4)
+    monkeypatch.setattr(auth, "hashing_executor", executor)
+    client = make_client(override_get_db)
+
+    credentials = {"email": "runner@example.com", "password": "s3cret-pass"}
+    assert client.post("/api/auth/register", json=credentials).status_code == 200
+    assert client.post("/api/auth/login", json=credentials).status_code == 200
+    bad = client.post("/api/auth/login", json={**credentials, "password": "wrong"})
+    assert bad.status_code == 401
+
+    stats = executor.get_stats()
+    assert stats["completed"] == 3
+    assert stats["rejected"] == 0
+    assert stats["running"] == 0 and stats["queued"] == 0
+    assert stats["peak_pending"] == 1
+    executor.shutdown()
+
+
+def test_full_queue_returns_503_with_retry_after(monkeypatch, override_get_db):
+    executor = HashingExecutor(max_workers=1, max_queue=0)
+    monkeypatch.setattr(auth, "hashing_executor", executor)
+    client = make_client(override_get_db)
+
+    release = threading.Event()
+    started = threading.Event()
+
+    def hold():
+        started.set()
+        release.wait(5)
+
+    blocker = executor.submit(hold)
+    started.wait(5)
+    try:
+        response = client.post("/api/auth/register", json={"email": "burst@example.com", "password": "pw"})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "2"
+        assert executor.get_stats()["running"] == 1
+    finally:
+        release.set()
+        blocker.result(5)
+
+    stats = executor.get_stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 1
+    assert stats["peak_pending"] == 1
+    executor.shutdown()
@@ -0,0 +1,109 @@
+import csv
+import json
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("tensorflow")
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+
+from src.backend.training.data_collector import LANDMARK_COLUMNS
+from src.backend.training.dataset_store import DatasetStore
+from src.backend.training.ml_trainer import TRAINING_STATE_FILE, MLTrainer
+
+
+def write_csv(path, rows, label, seed=0):
+    values = np.random.default_rng(seed).normal(size=(rows, len(LANDMARK_COLUMNS)))
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["timestamp", "frame_number", "side", "label"] + LANDMARK_COLUMNS)
+        for i, row in enumerate(values):
+            writer.writerow(["t", i, "left", label] + list(row))
+
+
+def synced_store(data_dir):
+    store = DatasetStore(str(data_dir))
+    store.sync()
+    return store
+
+
+@pytest.fixture
+def trained(tmp_path):
+    """A single-frame model saved after a full run on a.csv and b.csv"""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    write_csv(data_dir / "a.csv", 40, "correct", seed=1)
+    write_csv(data_dir / "b.csv", 40, "wrong", seed=2)
+    trainer = MLTrainer(data_dir=str(data_dir), model_dir=str(tmp_path / "models"))
+    trainer.train_from_store(synced_store(data_dir), epochs=1)
+    return trainer, data_dir, trainer.save_model("model")
+
+
+def fake_full_retrain(monkeypatch, trainer):
+    calls = []
+    monkeypatch.setattr(trainer, "train_from_store", lambda store, **kwargs: calls.append("store") or "history")
+    monkeypatch.setattr(trainer, "train_temporal_model", lambda data, **kwargs: calls.append(kwargs["window"]) or "history")
+    monkeypatch.setattr(trainer, "load_training_data", lambda: None)
+    return calls
+
+
+def test_nothing_new_skips_training(trained, monkeypatch):
+    trainer, data_dir, model_path = trained
+    calls = fake_full_retrain(monkeypatch, trainer)
+    assert trainer.train_incremental(synced_store(data_dir), model_path) is None
+    assert calls == []
+
+
+def test_changed_source_or_new_label_retrains_from_store(trained, monkeypatch):
+    trainer, data_dir, model_path = trained
+    calls = fake_full_retrain(monkeypatch, trainer)
+
+    write_csv(data_dir / "c.csv", 20, "too_fast")
+    assert trainer.train_incremental(synced_store(data_dir), model_path) == "history"
+    (data_dir / "c.csv").unlink()
+
+    write_csv(data_dir / "a.csv", 30, "correct", seed=3)
+    assert trainer.train_incremental(synced_store(data_dir), model_path) == "history"
+    assert calls == ["store", "store"]
+
+
+def test_missing_state_retrains_from_store(trained, monkeypatch):
+    trainer, data_dir, model_path = trained
+    os.remove(os.path.join(model_path, TRAINING_STATE_FILE))
+    calls = fake_full_retrain(monkeypatch, trainer)
+    write_csv(data_dir / "c.csv", 20, "correct")
+    assert trainer.train_incremental(synced_store(data_dir), model_path) == "history"
+    assert calls == ["store"]
+
+
+def test_temporal_model_retrains_with_its_window(trained, monkeypatch):
+    trainer, data_dir, model_path = trained
+    with open(os.path.join(model_path, "features.json"), "w") as f:
+        json.dump({"window": 8}, f)
+    calls = fake_full_retrain(monkeypatch, trainer)
+    write_csv(data_dir / "c.csv", 20, "correct")
+    assert trainer.train_incremental(synced_store(data_dir), model_path) == "history"
+    assert calls == [8]
+
+
+def test_incremental_run_records_sources_and_replays_old_rows(trained):
+    trainer, data_dir, model_path = trained
+    write_csv(data_dir / "c.csv", 30, "correct", seed=4)
+    store = synced_store(data_dir)
+
+    assert trainer.train_incremental(store, model_path, epochs=1, replay_fraction=0.5) is not None
+    trainer.save_model("model")
+    with open(os.path.join(model_path, TRAINING_STATE_FILE)) as f:
+        state = json.load(f)
+
+    sources = store.manifest["sources"]
+    assert state["sources"] == {name: entry["sha256"] for name, entry in sources.items()}
+    new_train, _ = store.split_indices(state["test_size"], ["c.csv"])
+    old_train, _ = store.split_indices(state["test_size"], ["a.csv", "b.csv"])
+    _, holdout = store.split_indices(state["test_size"])
+    first, update = state["runs"]
+    assert not first["incremental"] and update["incremental"]
+    assert update["train_rows"] == len(new_train) + min(len(old_train), int(len(new_train) * 0.5))
+    assert update["holdout_rows"] == len(holdout)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from src.backend.training.model_registry import ModelRegistry
+from src.backend.training.numpy_predictor import NUMPY_MODEL_FILE
+
+
+def write_model(path, bias, window=1):
+    """Constant two-class model: the bias decides the label"""
+    features = 99 if window == 1 else 147
+    path.mkdir(parents=True, exist_ok=True)
+    np.savez(
+        path / NUMPY_MODEL_FILE,
+        meta=np.array(f'{{"version": 1, "activations": ["softmax"], "window": {window}}}'),
+        scaler_mean=np.zeros(features),
+        scaler_scale=np.ones(features),
+        classes=np.array(["correct", "hip_turn"]),
+        W0=np.zeros((features, 2), dtype=np.float32),
+        b0=np.array(bias, dtype=np.float32),
+    )
+    return str(path)
+
+
+def test_publish_serves_latest_and_hot_swaps(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "registry"), check_interval=0)
+    with pytest.raises(LookupError):
+        registry.get("glute_fly")
+
+    assert registry.publish("glute_fly", write_model(tmp_path / "m1", [5, 0])) == "v0001"
+    session = registry.session("glute_fly")
+    assert session.predict_posture(np.zeros(99))[0] == "correct"
+    assert registry.get("glute_fly") is registry.get("glute_fly")  # loaded once, shared
+
+    assert registry.publish("glute_fly", write_model(tmp_path / "m2", [0, 5])) == "v0002"
+    assert session.predict_posture(np.zeros(99))[0] == "hip_turn"
+    assert session.version == "v0002"
+    assert registry.metadata("glute_fly")["classes"] == ["correct", "hip_turn"]
+
+    registry.activate("glute_fly", "v0001")  # roll back
+    assert session.predict_posture(np.zeros(99))[0] == "correct"
+
+
+def test_broken_artifacts_are_not_published(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "registry"), check_interval=0)
+    registry.publish("glute_fly", write_model(tmp_path / "m1", [5, 0]))
+    (tmp_path / "bad").mkdir()
+    (tmp_path / "bad" / NUMPY_MODEL_FILE).write_bytes(b"not a model")
+
+    with pytest.raises(Exception):
+        registry.publish("glute_fly", str(tmp_path / "bad"))
+    assert registry.versions("glute_fly") == ["v0001"]
+    assert sorted(p.name for p in (tmp_path / "registry" / "glute_fly").iterdir()) == ["CURRENT", "v0001"]
+
+
+def test_sessions_keep_their_own_temporal_history(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    registry.publish("glute_fly", write_model(tmp_path / "m1", [5, 0], window=3))
+    first, second = registry.session("glute_fly"), registry.session("glute_fly")
+    frame = np.random.default_rng(0).uniform(0.2, 0.8, size=99)
+
+    assert [first.predict_posture(frame)[0] for _ in range(3)] == [None, None, "correct"]
+    assert second.predict_posture(frame) == (None, 0.0)
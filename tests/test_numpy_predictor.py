@@ -0,0 +1,90 @@
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.backend.training.numpy_predictor import NumpyPosturePredictor, export_numpy_model
+
+
+class Dense:
+    def __init__(self, weights, bias, activation):
+        self.name = "dense"
+        self._weights = [weights, bias]
+        self._activation = activation
+
+    def get_config(self):
+        return {"activation": self._activation}
+
+    def get_weights(self):
+        return self._weights
+
+
+class Dropout:
+    pass
+
+
+def reference_forward(layers, mean, scale, x):
+    h = (x - mean) / scale
+    for W, b, activation in layers:
+        h = h @ W + b
+        if activation == "relu":
+            h = np.maximum(h, 0)
+        else:
+            e = np.exp(h - h.max(axis=1, keepdims=True))
+            h = e / e.sum(axis=1, keepdims=True)
+    return h
+
+
+def test_exported_model_matches_reference(tmp_path):
+    rng = np.random.default_rng(0)
+    layers = [
+        (rng.normal(size=(99, 16)), rng.normal(size=16), "relu"),
+        (rng.normal(size=(16, 3)), rng.normal(size=3), "softmax"),
+    ]
+    model = SimpleNamespace(layers=[Dense(*layers[0]), Dropout(), Dense(*layers[1])])
+    scaler = SimpleNamespace(mean_=rng.normal(size=99), scale_=rng.uniform(0.5, 2, size=99))
+    encoder = SimpleNamespace(classes_=np.array(["bad_back", "correct", "hip_turn"]))
+
+    path = export_numpy_model(model, scaler, encoder, str(tmp_path / "posture_model.npz"))
+    predictor = NumpyPosturePredictor.load(str(tmp_path))  # model directory works too
+
+    X = rng.normal(size=(5, 99))
+    expected = reference_forward(layers, scaler.mean_, scaler.scale_, X)
+    np.testing.assert_allclose(predictor.predict_proba(X), expected, rtol=1e-4, atol=1e-5)
+
+    landmarks = {i: tuple(X[0, 3 * i:3 * i + 3]) for i in range(33)}
+    label, confidence = predictor.predict_posture(landmarks)
+    assert label == encoder.classes_[expected[0].argmax()]
+    assert abs(confidence - expected[0].max()) < 1e-4
+    assert path.endswith(".npz")
+
+
+def test_predict_batch_matches_single_frame_and_skips_missing_pose():
+    rng = np.random.default_rng(1)
+    predictor = NumpyPosturePredictor(
+        [rng.normal(size=(99, 8)), rng.normal(size=(8, 2))],
+        [rng.normal(size=8), rng.normal(size=2)],
+        ["relu", "softmax"],
+        ["correct", "hip_turn"],
+    )
+    recorded = rng.normal(size=(10, 33, 4)).astype(np.float32)
+    recorded[4] = np.nan  # no pose detected
+
+    labels, confidences = predictor.predict_batch(recorded, chunk_size=3)
+
+    assert labels[4] is None and confidences[4] == 0
+    for i in (0, 5, 9):
+        label, confidence = predictor.predict_posture(recorded[i, :, :3].ravel())
+        assert labels[i] == label
+        assert abs(confidences[i] - confidence) < 1e-5
+
+    streamed = list(predictor.predict_stream([recorded[:6], recorded[6:]]))
+    assert np.concatenate([labels for labels, _ in streamed]).tolist() == labels.tolist()
+
+
+def test_model_saved_before_numpy_export_asks_for_re_export(tmp_path, monkeypatch):
+    (tmp_path / "model.h5").write_bytes(b"keras weights")
+    monkeypatch.setitem(sys.modules, "tensorflow", None)  # TensorFlow isn't installed on the server
+    with pytest.raises(FileNotFoundError, match="re-run train_model.py"):
+        NumpyPosturePredictor.load(str(tmp_path))
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+from src.backend.database.models import DietEntry, Exercise, User, Workout
+
+
+def seed(session_factory):
+    db = session_factory()
+    user = User(name="Pager", email="pager@example.com")
+    db.add(user)
+    db.add(Exercise(id="squat", name="Squat"))
+    db.commit()
+    user_id = user.id
+
+    same_time = datetime(2025, 1, 10, 8, 0)
+    for i in range(7):
+        # Two rows share a timestamp so the id tie-breaker is exercised
+        when = same_time if i < 2 else same_time - timedelta(days=i)
+        db.add(Workout(user_id=user_id, exercise_id="squat", date=when,
+                       duration_seconds=60, reps_completed=i))
+        db.add(DietEntry(user_id=user_id, meal_name="Lunch", food_item=f"item {i}", date=when))
+    db.commit()
+    db.close()
+    return user_id
+
+
+def walk_pages(client, url):
+    ids, cursor = [], None
+    while True:
+        params = {"limit": 3, "start_date": "2024-01-01T00:00:00"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(url, params=params)
+        assert response.status_code == 200
+        ids.extend(row["id"] for row in response.json())
+        if response.headers["X-Has-More"] == "false":
+            assert "X-Next-Cursor" not in response.headers
+            return ids
+        cursor = response.headers["X-Next-Cursor"]
+
+
+def test_workout_history_keyset_pages(session_factory, client_for):
+    client = client_for(seed(session_factory))
+    ids = walk_pages(client, "/api/workouts/history")
+    assert len(ids) == 7
+    assert len(set(ids)) == 7
+    # Tie on date is broken by id descending
+    assert ids[:2] == [2, 1]
+
+
+def test_diet_entries_keyset_pages(session_factory, client_for):
+    client = client_for(seed(session_factory))
+    ids = walk_pages(client, "/api/diet/entries")
+    assert len(set(ids)) == 7
+    assert ids[:2] == [2, 1]
+
+
+def test_invalid_cursor_is_rejected(session_factory, client_for):
+    client = client_for(seed(session_factory))
+    response = client.get("/api/workouts/history", params={"cursor": "!!!"})
+    assert response.status_code == 400
@@ -0,0 +1,175 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.backend.api.websocket import WorkoutStreamManager
+from src.backend.core.rescoring import ReplayResults
+from src.backend.exercises.ball_squeeze_trainer import BallSqueezeTrainer
+from src.backend.exercises.depression_row_trainer import DepressionRowTrainer
+from src.backend.exercises.hamstring_medial_bridge_trainer import HamstringMedialBridgeTrainer
+from src.backend.exercises.knee_drop_trainer import KneeDropTrainer
+from src.backend.exercises.quad_stretch_trainer import QuadStretchTrainer
+
+REHAB_TRAINERS = [
+    KneeDropTrainer, HamstringMedialBridgeTrainer, BallSqueezeTrainer, QuadStretchTrainer, DepressionRowTrainer,
+]
+
+
+def knees_frame(opening, gap=None):
+    """Hips at mid-height; knees `opening` degrees apart (or `gap` x hip width apart)"""
+    frame = np.full((33, 4), 0.5, dtype=np.float32)
+    frame[23, :2] = (0.45, 0.5)
+    frame[24, :2] = (0.55, 0.5)
+    if gap is not None:
+        frame[25, :2] = (0.5 - 0.05 * gap, 0.7)
+        frame[26, :2] = (0.5 + 0.05 * gap, 0.7)
+    else:
+        half = math.radians(opening / 2)
+        frame[25, :2] = (0.5 - 0.2 * math.sin(half), 0.5 + 0.2 * math.cos(half))
+        frame[26, :2] = (0.5 + 0.2 * math.sin(half), 0.5 + 0.2 * math.cos(half))
+    return frame
+
+
+def replay(trainer, frames, fps=10):
+    """Last output and every frame's feedback, on a clock following the frame times"""
+    results = ReplayResults()
+    feedback = []
+    for i, frame in enumerate(frames):
+        output = trainer.process_frame(results.load(frame), 480, 480, now=1000.0 + i / fps)
+        feedback.append(output["feedback"])
+    return output, feedback
+
+
+def knee_drop_rep(seconds_out, seconds_back, fps=10):
+    out = np.linspace(5, 60, int(seconds_out * fps))
+    back = np.linspace(60, 5, int(seconds_back * fps))
+    return [knees_frame(a) for a in np.concatenate([out, back, np.full(5, 5.0)])]
+
+
+def test_knee_drop_counts_reps_and_flags_fast_drop():
+    trainer = KneeDropTrainer(use_enhanced_processor=False)
+    output, feedback = replay(trainer, knee_drop_rep(3.0, 1.5) * 2 + knee_drop_rep(0.8, 0.8))
+    assert output["reps"] == 3
+    assert output["angles"]["rom"] == pytest.approx(55, abs=3)
+    assert any("Rep 2 complete!" in f for f in feedback)
+    assert any("Rep 3 complete - drop slower" in f for f in feedback)
+
+
+def test_ball_squeeze_counts_held_squeezes_only():
+    trainer = BallSqueezeTrainer(use_enhanced_processor=False)
+    calibration = [knees_frame(0, gap=1.5)] * (trainer.CALIBRATION_FRAMES - 1) + [knees_frame(0, gap=4.0)]
+    relaxed = [knees_frame(0, gap=1.5)] * 5
+    held = [knees_frame(0, gap=1.2)] * 35  # 3.5 s at 10 fps
+    short = [knees_frame(0, gap=1.2)] * 10
+    output, feedback = replay(trainer, calibration + relaxed + held + relaxed + short + relaxed)
+    assert feedback[0] == "Hold position for calibration"
+    # One stray wide frame during calibration doesn't hide the squeezes
+    assert trainer.relaxed_gap == pytest.approx(1.58, abs=0.01)
+    assert output["reps"] == 1
+    assert output["angles"]["knee_gap"] == pytest.approx(150, abs=0.5)
+    assert output["angles"]["hold"] == 0.0
+    assert any("Thoda aur hold karo" in f for f in feedback)
+
+
+def bridge_frame(hip_angle, knee_angle=120.0):
+    """Side view lying on the back: shoulder-hip-knee and hip-knee-ankle angles"""
+    frame = np.full((33, 4), 0.5, dtype=np.float32)
+    shoulder, hip = np.array([0.2, 0.6]), np.array([0.5, 0.6])
+    thigh = math.radians(180 - hip_angle)  # knee rises as the hips sink
+    knee = hip + 0.25 * np.array([math.cos(thigh), -math.sin(thigh)])
+    shin = thigh + math.pi + math.radians(knee_angle)  # back down towards the floor
+    ankle = knee + 0.25 * np.array([math.cos(shin), -math.sin(shin)])
+    for left, right, point in ((11, 12, shoulder), (23, 24, hip), (25, 26, knee), (27, 28, ankle)):
+        frame[left, :2] = frame[right, :2] = point
+    return frame
+
+
+def test_hamstring_bridge_counts_reps_and_flags_straight_knees():
+    trainer = HamstringMedialBridgeTrainer(use_enhanced_processor=False)
+    lift = list(np.linspace(125, 175, 8)) + list(np.linspace(175, 125, 8))
+    output, feedback = replay(trainer, [bridge_frame(a) for a in lift * 2])
+    assert output["reps"] == 2
+    assert any("Hips upar uthao" in f for f in feedback)
+    assert not any("Knees thoda bend" in f for f in feedback)
+
+    trainer = HamstringMedialBridgeTrainer(use_enhanced_processor=False)
+    _, feedback = replay(trainer, [bridge_frame(a, knee_angle=178) for a in lift])
+    assert any("Knees thoda bend rakho" in f for f in feedback)
+
+
+def leg_frame(knee_angle):
+    """Lying on the back: thigh flat, shin swung to the given knee angle"""
+    frame = np.full((33, 4), 0.5, dtype=np.float32)
+    hip, knee = np.array([0.3, 0.6]), np.array([0.5, 0.6])
+    theta = math.radians(knee_angle)
+    ankle = knee + 0.2 * np.array([-math.cos(theta), -math.sin(theta)])
+    for left, right, point in ((23, 24, hip), (25, 26, knee), (27, 28, ankle)):
+        frame[left, :2] = frame[right, :2] = point
+    return frame
+
+
+def extension(seconds, fps=10):
+    half = int(seconds * fps / 2)
+    angles = np.concatenate([np.linspace(90, 170, half), np.linspace(170, 90, half), np.full(5, 90.0)])
+    return [leg_frame(a) for a in angles]
+
+
+def test_quad_stretch_counts_reps_and_flags_forcing():
+    trainer = QuadStretchTrainer(use_enhanced_processor=False)
+    output, feedback = replay(trainer, extension(5.0) + extension(1.0))
+    assert output["reps"] == 2
+    assert any("Rep 1 complete! Shabash!" in f for f in feedback)
+    assert any("Rep 2 complete - dheere karo" in f for f in feedback)
+    assert output["angles"]["best"] == pytest.approx(170, abs=3)
+    assert output["angles"]["rom"] == pytest.approx(75, abs=8)  # smoothed on the fast rep
+
+
+def row_frame(drop=0.0, elbow_angle=180.0):
+    """Side view, shoulders stacked: the shoulder sits `drop` lower than at rest"""
+    frame = np.full((33, 4), 0.5, dtype=np.float32)
+    ear, shoulder, hip = np.array([0.52, 0.3]), np.array([0.5, 0.4 + drop]), np.array([0.5, 0.8])
+    elbow = shoulder + np.array([0.05, 0.15])
+    bend = math.radians(180 - elbow_angle)
+    forearm = np.array([0.05 * math.cos(bend) - 0.15 * math.sin(bend), 0.05 * math.sin(bend) + 0.15 * math.cos(bend)])
+    wrist = elbow + forearm
+    for left, right, point in ((7, 8, ear), (11, 12, shoulder), (23, 24, hip), (13, 14, elbow), (15, 16, wrist)):
+        frame[left, :2] = frame[right, :2] = point
+    return frame
+
+
+def test_depression_row_side_view_reps_and_rowing_check():
+    trainer = DepressionRowTrainer(use_enhanced_processor=False)
+    rest = [row_frame()] * trainer.CALIBRATION_FRAMES
+    drops = list(np.linspace(0, 0.03, 8)) + list(np.linspace(0.03, 0, 8)) + [0.0] * 4
+    output, feedback = replay(trainer, rest + [row_frame(d) for d in drops * 2])
+    assert output["reps"] == 2
+    assert any("Rep 2 complete! Shabash!" in f for f in feedback)
+    # Shoulders stacked in the side view: the signal stays in range
+    assert output["angles"]["rom"] == pytest.approx(10, abs=2)
+
+    _, feedback = replay(trainer, [row_frame(elbow_angle=90)] * 6)
+    assert any("row nahi" in f for f in feedback)
+
+
+@pytest.mark.parametrize("trainer_class", REHAB_TRAINERS)
+def test_rehab_trainers_read_only_declared_landmarks(trainer_class):
+    trainer = trainer_class(use_enhanced_processor=False)
+    frame = np.random.default_rng(0).uniform(0.3, 0.7, size=(33, 4)).astype(np.float32)
+    undeclared = [i for i in range(1, 33) if i not in trainer_class.LANDMARK_IDS]
+    frame[undeclared] = np.nan
+    output, _ = replay(trainer, [frame] * 3)
+    assert output["feedback"] != trainer_class.LOW_CONFIDENCE_MESSAGE
+    assert output["angles"]
+    assert all(value is None or math.isfinite(value) for value in output["angles"].values())
+
+
+@pytest.mark.parametrize("exercise, trainer_class", [
+    ("knee-drop", KneeDropTrainer),
+    ("hamstring-medial-bridge", HamstringMedialBridgeTrainer),
+    ("ball-squeeze", BallSqueezeTrainer),
+    ("quad-stretch", QuadStretchTrainer),
+    ("depression-row", DepressionRowTrainer),
+])
+def test_get_trainer_routes_rehab_exercises(exercise, trainer_class):
+    assert type(WorkoutStreamManager(exercise).get_trainer()) is trainer_class
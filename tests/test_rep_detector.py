@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from src.backend.core.rep_detector import RepDetector, RingBuffer
+
+FPS = 30
+
+
+def feed(detector, signal, t0=0.0):
+    reps = []
+    for i, value in enumerate(signal):
+        rep = detector.update(value, t0 + i / FPS)
+        if rep is not None:
+            reps.append(rep)
+    return reps
+
+
+def squat(depth, seconds=2.0, top=170.0):
+    """One rep on the knee angle: top -> top - depth -> top"""
+    phase = np.linspace(0, 2 * np.pi, int(seconds * FPS), endpoint=False)
+    return top - depth * (1 - np.cos(phase)) / 2
+
+
+def test_counts_deep_and_shallow_reps_with_tempo_and_range():
+    rng = np.random.default_rng(1)
+    signal = np.concatenate([np.full(15, 170.0), squat(100), squat(40, seconds=1.5), squat(100, seconds=3.0),
+                             np.full(15, 170.0)])
+    signal += rng.normal(0, 2.0, len(signal))
+    detector = RepDetector(prominence=30)
+
+    reps = feed(detector, signal)
+
+    assert [r.number for r in reps] == [1, 2, 3]
+    assert [r.range_of_motion for r in reps] == pytest.approx([100, 40, 100], abs=8)
+    assert reps[0].turn_value == pytest.approx(70, abs=5)
+    assert reps[2].duration > reps[0].duration > reps[1].duration
+    assert reps[2].eccentric_seconds == pytest.approx(1.5, abs=0.3)
+    assert detector.mean_rep_seconds == pytest.approx(np.mean([r.duration for r in reps]))
+    assert detector.partial_reps == 0
+
+
+def test_jitter_and_unfinished_reps_do_not_count():
+    rng = np.random.default_rng(2)
+    jitter = 170 + rng.uniform(-12, 12, 300)
+    detector = RepDetector(prominence=30)
+    assert feed(detector, jitter) == []
+
+    # Down to 70, only halfway back up, then down again and a full rep
+    half = np.concatenate([squat(100)[:30], np.linspace(70, 120, 20), np.linspace(120, 70, 20),
+                           np.linspace(70, 170, 30)])
+    reps = feed(detector, half, t0=10.0)
+    assert len(reps) == 1 and detector.partial_reps == 1
+    assert reps[0].start_value == pytest.approx(120, abs=3)
+    assert detector.update(np.nan, 20.0) is None and detector.update(None, 20.0) is None
+
+
+def test_valley_start_and_ring_buffer_window():
+    lift = np.concatenate([np.zeros(10), 1 - squat(1.0, top=1.0), np.zeros(10)])
+    detector = RepDetector(prominence=0.3, start="valley", buffer_size=8)
+    reps = feed(detector, lift)
+    assert len(reps) == 1
+    assert reps[0].start_value == pytest.approx(0, abs=0.05)
+    assert reps[0].turn_value == pytest.approx(1, abs=0.05)
+
+    times, values = detector.window()
+    assert len(values) == 8
+    np.testing.assert_allclose(values, lift[-8:])
+    assert np.all(np.diff(times) > 0)
+
+    buffer = RingBuffer(3)
+    for i in range(5):
+        buffer.push(i, i * 10)
+    assert buffer.ago(0) == 40 and buffer.ago(2) == 20
+    np.testing.assert_array_equal(buffer.window()[1], [20, 30, 40])
@@ -0,0 +1,57 @@
+import numpy as np
+
+from src.backend.core.rescoring import ReplayResults, rescore_recordings
+from src.backend.core.session_recorder import SessionRecorder
+
+TRAINER = f"{__name__}:HipHeightTrainer"
+
+
+class HipHeightTrainer:
+    """Counts a rep each time the left hip drops below `bottom` and comes back up"""
+
+    def __init__(self):
+        self.bottom = 0.7
+        self.reps = 0
+        self.down = False
+
+    def process_frame(self, results, w, h, side="left", now=None):
+        y = results.pose_landmarks.landmark[23].y
+        if y > self.bottom:
+            self.down = True
+        elif self.down and y < 0.5:
+            self.down = False
+            self.reps += 1
+        return {"reps": self.reps}
+
+
+def record_session(path, depths, recorded_reps):
+    with SessionRecorder(path, {"exercise": "squat"}, chunk_frames=8) as recorder:
+        for i, depth in enumerate(depths):
+            frame = np.zeros((33, 4), dtype=np.float32)
+            frame[23, 1] = depth
+            recorder.add_frame(frame, {"reps": recorded_reps}, (640, 480), timestamp=float(i))
+
+
+def test_replay_results_reads_recorded_rows():
+    results = ReplayResults()
+    frame = np.arange(33 * 4, dtype=np.float32).reshape(33, 4)
+    assert results.load(frame).pose_landmarks.landmark[2].y == 9.0
+    assert results.load(np.full((33, 4), np.nan, dtype=np.float32)).pose_landmarks is None
+
+
+def test_rescore_reports_rep_diff(tmp_path):
+    # Three dips to 0.75 and one to 0.65: three reps at bottom=0.7, four at 0.6
+    depths = [0.3, 0.75, 0.3, 0.75, 0.3, 0.65, 0.3, 0.75, 0.3] * 3
+    for n in range(3):
+        record_session(tmp_path / f"s{n}.airec", depths, recorded_reps=9)
+
+    rows = rescore_recordings([str(tmp_path)], trainer_spec=TRAINER, workers=2)
+    assert [r["rescored_reps"] for r in rows] == [9, 9, 9]
+    assert all(r["rep_diff"] == 0 and r["frames"] == len(depths) for r in rows)
+
+    rows = rescore_recordings([str(tmp_path)], trainer_spec=TRAINER,
+                              overrides={"bottom": 0.6}, workers=1)
+    assert [r["rep_diff"] for r in rows] == [3, 3, 3]
+
+    rows = rescore_recordings([str(tmp_path)], trainer_spec=TRAINER, overrides={"nope": 1}, workers=1)
+    assert rows[0]["error"].startswith("AttributeError")
@@ -0,0 +1,99 @@
+import json
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from src.backend.core.session_recorder import (
+    FORMAT_VERSION,
+    V1_FRAME_SIZE,
+    SessionRecorder,
+    iter_chunks,
+    read_metadata,
+    read_recording,
+    start_session_recording,
+)
+
+
+def fake_landmarks(i):
+    return np.full((33, 4), i, dtype=np.float32)
+
+
+def test_round_trip_across_chunks(tmp_path):
+    path = tmp_path / "squat.airec"
+    with SessionRecorder(path, {"exercise": "squat"}, chunk_frames=4) as recorder:
+        for i in range(10):
+            landmarks = None if i == 5 else fake_landmarks(i)
+            recorder.add_frame(landmarks, {"reps": i, "angles": {"knee": np.float64(90.5)}}, (640, 480),
+                               timestamp=1000.0 + i)
+
+    assert len(list(iter_chunks(path))) == 3  # 4 + 4 + partial 2
+    recording = read_recording(path)
+    assert recording.metadata["exercise"] == "squat"
+    assert recording.landmarks.shape == (10, 33, 4)
+    np.testing.assert_array_equal(recording.timestamps, 1000.0 + np.arange(10))
+    assert recording.landmarks[3, 0, 0] == 3
+    assert np.isnan(recording.landmarks[5]).all()
+    assert recording.outputs[9] == {"reps": 9, "angles": {"knee": 90.5}}
+
+
+def test_truncated_tail_is_ignored(tmp_path):
+    path = tmp_path / "cut.airec"
+    with SessionRecorder(path, chunk_frames=2) as recorder:
+        for i in range(4):
+            recorder.add_frame(fake_landmarks(i), {"reps": i}, timestamp=float(i))
+
+    data = path.read_bytes()
+    path.write_bytes(data[:-10])
+    recording = read_recording(path)
+    assert len(recording.timestamps) == 2
+
+
+def test_reads_version_1_recordings_without_frame_sizes(tmp_path):
+    path = tmp_path / "old.airec"
+    meta = json.dumps({"exercise": "squat", "format_version": 1}).encode()
+    raw = b"".join((
+        np.arange(3, dtype="<f8").tobytes(),
+        np.ones((3, 33, 4), dtype="<f4").tobytes(),
+        json.dumps([{"reps": i} for i in range(3)]).encode(),
+    ))
+    payload = zlib.compress(raw)
+    path.write_bytes(struct.pack("<6sHI", b"AIREC\x00", 1, len(meta)) + meta
+                     + struct.pack("<4sII", b"CHNK", 3, len(payload)) + payload)
+
+    recording = read_recording(path)
+    assert recording.outputs == [{"reps": 0}, {"reps": 1}, {"reps": 2}]
+    assert recording.frame_sizes.tolist() == [list(V1_FRAME_SIZE)] * 3
+    assert recording.landmarks.shape == (3, 33, 4)
+
+    new_path = tmp_path / "new.airec"
+    with SessionRecorder(new_path, chunk_frames=2) as recorder:
+        recorder.add_frame(np.ones((33, 4), np.float32), {"reps": 0}, (320, 240), timestamp=0.0)
+    assert read_metadata(new_path)["format_version"] == FORMAT_VERSION == 2
+    assert read_recording(new_path).frame_sizes.tolist() == [[320, 240]]
+
+
+def test_client_exercise_name_cannot_leave_the_recordings_dir(tmp_path):
+    directory = tmp_path / "recordings"
+    recorder = start_session_recording("../../Etc/Evil Squat!", directory)
+    recorder.close()
+    assert recorder.path.parent == directory.resolve()
+    assert recorder.path.name.startswith("etcevilsquat-")
+    assert read_metadata(recorder.path)["exercise"] == "etcevilsquat"
+    assert [p.name for p in tmp_path.iterdir()] == ["recordings"]
+
+
+def test_recording_count_and_length_are_capped(tmp_path):
+    start_session_recording("squat", tmp_path, max_files=2).close()
+    start_session_recording("squat", tmp_path, max_files=2).close()
+    with pytest.raises(ValueError, match="already holds 2 recordings"):
+        start_session_recording("squat", tmp_path, max_files=2)
+
+    path = tmp_path / "long.airec"
+    with SessionRecorder(path, chunk_frames=4, max_frames=6) as recorder:
+        for i in range(10):
+            recorder.add_frame(fake_landmarks(i), {"reps": i}, (640, 480))
+    assert recorder.frames_recorded == 6
+    assert recorder.frames_dropped == 4
+    assert len(read_recording(path).timestamps) == 6
@@ -0,0 +1,34 @@
+import sqlite3
+
+from startup_backend import cancel_duplicate_bookings
+
+
+def test_double_bookings_are_cancelled_before_the_slot_index(caplog):
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE bookings (id INTEGER PRIMARY KEY, user_id INTEGER, time TEXT, "
+        "booking_date DATETIME, status TEXT, cancelled_at DATETIME)"
+    )
+    conn.executemany(
+        "INSERT INTO bookings (id, user_id, time, booking_date, status) VALUES (?, ?, ?, ?, ?)",
+        [
+            (1, 1, "09:00 AM", "2025-12-22 00:00:00", "confirmed"),
+            (2, 2, "09:00 AM", "2025-12-22 00:00:00", "confirmed"),
+            (3, 3, "09:00 AM", "2025-12-22 00:00:00", "cancelled"),
+            (4, 3, "09:00 AM", "2025-12-22 00:00:00", "confirmed"),
+            (5, 2, "11:00 AM", "2025-12-22 00:00:00", "confirmed"),
+        ],
+    )
+
+    assert cancel_duplicate_bookings(conn.cursor()) == 2
+    conn.execute(
+        "CREATE UNIQUE INDEX uq_bookings_confirmed_slot ON bookings (booking_date, time) "
+        "WHERE status = 'confirmed'"
+    )
+    rows = conn.execute("SELECT id, status, cancelled_at IS NOT NULL FROM bookings ORDER BY id").fetchall()
+    assert rows == [
+        (1, "confirmed", 0), (2, "cancelled", 1), (3, "cancelled", 0), (4, "cancelled", 1), (5, "confirmed", 0),
+    ]
+    assert [r.getMessage().split(" (")[0] for r in caplog.records] == [
+        "Double booking: cancelling booking 2", "Double booking: cancelling booking 4",
+    ]
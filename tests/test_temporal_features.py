@@ -0,0 +1,74 @@
+import numpy as np
+
+from src.backend.training.numpy_predictor import NumpyPosturePredictor
+from src.backend.training.temporal_features import (
+    NUM_WINDOW_FEATURES,
+    joint_angles,
+    normalize_pose,
+    session_windows,
+    window_features,
+)
+
+
+def random_frames(n, seed=0):
+    return np.random.default_rng(seed).uniform(0.2, 0.8, size=(n, 99)).astype(np.float32)
+
+
+def test_features_ignore_position_and_scale_in_frame():
+    X = random_frames(20)
+    moved = X.reshape(-1, 33, 3) * 0.5 + np.array([0.3, -0.1, 0.0], dtype=np.float32)
+
+    np.testing.assert_allclose(window_features(X, 5), window_features(moved.reshape(-1, 99), 5), atol=1e-4)
+
+
+def test_joint_angles_and_window_alignment():
+    pose = np.zeros((1, 33, 3), dtype=np.float32)
+    pose[0, 23] = (0, 0, 0)  # left hip
+    pose[0, 25] = (0, 1, 0)  # left knee
+    pose[0, 27] = (1, 1, 0)  # left ankle
+    assert abs(joint_angles(pose)[0, 6] - 90.0) < 1e-4  # left_knee
+
+    X = random_frames(12)
+    features = window_features(X, window=4, step=2)
+    assert features.shape == (5, NUM_WINDOW_FEATURES)
+    # Row i ends at frame 3 + 2i and only looks at frames before it
+    np.testing.assert_allclose(features[2], window_features(X[4:8], window=4)[0], atol=1e-5)
+    np.testing.assert_allclose(features[2, :99], normalize_pose(X[7:8]).ravel(), atol=1e-6)
+
+
+def test_session_windows_do_not_span_sessions():
+    X = random_frames(10)
+    y = np.array(["a"] * 6 + ["b"] * 4)
+    groups = np.array([0] * 6 + [1] * 4)
+
+    features, labels = session_windows(X, y, groups, window=5)
+
+    assert labels.tolist() == ["a", "a"]  # session 1 is shorter than a window
+    np.testing.assert_allclose(features, window_features(X[:6], 5))
+
+
+def test_temporal_predictor_streams_like_batch():
+    rng = np.random.default_rng(2)
+    predictor = NumpyPosturePredictor(
+        [rng.normal(size=(NUM_WINDOW_FEATURES, 8)), rng.normal(size=(8, 2))],
+        [rng.normal(size=8), rng.normal(size=2)],
+        ["relu", "softmax"],
+        ["correct", "hip_turn"],
+        window=4,
+    )
+    X = random_frames(11, seed=3)
+
+    labels, confidences = predictor.predict_batch(X)
+    assert labels[:3].tolist() == [None] * 3 and labels[3] is not None
+
+    streamed = list(predictor.predict_stream([X[:2], X[2:7], X[7:]]))
+    assert np.concatenate([l for l, _ in streamed]).tolist() == labels.tolist()
+    np.testing.assert_allclose(np.concatenate([c for _, c in streamed]), confidences, atol=1e-6)
+
+    live = [predictor.predict_posture(frame) for frame in X]
+    assert [label for label, _ in live] == labels.tolist()
+
+    # Landmark dicts (the live trainers' format) give the same windows
+    predictor.reset()
+    live = [predictor.predict_posture({i: tuple(frame[3 * i:3 * i + 3]) for i in range(33)}) for frame in X]
+    assert [label for label, _ in live] == labels.tolist()
@@ -0,0 +1,83 @@
+from datetime import datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.backend.api import auth
+from src.backend.auth.security import create_access_token
+from src.backend.auth.user_cache import UserCache, UserSnapshot, user_cache
+from src.backend.database.db import get_db
+from src.backend.database.models import User
+
+
+def make_snapshot(user_id=1, role="user"):
+    return UserSnapshot(
+        id=user_id,
+        name="Champion",
+        email=f"user{user_id}@example.com",
+        role=role,
+        google_id=None,
+        created_at=datetime(2025, 1, 1),
+    )
+
+
+def test_hit_and_ttl_expiry():
+    cache = UserCache(ttl_seconds=0.0, max_size=10)
+    cache.put("token", make_snapshot())
+    assert cache.get("token") is None
+
+    cache = UserCache(ttl_seconds=60.0, max_size=10)
+    cache.put("token", make_snapshot())
+    assert cache.get("token").id == 1
+
+
+def test_bounded_size_evicts_least_recent():
+    cache = UserCache(ttl_seconds=60.0, max_size=2)
+    cache.put("a", make_snapshot(1))
+    cache.put("b", make_snapshot(2))
+    cache.get("a")
+    cache.put("c", make_snapshot(3))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert len(cache) == 2
+
+
+def test_invalidate_user_drops_all_tokens():
+    cache = UserCache(ttl_seconds=60.0, max_size=10)
+    cache.put("t1", make_snapshot(1))
+    cache.put("t2", make_snapshot(1))
+    cache.put("t3", make_snapshot(2))
+    cache.invalidate_user(1)
+    assert cache.get("t1") is None
+    assert cache.get("t2") is None
+    assert cache.get("t3") is not None
+
+
+def test_orm_role_change_is_seen_by_the_next_request(session_factory, override_get_db):
+    db = session_factory()
+    user = User(name="Coach", email="coach@example.com", role="user")
+    db.add(user)
+    db.commit()
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api")
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+    user_cache.clear()
+    try:
+        assert client.get("/api/auth/me", headers=headers).json()["role"] == "user"
+        assert client.get("/api/auth/admin/users", headers=headers).status_code == 403
+        assert len(user_cache) == 1
+
+        # Promoted outside the API: the cached snapshot must not outlive the change
+        user.role = "admin"
+        db.commit()
+        assert client.get("/api/auth/me", headers=headers).json()["role"] == "admin"
+        assert client.get("/api/auth/admin/users", headers=headers).status_code == 200
+
+        db.delete(user)
+        db.commit()
+        assert client.get("/api/auth/me", headers=headers).status_code == 401
+    finally:
+        user_cache.clear()
+        db.close()
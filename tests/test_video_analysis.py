@@ -0,0 +1,95 @@
+import asyncio
+import io
+import tempfile
+
+import numpy as np
+from fastapi import FastAPI, UploadFile
+from fastapi.testclient import TestClient
+
+from src.backend.api import videos
+from src.backend.auth.user_cache import UserSnapshot
+from src.backend.core.video_analysis import ChunkPlan, merge_chunks, plan_chunks, score_landmarks
+
+TRAINER = f"{__name__}:DepthTrainer"
+
+
+class DepthTrainer:
+    """Rep on every dip of the left hip; complains while the torso (shoulder x) leans"""
+
+    def __init__(self):
+        self.reps = 0
+        self.down = False
+
+    def process_frame(self, results, w, h, side="left", now=None):
+        lm = results.pose_landmarks.landmark
+        if lm[23].y > 0.7:
+            self.down = True
+        elif self.down and lm[23].y < 0.5:
+            self.down = False
+            self.reps += 1
+        feedback = "Chest up, back straight" if lm[11].x > 0.5 else "Good form - keep going!"
+        return {"reps": self.reps, "feedback": feedback, "angles": {"hip": round(lm[23].y, 2)}}
+
+
+def test_plan_chunks_cover_every_frame_once():
+    chunks = plan_chunks(frame_count=95, fps=10, chunk_seconds=3, overlap_seconds=1)
+    assert chunks[0] == ChunkPlan(0, 0, 30)
+    assert chunks[1] == ChunkPlan(20, 30, 60)
+    assert chunks[-1] == ChunkPlan(80, 90, 95)
+    kept = [i for c in chunks for i in range(c.start, c.end)]
+    assert kept == list(range(95))
+
+
+def test_merge_and_score_timeline():
+    fps = 10
+    depths = [0.3, 0.8, 0.3] * 4
+    frames = np.zeros((len(depths), 33, 4), dtype=np.float32)
+    frames[:, 23, 1] = depths
+    frames[3:6, 11, 0] = 0.9  # leaning during the second rep
+    frames[6] = np.nan  # person left the frame
+
+    chunks = plan_chunks(len(depths), fps, chunk_seconds=0.5, overlap_seconds=0.2)
+    landmarks = merge_chunks([(c, frames[c.start:c.end]) for c in reversed(chunks)], len(depths))
+    np.testing.assert_array_equal(landmarks, frames)
+
+    result = score_landmarks("squat", landmarks, fps, 640, 480, trainer_spec=TRAINER)
+    assert result["reps"] == 4
+    assert [r["time"] for r in result["rep_timeline"]] == [0.2, 0.5, 0.8, 1.1]
+    assert result["frames"][6] == {"time": 0.6, "pose": False, "angles": {}}
+    assert result["frames"][1]["angles"] == {"hip": 0.8}
+    assert result["violations"] == [
+        {"message": "Chest up, back straight", "start_time": 0.3, "end_time": 0.6, "frames": 3}
+    ]
+
+
+USER = UserSnapshot(id=1, name="Runner", email="runner@example.com", role="user", google_id=None, created_at=None)
+
+
+def broken_probe(path):
+    raise ValueError("Could not open video")
+
+
+def test_failed_analysis_deletes_the_upload(monkeypatch, tmp_path):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    monkeypatch.setattr(videos, "get_video_pool", lambda: None)
+    monkeypatch.setattr(videos, "probe_video", broken_probe)
+    app = FastAPI()
+    app.include_router(videos.router, prefix="/api")
+    app.dependency_overrides[videos.get_current_user] = lambda: USER
+
+    response = TestClient(app).post(
+        "/api/videos/analyze", params={"exercise": "squat"}, files={"video": ("run.mp4", b"not a video")}
+    )
+    assert response.status_code == 200
+    assert response.text == '{"type":"error","message":"Could not open video"}\n'
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unconsumed_response_still_deletes_the_upload(monkeypatch, tmp_path):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    upload = UploadFile(io.BytesIO(b"frames"), filename="run.mp4")
+
+    response = asyncio.run(videos.analyze_uploaded_video(exercise="squat", video=upload, current_user=USER))
+    assert len(list(tmp_path.iterdir())) == 1
+    asyncio.run(response.background())  # the stream is never iterated
+    assert list(tmp_path.iterdir()) == []
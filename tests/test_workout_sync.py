@@ -0,0 +1,91 @@
+from src.backend.core import achievement_engine
+from src.backend.database.models import Exercise, User, UserCounter, Workout
+
+
+def seed(session_factory):
+    db = session_factory()
+    user = User(name="Offline", email="offline@example.com")
+    db.add(user)
+    db.add(Exercise(id="squat", name="Squat"))
+    db.commit()
+    user_id = user.id
+    db.close()
+    return user_id
+
+
+def item(client_id, day, reps=10):
+    return {
+        "client_id": client_id,
+        "exercise_id": "squat",
+        "duration": 120,
+        "reps_completed": reps,
+        "date": f"2025-03-{day:02d}T18:00:00",
+    }
+
+
+def test_batch_is_idempotent(session_factory, client_for):
+    user_id = seed(session_factory)
+    client = client_for(user_id)
+    batch = {"workouts": [item("a", 1), item("b", 2), item("a", 1)]}
+
+    first = client.post("/api/workouts/batch", json=batch).json()
+    assert [w["client_id"] for w in first["created"]] == ["a", "b"]
+    assert [w["client_id"] for w in first["duplicates"]] == ["a"]
+    assert first["duplicates"][0]["workout_id"] == first["created"][0]["workout_id"]
+
+    replay = client.post("/api/workouts/batch", json=batch).json()
+    assert replay["created"] == []
+    assert len(replay["duplicates"]) == 3
+
+    db = session_factory()
+    assert db.query(Workout).filter(Workout.user_id == user_id).count() == 2
+    db.close()
+
+
+def test_batch_updates_counters_once(session_factory, client_for):
+    user_id = seed(session_factory)
+    client = client_for(user_id)
+    client.post("/api/workouts/batch", json={"workouts": [item("a", 3), item("b", 4)]})
+    # An older workout synced late still yields the right streak
+    client.post("/api/workouts/batch", json={"workouts": [item("c", 2), item("d", 5)]})
+
+    db = session_factory()
+    counters = {
+        row.name: row.value
+        for row in db.query(UserCounter).filter(UserCounter.user_id == user_id)
+    }
+    db.close()
+    assert counters["workouts"] == 4
+    assert counters["reps"] == 40
+    assert counters["streak"] == 4
+
+
+def test_counters_recover_after_a_failed_update(session_factory, client_for, monkeypatch):
+    user_id = seed(session_factory)
+    client = client_for(user_id)
+    client.post("/api/workouts/batch", json={"workouts": [item("a", 1)]})
+
+    apply_workout = achievement_engine.apply_workout
+    failures = []
+
+    def fail_once(counters, workout, exercise_type):
+        if not failures:
+            failures.append(workout.id)
+            raise RuntimeError("database is locked")
+        apply_workout(counters, workout, exercise_type)
+
+    monkeypatch.setattr(achievement_engine, "apply_workout", fail_once)
+    # The workout is saved even though its counter update fails
+    response = client.post("/api/workouts/batch", json={"workouts": [item("b", 2)]})
+    assert response.status_code == 200 and failures
+    client.post("/api/workouts/batch", json={"workouts": [item("c", 3)]})
+
+    db = session_factory()
+    counters = {
+        row.name: row.value
+        for row in db.query(UserCounter).filter(UserCounter.user_id == user_id)
+    }
+    db.close()
+    assert counters["workouts"] == 3
+    assert counters["reps"] == 30
+    assert counters["streak"] == 3